@@ -7,3 +7,6 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
     verbose_name = "Accounts & Identity"
+
+    def ready(self) -> None:
+        from . import authentication, authorization, lookup  # noqa: F401 - register cache invalidation signals
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .models import User
+
+SHARED_KEY = "accounts:token:{digest}"
+# The password hash and PESEL never enter a snapshot (nor the shared cache);
+# restored users load them on first access like any deferred field.
+SNAPSHOT_EXCLUDED_FIELDS = frozenset({"password", "pesel"})
+_USER_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields if field.attname not in SNAPSHOT_EXCLUDED_FIELDS
+)
+
+
+@dataclass(frozen=True)
+class TokenSnapshot:
+    """Plain copy of an authenticated token's user, safe to share between requests."""
+
+    user_values: tuple[Any, ...]
+    token_created: Any
+
+    @classmethod
+    def capture(cls, token: Token) -> "TokenSnapshot":
+        return cls(tuple(getattr(token.user, name) for name in _USER_FIELDS), token.created)
+
+    def restore(self, key: str) -> tuple[User, Token]:
+        # ``from_db`` gives every request its own instance, as if freshly loaded.
+        user = User.from_db("default", list(_USER_FIELDS), list(self.user_values))
+        token = Token(key=key, user=user, created=self.token_created)
+        return user, token
+
+
+class TokenCache:
+    """Bounded in-process LRU of token snapshots, optionally backed by a shared cache.
+
+    Local entries live ``TOKEN_AUTH_CACHE_TTL`` seconds: invalidation only
+    reaches the local LRU of the process that performs it (and the shared
+    cache), so the TTL bounds how long other workers may still accept a
+    revoked token.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, int, TokenSnapshot]] = OrderedDict()
+        self._keys_by_user: dict[int, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> TokenSnapshot | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, _, snapshot = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return snapshot
+                self._discard(key)
+        shared = _shared_cache()
+        snapshot = shared.get(_shared_key(key)) if shared is not None else None
+        if snapshot is not None:
+            self._store_local(key, snapshot)
+            with self._lock:
+                self.hits += 1
+            return snapshot
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, snapshot: TokenSnapshot) -> None:
+        self._store_local(key, snapshot)
+        shared = _shared_cache()
+        if shared is not None:
+            shared.set(_shared_key(key), snapshot, getattr(settings, "TOKEN_AUTH_SHARED_CACHE_TTL", 300))
+
+    def invalidate_key(self, key: str) -> None:
+        with self._lock:
+            self._discard(key)
+        shared = _shared_cache()
+        if shared is not None:
+            shared.delete(_shared_key(key))
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            keys = set(self._keys_by_user.get(user_id, ()))
+            for key in keys:
+                self._discard(key)
+        shared = _shared_cache()
+        if shared is not None:
+            keys.update(Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+            shared.delete_many([_shared_key(key) for key in keys])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.hits = self.misses = 0
+
+    def _store_local(self, key: str, snapshot: TokenSnapshot) -> None:
+        ttl = getattr(settings, "TOKEN_AUTH_CACHE_TTL", 30)
+        size = getattr(settings, "TOKEN_AUTH_CACHE_SIZE", 2048)
+        if ttl <= 0 or size <= 0:
+            return
+        user_id = snapshot.user_values[_USER_FIELDS.index("id")]
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + ttl, user_id, snapshot)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > size:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_user.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry[1]]
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` that skips the token/user query for recently seen tokens.
+
+    Snapshots are only stored for active users and are dropped on logout,
+    token deletion and any save of the user other than a ``last_login``
+    update, which covers password changes, role changes and deactivation.
+    """
+
+    def authenticate_credentials(self, key):
+        snapshot = token_cache.get(key)
+        if snapshot is not None:
+            return snapshot.restore(key)
+        user, token = super().authenticate_credentials(key)
+        token_cache.put(key, TokenSnapshot.capture(token))
+        return user, token
+
+
+def _shared_cache():
+    alias = getattr(settings, "TOKEN_AUTH_SHARED_CACHE", "")
+    return caches[alias] if alias else None
+
+
+def _shared_key(key: str) -> str:
+    # Raw tokens never leave the process; the shared cache sees a digest.
+    return SHARED_KEY.format(digest=hashlib.sha256(key.encode()).hexdigest())
+
+
+@receiver(post_delete, sender=Token)
+def _token_deleted(sender, instance, **kwargs) -> None:
+    token_cache.invalidate_key(instance.key)
+
+
+@receiver(post_save, sender=User)
+def _user_saved(sender, instance, created, update_fields=None, **kwargs) -> None:
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    token_cache.invalidate_user(instance.pk)
+
+
+__all__ = ["CachedTokenAuthentication", "TokenCache", "TokenSnapshot", "token_cache"]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import EntityMembership, User, UserGroupMembership
+
+CACHE_KEY = "accounts:authz:{user_id}"
+
+# Bumped by the signal handlers below. A context memoized on a request is
+# rebuilt when the generation moved on, so a membership created earlier in
+# the same request (e.g. by a report upload) is seen by later checks.
+_generation = 0
+
+
+@dataclass(frozen=True)
+class AuthorizationContext:
+    """Everything permission checks and queryset filters need to know about a user.
+
+    Resolved once per request by :func:`get_authorization_context`; use it
+    instead of querying ``EntityMembership`` or the user's groups directly.
+    """
+
+    user_id: int | None
+    role: str = ""
+    is_internal: bool = False
+    # Entity ids in membership creation order, the first one being the default.
+    entity_ids_ordered: tuple[int, ...] = ()
+    entity_roles: dict[int, frozenset[str]] = field(default_factory=dict)
+    managed_entity_ids: frozenset[int] = frozenset()
+    group_ids: frozenset[int] = frozenset()
+    generation: int = field(default=0, compare=False)
+
+    @property
+    def entity_ids(self) -> frozenset[int]:
+        return frozenset(self.entity_roles)
+
+    @property
+    def default_entity_id(self) -> int | None:
+        return self.entity_ids_ordered[0] if self.entity_ids_ordered else None
+
+    def is_member(self, entity_id: int) -> bool:
+        return entity_id in self.entity_roles
+
+    def has_entity_role(self, entity_id: int, *roles: str) -> bool:
+        return bool(self.entity_roles.get(entity_id, frozenset()) & set(roles))
+
+    def entity_ids_with_role(self, *roles: str) -> frozenset[int]:
+        wanted = set(roles)
+        return frozenset(entity_id for entity_id, held in self.entity_roles.items() if held & wanted)
+
+
+ANONYMOUS_CONTEXT = AuthorizationContext(user_id=None)
+
+
+def get_authorization_context(request) -> AuthorizationContext:
+    """Return the context of ``request.user``, memoized on the underlying ``HttpRequest``."""
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS_CONTEXT
+    holder = getattr(request, "_request", request)
+    context = getattr(holder, "_authorization_context", None)
+    if context is None or context.user_id != user.pk or context.generation != _generation:
+        context = build_authorization_context(user)
+        holder._authorization_context = context
+    return context
+
+
+def build_authorization_context(user: User) -> AuthorizationContext:
+    """Resolve the context from the database or, when enabled, the short-TTL cache.
+
+    ``AUTHORIZATION_CONTEXT_CACHE_TTL`` (seconds, 0 disables) shares the
+    context between requests. Entries are dropped when memberships, managed
+    entities, groups or the role change through the ORM; bulk updates bypass
+    signals, so the TTL bounds how stale a context can get.
+    """
+    ttl = getattr(settings, "AUTHORIZATION_CONTEXT_CACHE_TTL", 0)
+    generation = _generation
+    if ttl:
+        cached = cache.get(CACHE_KEY.format(user_id=user.pk))
+        if cached is not None and cached.role == user.role:
+            return _with_generation(cached, generation)
+
+    entity_ids_ordered: list[int] = []
+    entity_roles: dict[int, set[str]] = {}
+    memberships = EntityMembership.objects.filter(user=user).order_by("created_at", "pk").values_list("entity_id", "role")
+    for entity_id, role in memberships:
+        if entity_id not in entity_roles:
+            entity_ids_ordered.append(entity_id)
+            entity_roles[entity_id] = set()
+        entity_roles[entity_id].add(role)
+    managed: frozenset[int] = frozenset()
+    if user.is_internal:
+        # Only the internal "moje-podmioty" views read managed entities.
+        managed = frozenset(
+            User.managed_entities.through.objects.filter(user_id=user.pk).values_list("regulatedentity_id", flat=True)
+        )
+    context = AuthorizationContext(
+        user_id=user.pk,
+        role=user.role,
+        is_internal=user.is_internal,
+        entity_ids_ordered=tuple(entity_ids_ordered),
+        entity_roles={entity_id: frozenset(roles) for entity_id, roles in entity_roles.items()},
+        managed_entity_ids=managed,
+        group_ids=frozenset(UserGroupMembership.objects.filter(user=user).values_list("group_id", flat=True)),
+        generation=generation,
+    )
+    if ttl:
+        cache.set(CACHE_KEY.format(user_id=user.pk), context, ttl)
+    return context
+
+
+def invalidate_authorization_context(*user_ids: int) -> None:
+    global _generation
+    _generation += 1
+    if user_ids and getattr(settings, "AUTHORIZATION_CONTEXT_CACHE_TTL", 0):
+        cache.delete_many([CACHE_KEY.format(user_id=user_id) for user_id in user_ids])
+
+
+def _with_generation(context: AuthorizationContext, generation: int) -> AuthorizationContext:
+    return AuthorizationContext(**{**context.__dict__, "generation": generation})
+
+
+@receiver(post_save, sender=EntityMembership)
+@receiver(post_delete, sender=EntityMembership)
+@receiver(post_save, sender=UserGroupMembership)
+@receiver(post_delete, sender=UserGroupMembership)
+def _membership_changed(sender, instance, **kwargs) -> None:
+    invalidate_authorization_context(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def _user_saved(sender, instance, created, update_fields=None, **kwargs) -> None:
+    if created or (update_fields is not None and "role" not in update_fields):
+        return
+    invalidate_authorization_context(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.managed_entities.through)
+def _managed_entities_changed(sender, instance, action, reverse, pk_set, **kwargs) -> None:
+    if reverse and action == "pre_clear":
+        # ``entity.managed_by.clear()`` does not report which users it affects.
+        invalidate_authorization_context(*instance.managed_by.values_list("pk", flat=True))
+    elif not reverse and action in {"post_add", "post_remove", "post_clear"}:
+        invalidate_authorization_context(instance.pk)
+    elif action in {"post_add", "post_remove"}:
+        invalidate_authorization_context(*pk_set)
+
+
+__all__ = [
+    "AuthorizationContext",
+    "build_authorization_context",
+    "get_authorization_context",
+    "invalidate_authorization_context",
+]
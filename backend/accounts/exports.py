@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from uknf_platform.exports import ExportSpec
+
+# PESEL numbers and password hashes are never exported.
+USER_EXPORT = ExportSpec(
+    name="users",
+    audit_action="user.exported",
+    columns={
+        "id": "id",
+        "email": "email",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "role": "role",
+        "user_type": "user_type",
+        "phone_number": "phone_number",
+        "department": "department",
+        "position_title": "position_title",
+        "preferred_language": "preferred_language",
+        "is_active": "is_active",
+        "must_change_password": "must_change_password",
+        "date_joined": "date_joined",
+        "last_login": "last_login",
+    },
+)
+
+ENTITY_EXPORT = ExportSpec(
+    name="entities",
+    audit_action="entity.exported",
+    columns={
+        "id": "id",
+        "name": "name",
+        "registration_number": "registration_number",
+        "sector": "sector",
+        "address": "address",
+        "postal_code": "postal_code",
+        "city": "city",
+        "country": "country",
+        "contact_email": "contact_email",
+        "contact_phone": "contact_phone",
+        "website": "website",
+        "status": "status",
+        "data_source": "data_source",
+        "last_verified_at": "last_verified_at",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+)
+
+
+__all__ = ["ENTITY_EXPORT", "USER_EXPORT"]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence
+
+# This module must not import models: pool workers started with "spawn" import
+# it before Django is set up.
+
+MIN_PARALLEL_PASSWORDS = 8
+
+
+class PasswordHasherPool:
+    """Hashes passwords with ``make_password``, spreading large batches over processes.
+
+    PBKDF2 is deliberately CPU-bound, so batches of at least
+    ``MIN_PARALLEL_PASSWORDS`` go to a process pool (``USER_IMPORT_HASH_WORKERS``,
+    0 = every CPU). The pool is started on first use and reused until the
+    context exits, so a multi-batch import forks its workers once. With
+    ``workers=1`` everything is hashed in the calling process.
+    """
+
+    def __init__(self, workers: int | None = None):
+        from django.conf import settings
+
+        if workers is None:
+            workers = getattr(settings, "USER_IMPORT_HASH_WORKERS", 0)
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> PasswordHasherPool:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def hash(self, passwords: Sequence[str]) -> list[str]:
+        from django.contrib.auth.hashers import make_password
+
+        workers = min(self.workers, len(passwords))
+        if workers <= 1 or len(passwords) < MIN_PARALLEL_PASSWORDS:
+            return [make_password(password) for password in passwords]
+        if self._pool is None:
+            settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "uknf_platform.settings")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(settings_module,)
+            )
+        return list(self._pool.map(_hash, passwords, chunksize=max(1, len(passwords) // (self.workers * 4))))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def hash_passwords(passwords: Sequence[str], *, workers: int | None = None) -> list[str]:
+    """Return ``make_password`` hashes of ``passwords``, in order."""
+    with PasswordHasherPool(workers) as hasher:
+        return hasher.hash(passwords)
+
+
+def _init_worker(settings_module: str) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+def _hash(password: str) -> str:
+    from django.contrib.auth.hashers import make_password
+
+    return make_password(password)
+
+
+__all__ = ["PasswordHasherPool", "hash_passwords"]
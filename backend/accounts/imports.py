@@ -0,0 +1,567 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower, Upper
+from django.utils import timezone
+
+from communication.services import iter_sheet_rows
+
+from .hashing import PasswordHasherPool
+from .models import RegulatedEntity, User
+
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_USER_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+CSV_FALLBACK_ENCODING = "cp1250"
+
+# Header (case-insensitive) -> import field. Polish headers follow the UKNF
+# register spreadsheet, model field names are accepted for CSV files.
+ENTITY_HEADERS = {
+    "kod uknf": "uknf_code",
+    "numer wpisu do rejestru uknf": "register_number",
+    "registration_number": "register_number",
+    "nazwa podmiotu": "name",
+    "name": "name",
+    "typ podmiotu": "entity_type",
+    "kategoria podmiotu": "category",
+    "sector": "category",
+    "ulica": "street",
+    "numer budynku": "building",
+    "numer lokalu": "unit",
+    "address": "address",
+    "kod pocztowy": "postal_code",
+    "postal_code": "postal_code",
+    "miejscowość": "city",
+    "city": "city",
+    "country": "country",
+    "telefon": "contact_phone",
+    "contact_phone": "contact_phone",
+    "e-mail": "contact_email",
+    "contact_email": "contact_email",
+    "website": "website",
+    "status podmiotu": "status",
+    "status": "status",
+}
+
+ENTITY_STATUSES = {
+    "wpisany": RegulatedEntity.EntityStatus.ACTIVE,
+    "aktywny": RegulatedEntity.EntityStatus.ACTIVE,
+    "active": RegulatedEntity.EntityStatus.ACTIVE,
+    "zawieszony": RegulatedEntity.EntityStatus.SUSPENDED,
+    "suspended": RegulatedEntity.EntityStatus.SUSPENDED,
+    "wykreślony": RegulatedEntity.EntityStatus.DECOMMISSIONED,
+    "wycofany": RegulatedEntity.EntityStatus.DECOMMISSIONED,
+    "decommissioned": RegulatedEntity.EntityStatus.DECOMMISSIONED,
+}
+
+USER_HEADERS = {
+    "e-mail": "email",
+    "email": "email",
+    "imię": "first_name",
+    "first_name": "first_name",
+    "nazwisko": "last_name",
+    "last_name": "last_name",
+    "pesel": "pesel",
+    "telefon": "phone_number",
+    "phone_number": "phone_number",
+    "rola": "role",
+    "role": "role",
+    "typ użytkownika": "user_type",
+    "user_type": "user_type",
+    "departament": "department",
+    "department": "department",
+    "stanowisko": "position_title",
+    "position_title": "position_title",
+    "język": "preferred_language",
+    "preferred_language": "preferred_language",
+    "hasło": "password",
+    "password": "password",
+}
+
+USER_TEXT_FIELDS = ["first_name", "last_name", "phone_number", "department", "position_title", "preferred_language"]
+
+# Entity field -> import fields it is built from. When a row matches an
+# existing entity only the fields the row actually filled in are updated, so
+# re-importing a partial register never blanks out stored data.
+ENTITY_SOURCE_FIELDS = {
+    "name": ("name",),
+    "sector": ("category", "entity_type"),
+    "address": ("address", "street", "building", "unit"),
+    "postal_code": ("postal_code",),
+    "city": ("city",),
+    "country": ("country",),
+    "contact_email": ("contact_email",),
+    "contact_phone": ("contact_phone",),
+    "website": ("website",),
+    "status": ("status",),
+}
+# Columns refreshed on every matched row.
+ENTITY_ALWAYS_UPDATED = ["data_source", "last_verified_at", "updated_at"]
+
+
+class ImportFileError(ValueError):
+    """Raised when an import file cannot be read at all (as opposed to single bad rows)."""
+
+
+@dataclass
+class RowError:
+    row: int
+    field: str
+    message: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"row": self.row, "field": self.field, "message": self.message}
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    dry_run: bool = False
+    seconds: float = 0.0
+    notified: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, row: int, field_name: str, message: str) -> None:
+        self.error_count += 1
+        # Keep the response bounded when a whole file is malformed.
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(row, field_name, message))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "notified": self.notified,
+            "dry_run": self.dry_run,
+            "seconds": round(self.seconds, 3),
+            "error_count": self.error_count,
+            "errors": [error.to_dict() for error in self.errors],
+        }
+
+
+def read_table(path: str | Path, *, sheet: str | None = None) -> Iterator[tuple[int, list[Any]]]:
+    """Stream ``(row_number, values)`` from an XLSX worksheet or a CSV file."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".xlsx":
+        try:
+            yield from iter_sheet_rows(path, sheet=sheet)
+        except KeyError as exc:
+            raise ImportFileError(str(exc.args[0])) from exc
+        except Exception as exc:  # zipfile / XML errors of a damaged upload
+            if isinstance(exc, ImportFileError):
+                raise
+            raise ImportFileError(f"Nie można odczytać skoroszytu: {exc}") from exc
+    elif suffix == ".csv":
+        yield from _read_csv(path)
+    else:
+        raise ImportFileError("Obsługiwane są wyłącznie pliki XLSX i CSV.")
+
+
+def _read_csv(path: Path) -> Iterator[tuple[int, list[Any]]]:
+    encoding = _csv_encoding(path)
+    row_number = 0
+    try:
+        with path.open(newline="", encoding=encoding) as handle:
+            sample = handle.read(4096)
+            handle.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            except csv.Error:
+                dialect = csv.excel
+            for row_number, values in enumerate(csv.reader(handle, dialect), start=1):
+                if any(value.strip() for value in values):
+                    yield row_number, values
+    except UnicodeDecodeError as exc:
+        raise ImportFileError(f"Nie można odczytać pliku CSV w kodowaniu {encoding}: {exc.reason}.") from exc
+    except csv.Error as exc:
+        raise ImportFileError(f"Niepoprawny plik CSV (wiersz {row_number + 1}): {exc}") from exc
+
+
+def _csv_encoding(path: Path) -> str:
+    """UTF-8 (with or without BOM) when the whole file decodes as such, otherwise Windows-1250.
+
+    Excel in Polish locales saves "CSV (rozdzielany przecinkami)" in cp1250.
+    The check streams the file through an incremental decoder, so it costs
+    one extra sequential read and no memory.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    with path.open("rb") as handle:
+        try:
+            while chunk := handle.read(1024 * 1024):
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return CSV_FALLBACK_ENCODING
+    return "utf-8-sig"
+
+
+def iter_records(
+    rows: Iterable[tuple[int, list[Any]]], headers: dict[str, str]
+) -> Iterator[tuple[int, dict[str, str]]]:
+    """Map rows to ``{field: text}`` using the first row as the header."""
+    iterator = iter(rows)
+    try:
+        _, header_row = next(iterator)
+    except StopIteration:
+        return
+    columns = {
+        index: headers[_normalize_header(value)]
+        for index, value in enumerate(header_row)
+        if value is not None and _normalize_header(value) in headers
+    }
+    if not columns:
+        raise ImportFileError("Nie rozpoznano nagłówków kolumn w pierwszym wierszu pliku.")
+    for row_number, values in iterator:
+        record = {}
+        for index, field_name in columns.items():
+            text = cell_text(values[index]) if index < len(values) else ""
+            if text:
+                record[field_name] = text
+        yield row_number, record
+
+
+def cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Tak" if value else "Nie"
+    if isinstance(value, Decimal):
+        return str(int(value)) if value == value.to_integral() else format(value.normalize(), "f")
+    return str(value).strip()
+
+
+def import_entities(
+    records: Iterable[tuple[int, dict[str, str]]],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    data_source: str = "import",
+) -> ImportReport:
+    """Validate ``records`` and upsert them by ``registration_number`` in batches.
+
+    Each batch is an ``INSERT ... ON CONFLICT (registration_number) DO
+    UPDATE`` per set of filled-in columns (only those are updated on a
+    match) plus one query to tell inserts from updates. Rows failing
+    validation are reported and skipped; the rest of the batch still loads.
+    """
+    started = time.perf_counter()
+    report = ImportReport(dry_run=dry_run)
+    seen: dict[str, int] = {}
+    batch: list[tuple[RegulatedEntity, tuple[str, ...]]] = []
+    verified_at = timezone.now()
+
+    for row_number, record in records:
+        report.rows += 1
+        entity = _build_entity(row_number, record, report, data_source=data_source, verified_at=verified_at)
+        if entity is None:
+            report.skipped += 1
+            continue
+        key = entity.registration_number.upper()
+        if key in seen:
+            report.add_error(row_number, "registration_number", f"Numer {entity.registration_number} powtarza się (wiersz {seen[key]}).")
+            report.skipped += 1
+            continue
+        seen[key] = row_number
+        batch.append((entity, _supplied_fields(record)))
+        if len(batch) >= batch_size:
+            _flush_entities(batch, report, dry_run=dry_run)
+            batch = []
+    if batch:
+        _flush_entities(batch, report, dry_run=dry_run)
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def import_entities_file(path: str | Path, *, sheet: str | None = None, **options) -> ImportReport:
+    return import_entities(iter_records(read_table(path, sheet=sheet), ENTITY_HEADERS), **options)
+
+
+def _build_entity(row_number: int, record: dict[str, str], report: ImportReport, *, data_source: str, verified_at) -> RegulatedEntity | None:
+    errors_before = report.error_count
+    # Report uploads identify entities by their register entry (RIP…); rows
+    # without one fall back to the UKNF code so they can still be upserted.
+    registration_number = record.get("register_number") or record.get("uknf_code") or ""
+    name = record.get("name", "")
+    if not registration_number:
+        report.add_error(row_number, "registration_number", "Brak numeru wpisu do rejestru ani kodu UKNF.")
+    if not name:
+        report.add_error(row_number, "name", "Brak nazwy podmiotu.")
+
+    address = record.get("address") or _join_address(record)
+    status_text = record.get("status", "").casefold()
+    status = ENTITY_STATUSES.get(status_text, RegulatedEntity.EntityStatus.ACTIVE if not status_text else None)
+    if status is None:
+        report.add_error(row_number, "status", f"Nieznany status podmiotu: {record['status']}.")
+    contact_email = record.get("contact_email", "")
+    if contact_email:
+        try:
+            validate_email(contact_email)
+        except ValidationError:
+            report.add_error(row_number, "contact_email", f"Nieprawidłowy adres e-mail: {contact_email}.")
+
+    values = {
+        "registration_number": registration_number,
+        "name": name,
+        "sector": record.get("category") or record.get("entity_type") or "Nieznany",
+        "address": address or "Nieznany",
+        "postal_code": record.get("postal_code", ""),
+        "city": record.get("city", ""),
+        "country": record.get("country") or "PL",
+        "contact_email": contact_email,
+        "contact_phone": record.get("contact_phone", ""),
+        "website": record.get("website", ""),
+    }
+    for field_name, value in values.items():
+        max_length = RegulatedEntity._meta.get_field(field_name).max_length
+        if max_length and len(value) > max_length:
+            report.add_error(row_number, field_name, f"Wartość przekracza {max_length} znaków.")
+    if report.error_count != errors_before:
+        return None
+    return RegulatedEntity(**values, status=status, data_source=data_source[:128], last_verified_at=verified_at)
+
+
+def _supplied_fields(record: dict[str, str]) -> tuple[str, ...]:
+    return tuple(
+        field_name for field_name, sources in ENTITY_SOURCE_FIELDS.items() if any(record.get(key) for key in sources)
+    )
+
+
+def _join_address(record: dict[str, str]) -> str:
+    street = record.get("street", "")
+    number = record.get("building", "")
+    if record.get("unit"):
+        number = f"{number}/{record['unit']}" if number else record["unit"]
+    return " ".join(part for part in (street, number) if part)
+
+
+def _flush_entities(batch: list[tuple[RegulatedEntity, tuple[str, ...]]], report: ImportReport, *, dry_run: bool) -> None:
+    # Registration numbers match case-insensitively, as in
+    # ``find_entity_by_registration_number``; rows take the stored spelling so
+    # the upsert below hits the existing entity instead of inserting a twin.
+    stored: dict[str, str] = {}
+    for key, number in (
+        RegulatedEntity.objects.alias(registration_upper=Upper("registration_number"))
+        .filter(registration_upper__in=[entity.registration_number.upper() for entity, _ in batch])
+        .order_by("-pk")
+        .values_list(Upper("registration_number"), "registration_number")
+    ):
+        stored[key] = number
+    existing = 0
+    for entity, _ in batch:
+        number = stored.get(entity.registration_number.upper())
+        if number is not None:
+            entity.registration_number = number
+            existing += 1
+    report.created += len(batch) - existing
+    report.updated += existing
+    if dry_run:
+        return
+    # One upsert per set of filled-in columns; a register export usually
+    # yields a handful of groups per batch.
+    groups: dict[tuple[str, ...], list[RegulatedEntity]] = {}
+    for entity, supplied in batch:
+        groups.setdefault(supplied, []).append(entity)
+    with transaction.atomic():
+        for supplied, entities in groups.items():
+            RegulatedEntity.objects.bulk_create(
+                entities,
+                update_conflicts=True,
+                unique_fields=["registration_number"],
+                update_fields=[*supplied, *ENTITY_ALWAYS_UPDATED],
+            )
+
+
+def import_users(
+    records: Iterable[tuple[int, dict[str, str]]],
+    *,
+    batch_size: int = DEFAULT_USER_BATCH_SIZE,
+    dry_run: bool = False,
+    send_activation: bool = True,
+    request=None,
+    hash_workers: int | None = None,
+) -> ImportReport:
+    """Validate ``records`` and create the users they describe with ``bulk_create``.
+
+    Existing e-mail addresses are reported, never overwritten. Provided
+    passwords are hashed in one process pool shared by all batches and make
+    the account active; accounts without one stay inactive and their
+    activation e-mails are queued in the same transaction as the batch.
+    """
+    started = time.perf_counter()
+    report = ImportReport(dry_run=dry_run)
+    with PasswordHasherPool(hash_workers) as hasher:
+        options = {"dry_run": dry_run, "send_activation": send_activation, "request": request, "hasher": hasher}
+        _import_user_records(records, report, batch_size=batch_size, options=options)
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _import_user_records(
+    records: Iterable[tuple[int, dict[str, str]]], report: ImportReport, *, batch_size: int, options: dict[str, Any]
+) -> None:
+    seen: dict[str, int] = {}
+    batch: list[tuple[int, User, str]] = []
+    for row_number, record in records:
+        report.rows += 1
+        built = _build_user(row_number, record, report)
+        if built is None:
+            report.skipped += 1
+            continue
+        user, password = built
+        key = user.email.casefold()
+        if key in seen:
+            report.add_error(row_number, "email", f"Adres {user.email} powtarza się (wiersz {seen[key]}).")
+            report.skipped += 1
+            continue
+        seen[key] = row_number
+        batch.append((row_number, user, password))
+        if len(batch) >= batch_size:
+            _flush_users(batch, report, **options)
+            batch = []
+    if batch:
+        _flush_users(batch, report, **options)
+
+
+def import_users_file(path: str | Path, *, sheet: str | None = None, **options) -> ImportReport:
+    return import_users(iter_records(read_table(path, sheet=sheet), USER_HEADERS), **options)
+
+
+def count_user_passwords(path: str | Path, *, sheet: str | None = None) -> int:
+    """Number of rows in a user import file that carry a password."""
+    return sum(1 for _, record in iter_records(read_table(path, sheet=sheet), USER_HEADERS) if record.get("password"))
+
+
+def _build_user(row_number: int, record: dict[str, str], report: ImportReport) -> tuple[User, str] | None:
+    errors_before = report.error_count
+    email = User.objects.normalize_email(record.get("email", ""))
+    if not email:
+        report.add_error(row_number, "email", "Brak adresu e-mail.")
+
+    role = _choice(User.UserRole, record.get("role"), User.UserRole.ENTITY_ADMIN)
+    if role is None:
+        report.add_error(row_number, "role", f"Nieznana rola: {record['role']}.")
+    user_type = _choice(User.UserType, record.get("user_type"), User.UserType.OTHER)
+    if user_type is None:
+        report.add_error(row_number, "user_type", f"Nieznany typ użytkownika: {record['user_type']}.")
+
+    user = User(
+        email=email,
+        username=email,
+        role=role or User.UserRole.ENTITY_ADMIN,
+        user_type=user_type or User.UserType.OTHER,
+        pesel=record.get("pesel", ""),
+        must_change_password=True,
+        **{name: record[name] for name in USER_TEXT_FIELDS if name in record},
+    )
+    for name in ["email", "pesel", *USER_TEXT_FIELDS]:
+        value = getattr(user, name)
+        if not value:
+            continue
+        # The model's own validators: e-mail format, PESEL and phone patterns, lengths.
+        try:
+            User._meta.get_field(name).run_validators(value)
+        except ValidationError as exc:
+            report.add_error(row_number, name, " ".join(exc.messages))
+
+    password = record.get("password", "")
+    if password:
+        try:
+            validate_password(password, user=user)
+        except ValidationError as exc:
+            report.add_error(row_number, "password", " ".join(exc.messages))
+    if report.error_count != errors_before:
+        return None
+    user.is_active = bool(password)
+    return user, password
+
+
+def _flush_users(
+    batch: list[tuple[int, User, str]],
+    report: ImportReport,
+    *,
+    dry_run: bool,
+    send_activation: bool,
+    request,
+    hasher: PasswordHasherPool,
+) -> None:
+    existing = set(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=[user.email.lower() for _, user, _ in batch])
+        .values_list("email_lower", flat=True)
+    )
+    pending = []
+    for row_number, user, password in batch:
+        if user.email.lower() in existing:
+            report.add_error(row_number, "email", f"Użytkownik {user.email} już istnieje.")
+            report.skipped += 1
+        else:
+            pending.append((user, password))
+    report.created += len(pending)
+    inactive = [user for user, password in pending if not password]
+    if send_activation:
+        report.notified += len(inactive)
+    if dry_run or not pending:
+        return
+
+    with_password = [(user, password) for user, password in pending if password]
+    hashes = hasher.hash([password for _, password in with_password])
+    for (user, _), hashed in zip(with_password, hashes):
+        user.password = hashed
+    for user in inactive:
+        user.set_unusable_password()
+    with transaction.atomic():
+        User.objects.bulk_create([user for user, _ in pending])
+        if send_activation and inactive:
+            from .services import send_activation_emails
+
+            send_activation_emails(inactive, request=request)
+
+
+def _choice(choices, value: str | None, default):
+    if not value:
+        return default
+    wanted = value.strip().casefold()
+    for choice in choices:
+        if wanted in {choice.value.casefold(), str(choice.label).casefold()}:
+            return choice
+    return None
+
+
+def _normalize_header(value: Any) -> str:
+    return " ".join(str(value).split()).casefold()
+
+
+__all__ = [
+    "ENTITY_HEADERS",
+    "ImportFileError",
+    "ImportReport",
+    "RowError",
+    "USER_HEADERS",
+    "count_user_passwords",
+    "import_entities",
+    "import_entities_file",
+    "import_users",
+    "import_users_file",
+    "iter_records",
+    "read_table",
+]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from django.db.models import Value
+from django.db.models.functions import Lower, Upper
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import RegulatedEntity
+
+ENTITY_ID_CACHE_SIZE = 1024
+
+
+class EntityIdCache:
+    """Small in-process LRU from an upper-cased registration number (``RIP…``) to an entity id.
+
+    Hits are re-checked against the row they point to, so an entry left
+    stale by a bulk update only costs the primary-key lookup it replaces.
+    """
+
+    def __init__(self, size: int = ENTITY_ID_CACHE_SIZE) -> None:
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+
+    def get(self, key: str) -> int | None:
+        with self._lock:
+            entity_id = self._entries.get(key)
+            if entity_id is not None:
+                self._entries.move_to_end(key)
+            return entity_id
+
+    def put(self, key: str, entity_id: int) -> None:
+        with self._lock:
+            self._entries[key] = entity_id
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard_entity(self, entity_id: int) -> None:
+        with self._lock:
+            for key in [key for key, value in self._entries.items() if value == entity_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+entity_id_cache = EntityIdCache()
+
+
+def find_entity_by_registration_number(identifier: str) -> RegulatedEntity | None:
+    """Case-insensitive lookup served by ``entity_registration_upper_idx`` and the id cache."""
+    key = identifier.strip().upper()
+    if not key:
+        return None
+    entity_id = entity_id_cache.get(key)
+    if entity_id is not None:
+        entity = RegulatedEntity.objects.filter(pk=entity_id).first()
+        if entity is not None and entity.registration_number.upper() == key:
+            return entity
+        entity_id_cache.discard_entity(entity_id)
+    entity = (
+        RegulatedEntity.objects.alias(registration_upper=Upper("registration_number"))
+        .filter(registration_upper=Upper(Value(identifier.strip())))
+        .order_by("pk")
+        .first()
+    )
+    if entity is not None:
+        entity_id_cache.put(key, entity.pk)
+    return entity
+
+
+def find_entity_by_name(name: str) -> RegulatedEntity | None:
+    """Case-insensitive name lookup served by ``entity_name_lower_idx``.
+
+    Both sides go through the database's ``LOWER`` so the comparison matches
+    the index expression (and ``iexact``) on every backend.
+    """
+    name = name.strip()
+    if not name:
+        return None
+    return (
+        RegulatedEntity.objects.alias(name_lower=Lower("name"))
+        .filter(name_lower=Lower(Value(name)))
+        .order_by("pk")
+        .first()
+    )
+
+
+@receiver(post_save, sender=RegulatedEntity)
+@receiver(post_delete, sender=RegulatedEntity)
+def _entity_changed(sender, instance, **kwargs) -> None:
+    entity_id_cache.discard_entity(instance.pk)
+
+
+__all__ = ["EntityIdCache", "entity_id_cache", "find_entity_by_name", "find_entity_by_registration_number"]
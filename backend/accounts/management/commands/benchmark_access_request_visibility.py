@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.visibility_benchmark import VisibilityScale, run_visibility_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Porównuje filtry widoczności wniosków o dostęp (złączenia z DISTINCT oraz podzapytania EXISTS) "
+        "na syntetycznym zbiorze tysięcy podmiotów i dziesiątek tysięcy wniosków."
+    )
+
+    def add_arguments(self, parser):
+        defaults = VisibilityScale()
+        parser.add_argument("--entities", type=int, default=defaults.entities, help="Liczba podmiotów.")
+        parser.add_argument("--requests", type=int, default=defaults.access_requests, help="Liczba wniosków o dostęp.")
+        parser.add_argument(
+            "--probe-entities",
+            type=int,
+            default=defaults.probe_entities,
+            help="Liczba podmiotów przypisanych badanym użytkownikom (nadzorowane, administrowane, członkostwa).",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Liczba pomiarów każdego wariantu.")
+        parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora danych syntetycznych.")
+        parser.add_argument("--explain", action="store_true", help="Dołącz plany zapytań (EXPLAIN) do wyników.")
+        parser.add_argument("--output", help="Ścieżka pliku JSON z wynikami (domyślnie standardowe wyjście).")
+        parser.add_argument("--keep-data", action="store_true", help="Nie usuwaj danych syntetycznych po zakończeniu.")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat musi być dodatnie.")
+        if options["entities"] < 1 or options["requests"] < 1:
+            raise CommandError("--entities i --requests muszą być dodatnie.")
+        scale = VisibilityScale(
+            entities=options["entities"],
+            access_requests=options["requests"],
+            requesters=max(1, options["requests"] // 5),
+            probe_entities=options["probe_entities"],
+        )
+        try:
+            measurements = run_visibility_benchmark(
+                scale,
+                repeat=options["repeat"],
+                seed=options["seed"],
+                explain=options["explain"],
+                keep_data=options["keep_data"],
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+
+        results = [measurement.to_dict() for measurement in measurements]
+        payload = json.dumps({"entities": scale.entities, "access_requests": scale.access_requests, "results": results}, indent=2, ensure_ascii=False)
+        if options["output"]:
+            Path(options["output"]).write_text(payload + "\n", encoding="utf-8")
+        else:
+            self.stdout.write(payload)
+        for result in results:
+            self.stderr.write(
+                f"{result['case']:<24} {result['variant']:<22} {result['rows']:>7} wierszy: "
+                f"strona {result['page_median_ms']:.1f} ms, liczność {result['count_median_ms']:.1f} ms"
+            )
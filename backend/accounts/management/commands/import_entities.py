@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.imports import DEFAULT_BATCH_SIZE, ImportFileError, import_entities_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Importuje podmioty nadzorowane z arkusza XLSX lub pliku CSV, aktualizując istniejące "
+        "wpisy po numerze rejestrowym."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Ścieżka pliku XLSX lub CSV.")
+        parser.add_argument("--sheet", help="Nazwa arkusza (domyślnie pierwszy arkusz skoroszytu).")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Liczba wierszy zapisywanych jednym zapytaniem.")
+        parser.add_argument("--dry-run", action="store_true", help="Tylko zwaliduj plik, bez zapisu do bazy.")
+        parser.add_argument("--report", help="Ścieżka pliku JSON z raportem błędów (domyślnie standardowe wyjście).")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"Plik {path} nie istnieje.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size musi być dodatnie.")
+        try:
+            report = import_entities_file(
+                path,
+                sheet=options["sheet"],
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+                data_source=f"import:{path.name}",
+            )
+        except ImportFileError as exc:
+            raise CommandError(str(exc)) from exc
+
+        payload = json.dumps(report.to_dict(), indent=2, ensure_ascii=False)
+        if options["report"]:
+            Path(options["report"]).write_text(payload + "\n", encoding="utf-8")
+        else:
+            self.stdout.write(payload)
+        self.stderr.write(
+            f"Wiersze: {report.rows}, utworzone: {report.created}, zaktualizowane: {report.updated}, "
+            f"pominięte: {report.skipped}, błędy: {report.error_count} ({report.seconds:.2f} s)."
+        )
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.imports import DEFAULT_USER_BATCH_SIZE, ImportFileError, import_users_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Zakłada konta użytkowników z arkusza XLSX lub pliku CSV. Podane hasła są haszowane "
+        "równolegle, pozostałe konta otrzymują wiadomości aktywacyjne."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Ścieżka pliku XLSX lub CSV.")
+        parser.add_argument("--sheet", help="Nazwa arkusza (domyślnie pierwszy arkusz skoroszytu).")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_USER_BATCH_SIZE, help="Liczba wierszy zapisywanych jednym zapytaniem.")
+        parser.add_argument("--dry-run", action="store_true", help="Tylko zwaliduj plik, bez zapisu do bazy.")
+        parser.add_argument("--no-activation", action="store_true", help="Nie wysyłaj wiadomości aktywacyjnych.")
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            help="Liczba procesów haszujących hasła (domyślnie USER_IMPORT_HASH_WORKERS).",
+        )
+        parser.add_argument("--report", help="Ścieżka pliku JSON z raportem błędów (domyślnie standardowe wyjście).")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"Plik {path} nie istnieje.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size musi być dodatnie.")
+        try:
+            report = import_users_file(
+                path,
+                sheet=options["sheet"],
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+                send_activation=not options["no_activation"],
+                hash_workers=options["hash_workers"],
+            )
+        except ImportFileError as exc:
+            raise CommandError(str(exc)) from exc
+
+        payload = json.dumps(report.to_dict(), indent=2, ensure_ascii=False)
+        if options["report"]:
+            Path(options["report"]).write_text(payload + "\n", encoding="utf-8")
+        else:
+            self.stdout.write(payload)
+        self.stderr.write(
+            f"Wiersze: {report.rows}, utworzone: {report.created}, pominięte: {report.skipped}, "
+            f"wiadomości aktywacyjne: {report.notified}, błędy: {report.error_count} ({report.seconds:.2f} s)."
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:01
+
+import uknf_platform.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_sample_external_users'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='accessrequestattachment',
+            name='file',
+            field=models.FileField(max_length=255, storage=uknf_platform.storage.attachment_storage, upload_to='access_requests/attachments/%Y/%m/%d'),
+        ),
+        migrations.AlterField(
+            model_name='accessrequestmessageattachment',
+            name='file',
+            field=models.FileField(max_length=255, storage=uknf_platform.storage.attachment_storage, upload_to='access_requests/messages/%Y/%m/%d'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_attachment_blob_storage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accessrequest',
+            index=models.Index(fields=['created_at', 'id'], name='access_request_created_idx'),
+        ),
+    ]
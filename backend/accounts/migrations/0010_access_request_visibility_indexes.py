@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_access_request_created_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accessrequestline',
+            index=models.Index(fields=['entity', 'request'], name='access_line_entity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entitymembership',
+            index=models.Index(fields=['user', 'role', 'entity'], name='membership_user_role_idx'),
+        ),
+    ]
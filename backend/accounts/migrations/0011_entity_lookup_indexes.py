@@ -0,0 +1,22 @@
+# Generated by Django 5.0.14 on 2026-10-19 19:02
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_access_request_visibility_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='regulatedentity',
+            index=models.Index(django.db.models.functions.text.Upper('registration_number'), name='entity_registration_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='regulatedentity',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='entity_name_lower_idx'),
+        ),
+    ]
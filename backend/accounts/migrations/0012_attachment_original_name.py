@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-19 19:31
+
+from pathlib import PurePosixPath
+
+from django.db import migrations, models
+
+
+def backfill_original_names(apps, schema_editor):
+    # Existing rows keep showing the last segment of their stored name.
+    for model_name in ("AccessRequestAttachment", "AccessRequestMessageAttachment"):
+        model = apps.get_model("accounts", model_name)
+        rows = []
+        for row in model.objects.exclude(file="").only("pk", "file").iterator(chunk_size=2000):
+            row.original_name = PurePosixPath(row.file.name).name[:255]
+            rows.append(row)
+        model.objects.bulk_update(rows, ["original_name"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_entity_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accessrequestattachment',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='accessrequestmessageattachment',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(backfill_original_names, migrations.RunPython.noop),
+    ]
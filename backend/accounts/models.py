@@ -4,9 +4,12 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.functions import Lower, Upper
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 
+from uknf_platform.storage import attachment_storage, remember_original_name
+
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
@@ -82,15 +85,19 @@ class User(AbstractUser):
 
     objects = UserManager()
 
+    INTERNAL_ROLES = frozenset(
+        {
+            UserRole.SYSTEM_ADMIN,
+            UserRole.SUPERVISOR,
+            UserRole.ANALYST,
+            UserRole.COMMUNICATION_OFFICER,
+            UserRole.AUDITOR,
+        }
+    )
+
     @property
     def is_internal(self) -> bool:
-        return self.role in {
-            self.UserRole.SYSTEM_ADMIN,
-            self.UserRole.SUPERVISOR,
-            self.UserRole.ANALYST,
-            self.UserRole.COMMUNICATION_OFFICER,
-            self.UserRole.AUDITOR,
-        }
+        return self.role in self.INTERNAL_ROLES
 
     def __str__(self) -> str:  # pragma: no cover - human-readable
         return f"{self.email} ({self.get_role_display()})"
@@ -128,6 +135,13 @@ class RegulatedEntity(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Case-insensitive lookups (accounts.lookup) compare these expressions.
+        indexes = [
+            models.Index(Upper("registration_number"), name="entity_registration_upper_idx"),
+            models.Index(Lower("name"), name="entity_name_lower_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.name} ({self.registration_number})"
 
@@ -147,6 +161,7 @@ class EntityMembership(models.Model):
 
     class Meta:
         unique_together = ("user", "entity", "role")
+        indexes = [models.Index(fields=["user", "role", "entity"], name="membership_user_role_idx")]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.user.email} -> {self.entity.name} ({self.get_role_display()})"
@@ -196,6 +211,7 @@ class AccessRequest(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["created_at", "id"], name="access_request_created_idx")]
 
     def save(self, *args, **kwargs):
         creating = self.pk is None
@@ -325,10 +341,19 @@ class AccessRequestHistoryEntry(models.Model):
 class AccessRequestAttachment(models.Model):
     request = models.ForeignKey(AccessRequest, on_delete=models.CASCADE, related_name="attachments")
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL)
-    file = models.FileField(upload_to="access_requests/attachments/%Y/%m/%d")
+    file = models.FileField(
+        upload_to="access_requests/attachments/%Y/%m/%d",
+        storage=attachment_storage,
+        max_length=255,
+    )
+    original_name = models.CharField(max_length=255, blank=True)
     description = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        remember_original_name(self)
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:  # pragma: no cover
         return f"Attachment({self.file.name})"
 
@@ -365,6 +390,7 @@ class AccessRequestLine(models.Model):
 
     class Meta:
         unique_together = ("request", "entity")
+        indexes = [models.Index(fields=["entity", "request"], name="access_line_entity_idx")]
 
     def set_next_actor_from_permissions(self) -> None:
         if self.status in {self.LineStatus.APPROVED, self.LineStatus.BLOCKED}:
@@ -460,10 +486,19 @@ class AccessRequestMessage(models.Model):
 
 class AccessRequestMessageAttachment(models.Model):
     message = models.ForeignKey(AccessRequestMessage, on_delete=models.CASCADE, related_name="attachments")
-    file = models.FileField(upload_to="access_requests/messages/%Y/%m/%d")
+    file = models.FileField(
+        upload_to="access_requests/messages/%Y/%m/%d",
+        storage=attachment_storage,
+        max_length=255,
+    )
+    original_name = models.CharField(max_length=255, blank=True)
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        remember_original_name(self)
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:  # pragma: no cover
         return f"MessageAttachment({self.file.name})"
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from rest_framework.permissions import BasePermission
 
+from .authorization import get_authorization_context
 from .models import User
 
 
@@ -9,16 +10,14 @@ class IsInternalUser(BasePermission):
     message = "Dostęp wymaga uprawnień użytkownika wewnętrznego."
 
     def has_permission(self, request, view) -> bool:
-        return bool(request.user and request.user.is_authenticated and request.user.is_internal)
+        return get_authorization_context(request).is_internal
 
 
 class IsEntityMember(BasePermission):
     message = "Dostęp wymaga powiązania z podmiotem."
 
     def has_permission(self, request, view) -> bool:
-        if not request.user or not request.user.is_authenticated:
-            return False
-        return request.user.memberships.exists()
+        return bool(get_authorization_context(request).entity_ids)
 
 
 class HasRole(BasePermission):
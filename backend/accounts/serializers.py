@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import default_token_generator
@@ -8,6 +10,9 @@ from django.utils.http import urlsafe_base64_decode
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from uknf_platform.profiling import ProfiledSerializerMixin
+
+from .authentication import token_cache
 from .models import (
     AccessRequest,
     AccessRequestAttachment,
@@ -175,6 +180,7 @@ class ActivateAccountSerializer(serializers.Serializer):
         user.is_active = True
         user.must_change_password = False
         user.save(update_fields=["password", "is_active", "must_change_password"])
+        token_cache.invalidate_user(user.pk)
         from .services import ensure_initial_access_request
 
         ensure_initial_access_request(user)
@@ -238,8 +244,8 @@ class AccessRequestAttachmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = AccessRequestAttachment
-        fields = ["id", "file", "description", "uploaded_by", "created_at"]
-        read_only_fields = ["id", "uploaded_by", "created_at"]
+        fields = ["id", "file", "original_name", "description", "uploaded_by", "created_at"]
+        read_only_fields = ["id", "original_name", "uploaded_by", "created_at"]
 
     def get_uploaded_by(self, obj):
         if not obj.uploaded_by:
@@ -346,8 +352,8 @@ class AccessRequestHistorySerializer(serializers.ModelSerializer):
 class AccessRequestMessageAttachmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = AccessRequestMessageAttachment
-        fields = ["id", "file", "uploaded_by", "created_at"]
-        read_only_fields = ["id", "uploaded_by", "created_at"]
+        fields = ["id", "file", "original_name", "uploaded_by", "created_at"]
+        read_only_fields = ["id", "original_name", "uploaded_by", "created_at"]
 
 
 class AccessRequestMessageSerializer(serializers.ModelSerializer):
@@ -374,12 +380,46 @@ class AccessRequestMessageCreateSerializer(serializers.Serializer):
     is_internal = serializers.BooleanField(default=False)
 
 
+class EntityImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    dry_run = serializers.BooleanField(default=False)
+    sheet = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_file(self, value):
+        if Path(value.name).suffix.lower() not in {".xlsx", ".csv"}:
+            raise serializers.ValidationError("Obsługiwane są wyłącznie pliki XLSX i CSV.")
+        return value
+
+
+class UserImportSerializer(EntityImportSerializer):
+    send_activation = serializers.BooleanField(default=True)
+
+
+class AccessRequestLineDecisionSerializer(serializers.Serializer):
+    line_id = serializers.IntegerField()
+    decision = serializers.ChoiceField(choices=[("approve", "Akceptacja"), ("block", "Blokada")])
+    notes = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class AccessRequestBulkDecisionSerializer(serializers.Serializer):
+    MAX_DECISIONS = 500
+
+    decisions = AccessRequestLineDecisionSerializer(many=True, allow_empty=False, max_length=MAX_DECISIONS)
+    notes = serializers.CharField(required=False, allow_blank=True, default="")
+
+    def validate_decisions(self, value):
+        line_ids = [decision["line_id"] for decision in value]
+        if len(set(line_ids)) != len(line_ids):
+            raise serializers.ValidationError("Każda linia wniosku może wystąpić tylko raz.")
+        return value
+
+
 class AccessRequestAttachmentUploadSerializer(serializers.Serializer):
     file = serializers.FileField()
     description = serializers.CharField(required=False, allow_blank=True)
 
 
-class AccessRequestSerializer(serializers.ModelSerializer):
+class AccessRequestSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     requester = UserSerializer(read_only=True)
     requester_pesel_masked = serializers.CharField(read_only=True)
     lines = AccessRequestLineSerializer(many=True, read_only=True)
@@ -426,6 +466,41 @@ class AccessRequestSerializer(serializers.ModelSerializer):
         }
 
 
+class AccessRequestSummarySerializer(serializers.ModelSerializer):
+    """List representation built from the requester snapshot and annotated counts.
+
+    Expects the queryset annotations added by ``AccessRequestViewSet`` for the
+    ``list`` action, so serializing a page never touches related tables.
+    """
+
+    lines_count = serializers.IntegerField(read_only=True)
+    lines_pending = serializers.IntegerField(read_only=True)
+    unread_messages = serializers.IntegerField(read_only=True)
+    last_activity_at = serializers.DateTimeField(read_only=True)
+
+    class Meta:
+        model = AccessRequest
+        fields = [
+            "id",
+            "reference_code",
+            "status",
+            "next_actor",
+            "handled_by_uknf",
+            "requester_first_name",
+            "requester_last_name",
+            "requester_email",
+            "submitted_at",
+            "decided_at",
+            "created_at",
+            "updated_at",
+            "lines_count",
+            "lines_pending",
+            "unread_messages",
+            "last_activity_at",
+        ]
+        read_only_fields = fields
+
+
 class AccessRequestLineInputSerializer(serializers.Serializer):
     entity_id = serializers.PrimaryKeyRelatedField(queryset=RegulatedEntity.objects.all(), source="entity")
     contact_email = serializers.EmailField(required=False, allow_blank=True)
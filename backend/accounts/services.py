@@ -1,15 +1,21 @@
 from __future__ import annotations
 
-import logging
+from dataclasses import dataclass, field
 
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.db import transaction
+from django.db.models import Count, Q, QuerySet
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+from communication.mail_queue import enqueue_email, enqueue_emails
+
+from .authentication import token_cache
+from .authorization import AuthorizationContext, build_authorization_context, invalidate_authorization_context
 from .models import (
     AccessRequest,
     AccessRequestHistoryEntry,
@@ -19,8 +25,6 @@ from .models import (
     User,
 )
 
-logger = logging.getLogger(__name__)
-
 
 # --- Konto użytkownika ----------------------------------------------------
 
@@ -42,7 +46,7 @@ def build_activation_link(user, request=None) -> tuple[str, str, str]:
     return link, uid, token
 
 
-def send_activation_email(user, request=None) -> str:
+def build_activation_email(user, request=None) -> tuple[str, EmailMessage]:
     link, _, _ = build_activation_link(user, request=request)
     subject = "Aktywacja konta w Platformie Komunikacyjnej UKNF"
     message = (
@@ -52,10 +56,20 @@ def send_activation_email(user, request=None) -> str:
         f"{link}\n\n"
         "Jeżeli nie inicjowałeś/aś tej rejestracji, zignoruj tę wiadomość."
     )
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email])
+    return link, EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email])
+
+
+def send_activation_email(user, request=None) -> str:
+    link, message = build_activation_email(user, request=request)
+    enqueue_email(message)
     return link
 
 
+def send_activation_emails(users, request=None) -> int:
+    """Queue activation e-mails for ``users``; returns the number of messages queued."""
+    return enqueue_emails(build_activation_email(user, request=request)[1] for user in users)
+
+
 # --- Wnioski o dostęp ------------------------------------------------------
 
 
@@ -84,6 +98,45 @@ def ensure_initial_access_request(user: User) -> AccessRequest:
     return request
 
 
+def visible_access_requests(
+    queryset: QuerySet,
+    user: User,
+    *,
+    filter_name: str = "",
+    context: AuthorizationContext | None = None,
+) -> QuerySet:
+    """Restrict ``queryset`` to the access requests ``user`` may see.
+
+    Entity scoping is a ``pk IN (SELECT request_id ...)`` semi-join over
+    ``AccessRequestLine``, answered from the covering ``(entity, request)``
+    index, rather than a join: a request with several matching lines still
+    yields one row, so no ``DISTINCT`` is needed on top of the list
+    annotations. A correlated ``EXISTS`` pages just as fast but makes
+    SQLite probe every request when counting.
+    """
+    context = context or build_authorization_context(user)
+    if context.is_internal:
+        filter_name = filter_name.lower().strip()
+        if filter_name == "moje-podmioty":
+            return queryset.filter(_lines_for_entities(context.managed_entity_ids))
+        if filter_name in {"wymaga-dzialania-uknf", "wymaga działania uknf"}:
+            return queryset.filter(next_actor=AccessRequest.NextActor.UKNF)
+        if filter_name == "obslugiwany-przez-uknf":
+            return queryset.filter(handled_by_uknf=True)
+        return queryset
+
+    if context.role == User.UserRole.ENTITY_ADMIN:
+        return queryset.filter(_lines_for_entities(context.entity_ids_with_role(EntityMembership.MembershipRole.ADMIN)))
+
+    if context.entity_ids:
+        return queryset.filter(_lines_for_entities(context.entity_ids))
+    return queryset.filter(requester=user)
+
+
+def _lines_for_entities(entity_ids) -> Q:
+    return Q(pk__in=AccessRequestLine.objects.filter(entity_id__in=entity_ids).values("request_id"))
+
+
 def _add_history_entry(
     request: AccessRequest,
     *,
@@ -93,7 +146,26 @@ def _add_history_entry(
     to_status: str | None = None,
     payload: dict | None = None,
 ) -> None:
-    AccessRequestHistoryEntry.objects.create(
+    _history_entry(
+        request,
+        actor=actor,
+        action=action,
+        from_status=from_status,
+        to_status=to_status,
+        payload=payload,
+    ).save()
+
+
+def _history_entry(
+    request: AccessRequest,
+    *,
+    actor: User | None,
+    action: str,
+    from_status: str | None = None,
+    to_status: str | None = None,
+    payload: dict | None = None,
+) -> AccessRequestHistoryEntry:
+    return AccessRequestHistoryEntry(
         request=request,
         actor=actor,
         action=action,
@@ -197,10 +269,51 @@ def return_to_requester(access_request: AccessRequest, actor: User, *, reason: s
     return access_request
 
 
+_LINE_COUNTS = {
+    "total": Count("pk"),
+    "approved": Count("pk", filter=Q(status=AccessRequestLine.LineStatus.APPROVED)),
+    "blocked": Count("pk", filter=Q(status=AccessRequestLine.LineStatus.BLOCKED)),
+}
+
+REQUEST_APPROVED_EMAIL = (
+    "Wniosek o dostęp został zaakceptowany",
+    "Dzień dobry,\n\n"
+    "Twój wniosek o dostęp został zaakceptowany. Możesz zalogować się do systemu"
+    " i korzystać z przypisanych uprawnień.",
+)
+REQUEST_BLOCKED_EMAIL = (
+    "Wniosek o dostęp został zablokowany",
+    "Dzień dobry,\n\n"
+    "Twój wniosek o dostęp został zablokowany. Skontaktuj się z administratorem"
+    " w celu uzyskania dodatkowych informacji.",
+)
+
+
 def _refresh_request_status(access_request: AccessRequest, *, actor: User | None = None, notes: str = "") -> None:
-    total = access_request.lines.count()
-    approved = access_request.lines.filter(status=AccessRequestLine.LineStatus.APPROVED).count()
-    blocked = access_request.lines.filter(status=AccessRequestLine.LineStatus.BLOCKED).count()
+    counts = access_request.lines.aggregate(**_LINE_COUNTS)
+    history: list[AccessRequestHistoryEntry] = []
+    emails: list[tuple[AccessRequest, str, str]] = []
+    _apply_line_counts(access_request, counts, actor=actor, notes=notes, history=history, emails=emails)
+    AccessRequestHistoryEntry.objects.bulk_create(history)
+    for _, subject, body in emails:
+        _send_request_email(access_request, subject=subject, body=body)
+
+
+def _apply_line_counts(
+    access_request: AccessRequest,
+    counts: dict[str, int],
+    *,
+    actor: User | None,
+    notes: str,
+    history: list[AccessRequestHistoryEntry],
+    emails: list[tuple[AccessRequest, str, str]],
+) -> None:
+    """Move ``access_request`` to the status its line counts imply.
+
+    History entries and e-mails are appended to ``history`` and ``emails``
+    so that callers deciding many lines can write and send them in bulk.
+    """
+    total, approved, blocked = counts["total"], counts["approved"], counts["blocked"]
 
     if total == 0:
         access_request.mark_updated(actor=actor)
@@ -213,64 +326,193 @@ def _refresh_request_status(access_request: AccessRequest, *, actor: User | None
 
     if approved == total:
         access_request.mark_approved(actor=actor or access_request.requester, notes=notes)
-        _add_history_entry(
-            access_request,
-            actor=actor,
-            action="request.approved",
-            to_status=AccessRequest.AccessStatus.APPROVED,
-            payload={"notes": notes},
-        )
-        _send_request_email(
-            access_request,
-            subject="Wniosek o dostęp został zaakceptowany",
-            body=(
-                "Dzień dobry,\n\n"
-                "Twój wniosek o dostęp został zaakceptowany. Możesz zalogować się do systemu"
-                " i korzystać z przypisanych uprawnień."
-            ),
+        history.append(
+            _history_entry(
+                access_request,
+                actor=actor,
+                action="request.approved",
+                to_status=AccessRequest.AccessStatus.APPROVED,
+                payload={"notes": notes},
+            )
         )
+        emails.append((access_request, *REQUEST_APPROVED_EMAIL))
         return
 
     if blocked == total:
         access_request.mark_blocked(actor=actor or access_request.requester, notes=notes)
-        _add_history_entry(
-            access_request,
-            actor=actor,
-            action="request.blocked",
-            to_status=AccessRequest.AccessStatus.BLOCKED,
-            payload={"notes": notes},
-        )
-        _send_request_email(
-            access_request,
-            subject="Wniosek o dostęp został zablokowany",
-            body=(
-                "Dzień dobry,\n\n"
-                "Twój wniosek o dostęp został zablokowany. Skontaktuj się z administratorem"
-                " w celu uzyskania dodatkowych informacji."
-            ),
+        history.append(
+            _history_entry(
+                access_request,
+                actor=actor,
+                action="request.blocked",
+                to_status=AccessRequest.AccessStatus.BLOCKED,
+                payload={"notes": notes},
+            )
         )
+        emails.append((access_request, *REQUEST_BLOCKED_EMAIL))
         return
 
     # Mieszany wynik – oznacz jako zaakceptowany częściowo
     access_request.mark_approved(actor=actor or access_request.requester, notes=notes)
     access_request.decision_notes = "Część uprawnień została zablokowana."
     access_request.save(update_fields=["decision_notes", "updated_at"])
-    _add_history_entry(
-        access_request,
-        actor=actor,
-        action="request.partial",
-        to_status=access_request.status,
-        payload={"approved": approved, "blocked": blocked, "notes": notes},
+    history.append(
+        _history_entry(
+            access_request,
+            actor=actor,
+            action="request.partial",
+            to_status=access_request.status,
+            payload={"approved": approved, "blocked": blocked, "notes": notes},
+        )
     )
 
 
-def _ensure_membership(permission_code: str, user: User, entity) -> None:
-    role_mapping = {
-        AccessRequestLinePermission.PermissionCode.REPORTING: EntityMembership.MembershipRole.SUBMITTER,
-        AccessRequestLinePermission.PermissionCode.CASES: EntityMembership.MembershipRole.REPRESENTATIVE,
-        AccessRequestLinePermission.PermissionCode.ENTITY_ADMIN: EntityMembership.MembershipRole.ADMIN,
+# --- Decyzje zbiorcze -----------------------------------------------------
+
+
+@dataclass
+class LineDecision:
+    line: AccessRequestLine
+    approve: bool
+    notes: str = ""
+
+
+@dataclass
+class BulkDecisionResult:
+    approved: int = 0
+    blocked: int = 0
+    requests: list[AccessRequest] = field(default_factory=list)
+    emails_queued: int = 0
+
+
+MEMBERSHIP_ROLES = {
+    AccessRequestLinePermission.PermissionCode.REPORTING: EntityMembership.MembershipRole.SUBMITTER,
+    AccessRequestLinePermission.PermissionCode.CASES: EntityMembership.MembershipRole.REPRESENTATIVE,
+    AccessRequestLinePermission.PermissionCode.ENTITY_ADMIN: EntityMembership.MembershipRole.ADMIN,
+}
+
+
+@transaction.atomic
+def decide_lines(decisions: list[LineDecision], actor: User, *, notes: str = "") -> BulkDecisionResult:
+    """Apply many approve/block decisions in one transaction.
+
+    Lines should come with ``request__requester`` selected and ``permissions``
+    prefetched. Lines, permissions, memberships and history are written with
+    bulk queries, each affected request is recomputed once from a single
+    aggregate, and requester e-mails are coalesced per address and sent over
+    one connection after commit.
+    """
+    result = BulkDecisionResult()
+    if not decisions:
+        return result
+    now = timezone.now()
+    lines, permissions, history = [], [], []
+    memberships: dict[tuple[int, int, str], EntityMembership] = {}
+    requests: dict[int, AccessRequest] = {}
+    blocked_admins: dict[int, User] = {}
+
+    for decision in decisions:
+        line = decision.line
+        line_notes = decision.notes or notes
+        line.status = AccessRequestLine.LineStatus.APPROVED if decision.approve else AccessRequestLine.LineStatus.BLOCKED
+        line.decision_notes = line_notes
+        line.decided_by = actor
+        line.decided_at = now
+        line.next_actor = AccessRequestLine.NextActor.NONE
+        line.updated_at = now
+        lines.append(line)
+        requester = line.request.requester
+        codes = []
+        for permission in line.permissions.all():
+            permission.status = (
+                AccessRequestLinePermission.PermissionStatus.GRANTED
+                if decision.approve
+                else AccessRequestLinePermission.PermissionStatus.BLOCKED
+            )
+            permission.decided_by = actor
+            permission.decided_at = now
+            permission.notes = line_notes
+            permissions.append(permission)
+            codes.append(permission.code)
+            role = MEMBERSHIP_ROLES.get(permission.code)
+            if decision.approve and role:
+                memberships[(requester.pk, line.entity_id, role)] = EntityMembership(
+                    user=requester,
+                    entity_id=line.entity_id,
+                    role=role,
+                    is_primary=role == EntityMembership.MembershipRole.ADMIN,
+                )
+            elif not decision.approve and permission.code == AccessRequestLinePermission.PermissionCode.ENTITY_ADMIN:
+                blocked_admins[requester.pk] = requester
+        payload = {"entity_id": line.entity_id, "permissions": codes}
+        if not decision.approve:
+            payload["notes"] = line_notes
+        history.append(
+            _history_entry(
+                line.request,
+                actor=actor,
+                action="line.approved" if decision.approve else "line.blocked",
+                payload=payload,
+            )
+        )
+        requests.setdefault(line.request_id, line.request)
+        if decision.approve:
+            result.approved += 1
+        else:
+            result.blocked += 1
+
+    AccessRequestLine.objects.bulk_update(
+        lines, ["status", "decision_notes", "decided_by", "decided_at", "next_actor", "updated_at"]
+    )
+    AccessRequestLinePermission.objects.bulk_update(permissions, ["status", "decided_by", "decided_at", "notes"])
+    if memberships:
+        EntityMembership.objects.bulk_create(memberships.values(), ignore_conflicts=True)
+        # bulk_create skips the signals that refresh cached authorization contexts.
+        invalidate_authorization_context(*{user_id for user_id, _, _ in memberships})
+    for user in blocked_admins.values():
+        _deactivate_administrator(user)
+
+    counts = {
+        row["request_id"]: row
+        for row in AccessRequestLine.objects.filter(request_id__in=requests)
+        .values("request_id")
+        .annotate(**_LINE_COUNTS)
     }
-    membership_role = role_mapping.get(permission_code)
+    emails: list[tuple[AccessRequest, str, str]] = []
+    empty = {"total": 0, "approved": 0, "blocked": 0}
+    for request_id, access_request in requests.items():
+        _apply_line_counts(
+            access_request, counts.get(request_id, empty), actor=actor, notes=notes, history=history, emails=emails
+        )
+    AccessRequestHistoryEntry.objects.bulk_create(history)
+
+    result.emails_queued = enqueue_emails(_coalesce_request_emails(emails))
+    result.requests = list(requests.values())
+    return result
+
+
+def _coalesce_request_emails(emails: list[tuple[AccessRequest, str, str]]) -> list[EmailMessage]:
+    """One message per requester address; several outcomes are merged into one summary."""
+    by_address: dict[str, list[tuple[AccessRequest, str, str]]] = {}
+    for item in emails:
+        by_address.setdefault(item[0].requester_email, []).append(item)
+    messages = []
+    for address, items in by_address.items():
+        if not address:
+            continue
+        if len(items) == 1:
+            _, subject, body = items[0]
+        else:
+            subject = "Decyzje w sprawie wniosków o dostęp"
+            body = "Dzień dobry,\n\nPracownik UKNF rozpatrzył Twoje wnioski o dostęp:\n\n" + "\n".join(
+                f"- {access_request.reference_code}: {item_subject}" for access_request, item_subject, _ in items
+            )
+        messages.append(EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [address]))
+    return messages
+
+
+def _ensure_membership(permission_code: str, user: User, entity) -> None:
+    membership_role = MEMBERSHIP_ROLES.get(permission_code)
     if not membership_role:
         return
 
@@ -291,10 +533,9 @@ def _deactivate_administrator(user: User) -> None:
 
     user.is_active = False
     user.save(update_fields=["is_active"])
+    token_cache.invalidate_user(user.pk)
 
 
 def _send_request_email(access_request: AccessRequest, *, subject: str, body: str) -> None:
-    try:
-        send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [access_request.requester_email])
-    except Exception as exc:  # pragma: no cover - best effort
-        logger.warning("Nie udało się wysłać e-maila dotyczącego wniosku %s: %s", access_request.pk, exc)
+    if access_request.requester_email:
+        enqueue_email(EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [access_request.requester_email]))
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.authorization import build_authorization_context
+from accounts.models import (
+    AccessRequest,
+    AccessRequestHistoryEntry,
+    AccessRequestLine,
+    AccessRequestLinePermission,
+    EntityMembership,
+    RegulatedEntity,
+    User,
+)
+from communication.mail_queue import deliver_queued_emails
+from communication.models import OutboundEmail
+
+
+class BulkLineDecisionTests(APITestCase):
+    def setUp(self):
+        self.entities = [
+            RegulatedEntity.objects.create(
+                name=f"Decision Entity {index}",
+                registration_number=f"ENT-DECIDE-{index}",
+                sector="Banking",
+                address="Main St 1",
+                postal_code="00-001",
+                city="Warsaw",
+                contact_email="entity@example.com",
+                contact_phone="48111222333",
+            )
+            for index in range(3)
+        ]
+        self.supervisor = User.objects.create_user(
+            email="decisions-supervisor@example.com",
+            password="Strong!Pass1",
+            role=User.UserRole.SUPERVISOR,
+        )
+        self.requester = User.objects.create_user(
+            email="decisions-requester@example.com",
+            password="Strong!Pass1",
+            role=User.UserRole.ENTITY_ADMIN,
+        )
+        self.url = reverse("access-request-decide")
+
+    def _request(self, entities, codes=("reporting",)) -> tuple[AccessRequest, list[AccessRequestLine]]:
+        access_request = AccessRequest.objects.create(
+            requester=self.requester,
+            status=AccessRequest.AccessStatus.NEW,
+            requester_email=self.requester.email,
+        )
+        lines = AccessRequestLine.objects.bulk_create(
+            [AccessRequestLine(request=access_request, entity=entity) for entity in entities]
+        )
+        AccessRequestLinePermission.objects.bulk_create(
+            [AccessRequestLinePermission(line=line, code=code) for line in lines for code in codes]
+        )
+        return access_request, lines
+
+    def _decide(self, decisions, **extra):
+        return self.client.post(self.url, {"decisions": decisions, **extra}, format="json")
+
+    def test_many_lines_are_decided_with_one_status_update_per_request(self):
+        first, first_lines = self._request(self.entities, codes=("reporting", "cases"))
+        second, second_lines = self._request(self.entities[:2])
+        build_authorization_context(self.requester)
+        self.client.force_authenticate(self.supervisor)
+
+        response = self._decide(
+            [{"line_id": line.pk, "decision": "approve"} for line in first_lines]
+            + [
+                {"line_id": second_lines[0].pk, "decision": "approve"},
+                {"line_id": second_lines[1].pk, "decision": "block", "notes": "Brak pełnomocnictwa"},
+            ],
+            notes="Decyzja zbiorcza",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["approved"], response.data["blocked"]), (4, 1))
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, AccessRequest.AccessStatus.APPROVED)
+        self.assertEqual(second.status, AccessRequest.AccessStatus.APPROVED)
+        self.assertEqual(second.decision_notes, "Część uprawnień została zablokowana.")
+        self.assertEqual(
+            AccessRequestLinePermission.objects.filter(line__request=second, status="blocked").get().notes,
+            "Brak pełnomocnictwa",
+        )
+        self.assertEqual(
+            set(EntityMembership.objects.filter(user=self.requester).values_list("entity_id", "role")),
+            {(entity.pk, role) for entity in self.entities for role in ("submitter", "representative")},
+        )
+        self.assertEqual(build_authorization_context(self.requester).entity_ids, {entity.pk for entity in self.entities})
+        actions = list(AccessRequestHistoryEntry.objects.filter(request__in=[first, second]).values_list("action", flat=True))
+        self.assertEqual(actions.count("line.approved"), 4)
+        self.assertEqual(sorted(action for action in actions if action.startswith("request.")), ["request.approved", "request.partial"])
+        # Both outcomes go to the same requester, so they are sent as one message.
+        self.assertEqual(response.data["emails_queued"], 1)
+
+    def test_query_count_does_not_grow_with_lines(self):
+        self.client.force_authenticate(self.supervisor)
+
+        def run(count):
+            entities = [
+                RegulatedEntity.objects.create(
+                    name=f"Bulk {count}-{index}",
+                    registration_number=f"ENT-BULK-{count}-{index}",
+                    sector="Banking",
+                    address="Main St 1",
+                    postal_code="00-001",
+                    city="Warsaw",
+                    contact_email="entity@example.com",
+                    contact_phone="48111222333",
+                )
+                for index in range(count)
+            ]
+            _, lines = self._request(entities)
+            with CaptureQueriesContext(connection) as queries:
+                response = self._decide([{"line_id": line.pk, "decision": "approve"} for line in lines])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries)
+
+        self.assertEqual(run(2), run(12))
+
+    def test_outcome_emails_are_queued(self):
+        self._request(self.entities[:1])
+        _, lines = self._request(self.entities[1:2])
+        self.client.force_authenticate(self.supervisor)
+
+        self._decide([{"line_id": lines[0].pk, "decision": "block"}])
+
+        self.assertEqual(OutboundEmail.objects.filter(to=[self.requester.email]).count(), 1)
+        self.assertEqual(mail.outbox, [])
+        deliver_queued_emails()
+        self.assertEqual([message.subject for message in mail.outbox], ["Wniosek o dostęp został zablokowany"])
+
+    def test_entity_admin_cannot_decide_lines_requiring_uknf(self):
+        admin = User.objects.create_user(
+            email="decisions-admin@example.com", password="Strong!Pass1", role=User.UserRole.ENTITY_ADMIN
+        )
+        EntityMembership.objects.create(user=admin, entity=self.entities[0], role=EntityMembership.MembershipRole.ADMIN)
+        _, reporting_lines = self._request(self.entities[:1])
+        _, admin_lines = self._request(self.entities[:1], codes=("entity_admin",))
+        self.client.force_authenticate(admin)
+
+        response = self._decide(
+            [{"line_id": reporting_lines[0].pk, "decision": "approve"}, {"line_id": admin_lines[0].pk, "decision": "approve"}]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(AccessRequestLine.objects.filter(status=AccessRequestLine.LineStatus.APPROVED).exists())
+
+    def test_invisible_and_duplicate_lines_are_rejected(self):
+        _, lines = self._request(self.entities[:1])
+        outsider = User.objects.create_user(email="decisions-outsider@example.com", password="Strong!Pass1")
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self._decide([{"line_id": lines[0].pk, "decision": "approve"}]).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.supervisor)
+        duplicate = self._decide([{"line_id": lines[0].pk, "decision": "approve"}, {"line_id": lines[0].pk, "decision": "block"}])
+        self.assertEqual(duplicate.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import (
+    AccessRequest,
+    AccessRequestHistoryEntry,
+    AccessRequestLine,
+    AccessRequestMessage,
+    EntityMembership,
+    RegulatedEntity,
+    User,
+)
+
+
+class AccessRequestListTests(APITestCase):
+    def setUp(self):
+        self.entity = RegulatedEntity.objects.create(
+            name="Test Entity",
+            registration_number="ENT-LIST",
+            sector="Banking",
+            address="Main St 1",
+            postal_code="00-001",
+            city="Warsaw",
+            country="PL",
+            contact_email="entity@example.com",
+            contact_phone="48111222333",
+        )
+        self.supervisor = User.objects.create_user(
+            email="supervisor@example.com",
+            password="Strong!Pass1",
+            first_name="Ewa",
+            last_name="Nadzór",
+            role=User.UserRole.SUPERVISOR,
+        )
+        self.client.force_authenticate(user=self.supervisor)
+
+    def _create_requests(self, count: int) -> list[AccessRequest]:
+        created = []
+        for index in range(count):
+            requester = User.objects.create_user(
+                email=f"requester{AccessRequest.objects.count()}-{index}@example.com",
+                password="Strong!Pass1",
+                first_name="Jan",
+                last_name="Kowalski",
+                role=User.UserRole.SUBMITTER,
+            )
+            access_request = AccessRequest.objects.create(
+                requester=requester,
+                status=AccessRequest.AccessStatus.NEW,
+                requester_first_name=requester.first_name,
+                requester_last_name=requester.last_name,
+                requester_email=requester.email,
+            )
+            AccessRequestLine.objects.bulk_create([AccessRequestLine(request=access_request, entity=self.entity)])
+            AccessRequestHistoryEntry.objects.create(request=access_request, actor=requester, action="request.submitted")
+            AccessRequestMessage.objects.create(request=access_request, sender=requester, body="Proszę o dostęp")
+            created.append(access_request)
+        return created
+
+    def _list_query_count(self) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("access-request-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_list_returns_annotated_summaries(self):
+        access_request = self._create_requests(1)[0]
+        AccessRequestMessage.objects.create(request=access_request, sender=self.supervisor, body="Proszę o uzupełnienie")
+        AccessRequestMessage.objects.create(request=access_request, sender=access_request.requester, body="Uzupełniono")
+        AccessRequestMessage.objects.create(request=access_request, sender=access_request.requester, body="Notatka", is_internal=True)
+
+        response = self.client.get(reverse("access-request-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next"])
+        item = response.data["results"][0]
+        self.assertEqual(item["reference_code"], access_request.reference_code)
+        self.assertEqual(item["lines_count"], 1)
+        self.assertEqual(item["lines_pending"], 1)
+        # Only messages posted after the supervisor's own reply count as unread.
+        self.assertEqual(item["unread_messages"], 2)
+        self.assertIsNotNone(item["last_activity_at"])
+        self.assertNotIn("messages", item)
+        self.assertNotIn("history", item)
+
+    def test_requester_does_not_see_internal_messages_in_unread_count(self):
+        access_request = self._create_requests(1)[0]
+        AccessRequestMessage.objects.create(request=access_request, sender=self.supervisor, body="Widoczna")
+        AccessRequestMessage.objects.create(request=access_request, sender=self.supervisor, body="Notatka", is_internal=True)
+
+        self.client.force_authenticate(user=access_request.requester)
+        response = self.client.get(reverse("access-request-list"))
+
+        self.assertEqual(response.data["results"][0]["unread_messages"], 1)
+
+    def test_list_query_count_does_not_grow_with_requests(self):
+        self._create_requests(2)
+        baseline = self._list_query_count()
+        self._create_requests(10)
+
+        self.assertEqual(self._list_query_count(), baseline)
+        self.assertLessEqual(baseline, 4)
+
+    def test_list_is_cursor_paginated(self):
+        self._create_requests(3)
+
+        first = self.client.get(reverse("access-request-list"), {"page_size": 2})
+        self.assertEqual(len(first.data["results"]), 2)
+        second = self.client.get(first.data["next"])
+
+        seen = [item["id"] for item in first.data["results"] + second.data["results"]]
+        self.assertEqual(len(set(seen)), 3)
+        self.assertIsNone(second.data["next"])
+
+    def test_retrieve_keeps_full_representation(self):
+        access_request = self._create_requests(1)[0]
+
+        response = self.client.get(reverse("access-request-detail", args=[access_request.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["lines"]), 1)
+        self.assertEqual(len(response.data["messages"]), 1)
+
+    def test_entity_admin_sees_multi_line_request_once(self):
+        access_request = self._create_requests(1)[0]
+        other_entity = RegulatedEntity.objects.create(
+            name="Second Entity",
+            registration_number="ENT-LIST-2",
+            sector="Banking",
+            address="Main St 2",
+            postal_code="00-001",
+            city="Warsaw",
+            contact_email="second@example.com",
+            contact_phone="48111222334",
+        )
+        AccessRequestLine.objects.bulk_create([AccessRequestLine(request=access_request, entity=other_entity)])
+        self._create_requests(1)
+        admin = User.objects.create_user(
+            email="entity-admin@example.com",
+            password="Strong!Pass1",
+            role=User.UserRole.ENTITY_ADMIN,
+        )
+        for entity in (self.entity, other_entity):
+            EntityMembership.objects.create(user=admin, entity=entity, role=EntityMembership.MembershipRole.ADMIN)
+        self.client.force_authenticate(user=admin)
+
+        response = self.client.get(reverse("access-request-list"))
+
+        ids = [item["id"] for item in response.data["results"]]
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(set(ids)), 2)
+        self.assertEqual(next(item for item in response.data["results"] if item["id"] == access_request.pk)["lines_count"], 2)
+
+    def test_managed_entities_filter(self):
+        visible = self._create_requests(2)
+        self.supervisor.managed_entities.add(self.entity)
+        hidden_entity = RegulatedEntity.objects.create(
+            name="Unmanaged Entity",
+            registration_number="ENT-LIST-3",
+            sector="Banking",
+            address="Main St 3",
+            postal_code="00-001",
+            city="Warsaw",
+            contact_email="unmanaged@example.com",
+            contact_phone="48111222335",
+        )
+        hidden = AccessRequest.objects.create(
+            requester=self.supervisor,
+            requester_first_name="Ewa",
+            requester_last_name="Nadzór",
+            requester_email=self.supervisor.email,
+        )
+        AccessRequestLine.objects.bulk_create([AccessRequestLine(request=hidden, entity=hidden_entity)])
+
+        response = self.client.get(reverse("access-request-list"), {"filter": "moje-podmioty"})
+
+        self.assertEqual({item["id"] for item in response.data["results"]}, {item.pk for item in visible})
@@ -13,6 +13,7 @@ from accounts.models import (
     RegulatedEntity,
     User,
 )
+from communication.mail_queue import deliver_queued_emails
 
 
 class AccessRequestWorkflowTests(APITestCase):
@@ -56,6 +57,7 @@ class AccessRequestWorkflowTests(APITestCase):
             },
         )
         self.assertEqual(register_response.status_code, status.HTTP_201_CREATED)
+        deliver_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
 
         activation_link = next(line for line in mail.outbox[0].body.splitlines() if line.startswith("http"))
@@ -104,6 +106,7 @@ class AccessRequestWorkflowTests(APITestCase):
         request_record.refresh_from_db()
         self.assertEqual(request_record.status, AccessRequest.AccessStatus.NEW)
         self.assertEqual(request_record.next_actor, AccessRequest.NextActor.ENTITY_ADMIN)
+        deliver_queued_emails()
         self.assertEqual(len(mail.outbox), 2)  # activation + submission confirmation
 
         self.client.force_authenticate(user=self.entity_admin)
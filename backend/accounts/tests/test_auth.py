@@ -5,6 +5,7 @@ from django.urls import reverse
 from rest_framework.test import APITestCase
 
 from accounts.models import User
+from communication.mail_queue import deliver_queued_emails
 
 
 class AuthenticationTests(APITestCase):
@@ -22,6 +23,7 @@ class AuthenticationTests(APITestCase):
         )
         self.assertEqual(response.status_code, 201)
         self.assertEqual(User.objects.count(), 1)
+        deliver_queued_emails()
         return response
 
     def test_register_sends_activation_email(self):
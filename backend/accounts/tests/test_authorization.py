@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from accounts.authorization import build_authorization_context, get_authorization_context
+from accounts.models import EntityMembership, RegulatedEntity, User, UserGroup, UserGroupMembership
+
+
+def _entity(number: str) -> RegulatedEntity:
+    return RegulatedEntity.objects.create(
+        name=f"Entity {number}",
+        registration_number=number,
+        sector="Banking",
+        address="Main St 1",
+        postal_code="00-001",
+        city="Warsaw",
+        contact_email=f"{number.lower()}@example.com",
+        contact_phone="48111222333",
+    )
+
+
+class AuthorizationContextTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.first = _entity("AUTHZ-1")
+        self.second = _entity("AUTHZ-2")
+        self.user = User.objects.create_user(
+            email="authz-admin@example.com",
+            password="Strong!Pass1",
+            role=User.UserRole.ENTITY_ADMIN,
+        )
+        EntityMembership.objects.create(user=self.user, entity=self.first, role=EntityMembership.MembershipRole.ADMIN)
+        EntityMembership.objects.create(user=self.user, entity=self.second, role=EntityMembership.MembershipRole.SUBMITTER)
+        self.group = UserGroup.objects.create(name="Banki")
+        UserGroupMembership.objects.create(group=self.group, user=self.user)
+
+    def _request(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return request
+
+    def test_context_describes_memberships_and_groups(self):
+        context = build_authorization_context(self.user)
+
+        self.assertFalse(context.is_internal)
+        self.assertEqual(context.default_entity_id, self.first.pk)
+        self.assertEqual(context.entity_ids, {self.first.pk, self.second.pk})
+        self.assertEqual(context.entity_ids_with_role(EntityMembership.MembershipRole.ADMIN), {self.first.pk})
+        self.assertTrue(context.has_entity_role(self.first.pk, EntityMembership.MembershipRole.ADMIN))
+        self.assertFalse(context.has_entity_role(self.second.pk, EntityMembership.MembershipRole.ADMIN))
+        self.assertEqual(context.group_ids, {self.group.pk})
+
+    def test_context_is_memoized_on_request(self):
+        request = self._request()
+        context = get_authorization_context(request)
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_authorization_context(request), context)
+
+    def test_membership_change_refreshes_memoized_context(self):
+        request = self._request()
+        get_authorization_context(request)
+        third = _entity("AUTHZ-3")
+
+        EntityMembership.objects.create(user=self.user, entity=third, role=EntityMembership.MembershipRole.SUBMITTER)
+
+        self.assertTrue(get_authorization_context(request).is_member(third.pk))
+
+    @override_settings(AUTHORIZATION_CONTEXT_CACHE_TTL=60)
+    def test_cross_request_cache_is_invalidated_by_signals(self):
+        build_authorization_context(self.user)
+        with self.assertNumQueries(0):
+            build_authorization_context(self.user)
+
+        EntityMembership.objects.filter(user=self.user, entity=self.second).get().delete()
+        self.assertEqual(build_authorization_context(self.user).entity_ids, {self.first.pk})
+
+        self.user.role = User.UserRole.SUPERVISOR
+        self.user.save()
+        self.user.managed_entities.add(self.second)
+        context = build_authorization_context(self.user)
+        self.assertTrue(context.is_internal)
+        self.assertEqual(context.managed_entity_ids, {self.second.pk})
+
+        self.second.managed_by.remove(self.user)
+        self.assertEqual(build_authorization_context(self.user).managed_entity_ids, frozenset())
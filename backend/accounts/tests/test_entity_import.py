@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.imports import ImportFileError, import_entities_file
+from accounts.models import RegulatedEntity, User
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data"
+SAMPLE = DATA_DIR / "F. przykładowe dane podmiotów nadzorowanych do zaimportowania.xlsx"
+
+CSV_ROWS = (
+    "registration_number;name;sector;address;postal_code;city;contact_email;status\n"
+    "RIP900001;Pożyczki Sp. z o.o.;Instytucja Pożyczkowa;ul. Prosta 1;00-001;Warszawa;biuro@example.com;Wpisany\n"
+    "RIP900002;;Instytucja Pożyczkowa;ul. Prosta 2;00-001;Warszawa;;\n"
+    "RIP900003;Kredyty S.A.;Bank;ul. Prosta 3;00-001;Warszawa;niepoprawny;\n"
+    "RIP900001;Duplikat;Bank;ul. Prosta 4;00-001;Warszawa;;\n"
+    "RIP900004;Archiwum S.A.;Bank;ul. Prosta 5;00-001;Warszawa;;nieznany\n"
+    "RIP900005;Lokata S.A.;Bank;ul. Prosta 6;00-001;Warszawa;;Zawieszony\n"
+)
+
+
+class EntityImportTests(APITestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.csv_path = Path(directory.name) / "podmioty.csv"
+        self.csv_path.write_text(CSV_ROWS, encoding="utf-8")
+
+    def test_sample_workbook_is_imported_then_updated(self):
+        report = import_entities_file(SAMPLE, batch_size=10)
+
+        self.assertEqual(report.error_count, 0)
+        self.assertEqual(report.created, report.rows)
+        entity = RegulatedEntity.objects.get(registration_number="RIP100000")
+        self.assertEqual(entity.name, "Podmiot testowy")
+        self.assertTrue(entity.data_source.startswith("import"))
+
+        entity.name = "Zmieniona nazwa"
+        entity.save()
+        again = import_entities_file(SAMPLE, batch_size=10)
+        self.assertEqual((again.created, again.updated), (0, report.rows))
+        entity.refresh_from_db()
+        self.assertEqual(entity.name, "Podmiot testowy")
+
+    def test_reimport_updates_only_supplied_columns(self):
+        RegulatedEntity.objects.create(
+            name="Stara nazwa",
+            registration_number="RIP900020",
+            sector="Bank",
+            address="ul. Długa 5",
+            postal_code="00-950",
+            city="Warszawa",
+            contact_email="kontakt@example.com",
+            contact_phone="48111222333",
+            website="https://bank.example.com",
+            status=RegulatedEntity.EntityStatus.SUSPENDED,
+        )
+        self.csv_path.write_text(
+            "registration_number;name;city;website\n"
+            "RIP900020;Nowa nazwa;Kraków;\n"
+            "RIP900021;Nowy podmiot;;https://nowy.example.com\n",
+            encoding="utf-8",
+        )
+
+        report = import_entities_file(self.csv_path)
+
+        self.assertEqual((report.created, report.updated), (1, 1))
+        entity = RegulatedEntity.objects.get(registration_number="RIP900020")
+        self.assertEqual((entity.name, entity.city), ("Nowa nazwa", "Kraków"))
+        self.assertEqual(
+            (entity.sector, entity.address, entity.postal_code, entity.contact_email, entity.website, entity.status),
+            ("Bank", "ul. Długa 5", "00-950", "kontakt@example.com", "https://bank.example.com", "suspended"),
+        )
+        created = RegulatedEntity.objects.get(registration_number="RIP900021")
+        self.assertEqual((created.sector, created.status, created.website), ("Nieznany", "active", "https://nowy.example.com"))
+
+    def test_registration_numbers_match_existing_entities_case_insensitively(self):
+        RegulatedEntity.objects.create(
+            name="Stara nazwa",
+            registration_number="RIP900030",
+            sector="Bank",
+            address="ul. Długa 5",
+            postal_code="00-950",
+            city="Warszawa",
+            contact_email="kontakt@example.com",
+            contact_phone="48111222333",
+        )
+        self.csv_path.write_text("registration_number;name\nrip900030;Nowa nazwa\n", encoding="utf-8")
+
+        report = import_entities_file(self.csv_path)
+
+        self.assertEqual((report.created, report.updated), (0, 1))
+        entity = RegulatedEntity.objects.get(registration_number__iexact="rip900030")
+        self.assertEqual((entity.registration_number, entity.name), ("RIP900030", "Nowa nazwa"))
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        report = import_entities_file(self.csv_path)
+
+        self.assertEqual((report.rows, report.created, report.skipped), (6, 2, 4))
+        self.assertEqual(
+            [(error.row, error.field) for error in report.errors],
+            [(3, "name"), (4, "contact_email"), (5, "registration_number"), (6, "status")],
+        )
+        self.assertEqual(
+            dict(RegulatedEntity.objects.filter(registration_number__startswith="RIP9").values_list("registration_number", "status")),
+            {"RIP900001": "active", "RIP900005": "suspended"},
+        )
+
+    def test_dry_run_does_not_write(self):
+        report = import_entities_file(self.csv_path, dry_run=True)
+
+        self.assertEqual(report.created, 2)
+        self.assertFalse(RegulatedEntity.objects.filter(registration_number__startswith="RIP9").exists())
+
+    def test_import_endpoint_is_internal_only(self):
+        url = reverse("regulatedentity-import")
+        upload = lambda: SimpleUploadedFile("podmioty.csv", CSV_ROWS.encode(), content_type="text/csv")  # noqa: E731
+        external = User.objects.create_user(email="import-external@example.com", password="Strong!Pass1")
+        self.client.force_authenticate(external)
+        self.assertEqual(self.client.post(url, {"file": upload()}, format="multipart").status_code, status.HTTP_403_FORBIDDEN)
+
+        supervisor = User.objects.create_user(
+            email="import-supervisor@example.com",
+            password="Strong!Pass1",
+            role=User.UserRole.SUPERVISOR,
+        )
+        self.client.force_authenticate(supervisor)
+        response = self.client.post(url, {"file": upload()}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["error_count"], 4)
+        self.assertTrue(RegulatedEntity.objects.filter(registration_number="RIP900005").exists())
+
+        rejected = self.client.post(
+            url,
+            {"file": SimpleUploadedFile("podmioty.txt", b"x")},
+            format="multipart",
+        )
+        self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cp1250_and_malformed_csv_files(self):
+        # Polish Excel saves CSV files in Windows-1250.
+        self.csv_path.write_bytes("registration_number;name\nRIP900010;Bank Spółdzielczy w Łodzi\n".encode("cp1250"))
+        report = import_entities_file(self.csv_path)
+        self.assertEqual(report.created, 1)
+        self.assertEqual(RegulatedEntity.objects.get(registration_number="RIP900010").name, "Bank Spółdzielczy w Łodzi")
+
+        self.csv_path.write_text('registration_number;name\nRIP900011;"' + "x" * 200_000 + '"\n', encoding="utf-8")
+        with self.assertRaises(ImportFileError):
+            import_entities_file(self.csv_path)
+
+        supervisor = User.objects.create_user(
+            email="import-cp1250@example.com", password="Strong!Pass1", role=User.UserRole.SUPERVISOR
+        )
+        self.client.force_authenticate(supervisor)
+        response = self.client.post(
+            reverse("regulatedentity-import"),
+            {"file": SimpleUploadedFile("podmioty.csv", self.csv_path.read_bytes(), content_type="text/csv")},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from django.db.models import Value
+from django.db.models.functions import Upper
+from django.test import TestCase
+
+from accounts.lookup import entity_id_cache, find_entity_by_name, find_entity_by_registration_number
+from accounts.models import RegulatedEntity
+
+
+def _entity(number: str, name: str) -> RegulatedEntity:
+    return RegulatedEntity.objects.create(
+        name=name,
+        registration_number=number,
+        sector="Bank",
+        address="ul. Prosta 1",
+        postal_code="00-001",
+        city="Warszawa",
+        contact_email="bank@example.com",
+        contact_phone="48111222333",
+    )
+
+
+class EntityLookupTests(TestCase):
+    def setUp(self):
+        entity_id_cache.clear()
+        self.entity = _entity("RIP100123", "Bank Lookup S.A.")
+
+    def test_lookups_are_case_insensitive(self):
+        self.assertEqual(find_entity_by_registration_number(" rip100123 "), self.entity)
+        self.assertEqual(find_entity_by_name("BANK LOOKUP s.a."), self.entity)
+        self.assertIsNone(find_entity_by_registration_number("RIP999999"))
+        self.assertIsNone(find_entity_by_name("Inny bank"))
+
+    def test_registration_lookup_uses_functional_index(self):
+        plan = (
+            RegulatedEntity.objects.alias(registration_upper=Upper("registration_number"))
+            .filter(registration_upper=Upper(Value("rip100123")))
+            .explain()
+        )
+
+        self.assertIn("entity_registration_upper_idx", plan)
+
+    def test_cached_identifier_is_resolved_by_primary_key(self):
+        find_entity_by_registration_number("RIP100123")
+
+        with self.assertNumQueries(1) as queries:
+            self.assertEqual(find_entity_by_registration_number("rip100123"), self.entity)
+        self.assertNotIn("UPPER", queries.captured_queries[0]["sql"])
+
+    def test_stale_entries_fall_back_to_the_index(self):
+        find_entity_by_registration_number("RIP100123")
+        RegulatedEntity.objects.filter(pk=self.entity.pk).update(registration_number="RIP100999")
+        replacement = _entity("RIP100123", "Bank Następca S.A.")
+
+        self.assertEqual(find_entity_by_registration_number("RIP100123"), replacement)
+
+        replacement.delete()
+        self.assertIsNone(find_entity_by_registration_number("RIP100123"))
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from accounts.authentication import TokenSnapshot, token_cache
+from accounts.models import User
+from accounts.services import _deactivate_administrator
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="poller@example.com",
+            password="Strong!Pass1",
+            role=User.UserRole.ENTITY_ADMIN,
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def _get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("profile"))
+        return response, [query["sql"] for query in queries]
+
+    def test_repeated_requests_skip_token_lookup(self):
+        first, first_queries = self._get()
+        second, second_queries = self._get()
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data["user"]["email"], self.user.email)
+        self.assertTrue(any("authtoken_token" in sql for sql in first_queries))
+        self.assertFalse(any("authtoken_token" in sql for sql in second_queries))
+        self.assertEqual(token_cache.hits, 1)
+
+    def test_snapshot_leaves_out_password_and_pesel(self):
+        User.objects.filter(pk=self.user.pk).update(pesel="90010112345")
+        snapshot = TokenSnapshot.capture(Token.objects.select_related("user").get(pk=self.token.pk))
+        self.user.refresh_from_db()
+
+        self.assertNotIn(self.user.password, snapshot.user_values)
+        self.assertNotIn("90010112345", snapshot.user_values)
+        user, _ = snapshot.restore(self.token.key)
+        self.assertEqual(user.get_deferred_fields(), {"password", "pesel"})
+        with self.assertNumQueries(1):
+            self.assertEqual(user.pesel, "90010112345")
+        self.assertTrue(user.check_password("Strong!Pass1"))
+
+    def test_logout_revokes_cached_token(self):
+        self._get()
+
+        self.assertEqual(self.client.post(reverse("logout")).status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(self._get()[0].status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_revokes_cached_token(self):
+        self._get()
+
+        _deactivate_administrator(self.user)
+
+        self.assertEqual(self._get()[0].status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_drops_snapshot(self):
+        self._get()
+
+        self.user.set_password("Another!Pass2")
+        self.user.save()
+
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    @override_settings(TOKEN_AUTH_CACHE_SIZE=1)
+    def test_local_cache_is_bounded(self):
+        other = User.objects.create_user(email="other@example.com", password="Strong!Pass1")
+        other_token = Token.objects.create(user=other)
+        self._get()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {other_token.key}")
+        self._get()
+
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertIsNotNone(token_cache.get(other_token.key))
+
+    @override_settings(TOKEN_AUTH_SHARED_CACHE="default")
+    def test_shared_cache_serves_other_processes(self):
+        self._get()
+        with token_cache._lock:
+            token_cache._entries.clear()
+            token_cache._keys_by_user.clear()
+
+        self.assertIsNotNone(token_cache.get(self.token.key))
+
+        self.client.post(reverse("logout"))
+        token_cache.clear()
+        self.assertIsNone(token_cache.get(self.token.key))
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.hashing import hash_passwords
+from accounts.imports import USER_HEADERS, import_users, iter_records
+from accounts.models import User
+from communication.mail_queue import deliver_queued_emails
+
+CSV_ROWS = (
+    "E-mail;Imię;Nazwisko;Rola;Hasło;PESEL\n"
+    "nowy.admin@example.com;Anna;Nowak;Administrator podmiotu;;\n"
+    "raportujacy@example.com;Jan;Kowalski;submitter;Mocne!Haslo123;90010112345\n"
+    "zly-adres;Ewa;Lis;;;\n"
+    "RAPORTUJACY@example.com;Jan;Duplikat;;;\n"
+    "istniejacy@example.com;Ola;Stara;;;\n"
+    "rola@example.com;Piotr;Zły;prezes;;\n"
+    "pesel@example.com;Adam;Krótki;;;123\n"
+)
+
+
+def _records(text: str):
+    rows = ((number, line.split(";")) for number, line in enumerate(text.strip().splitlines(), start=1))
+    return iter_records(rows, USER_HEADERS)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class UserImportTests(APITestCase):
+    def setUp(self):
+        User.objects.create_user(email="istniejacy@example.com", password="Strong!Pass1")
+
+    def test_rows_are_validated_created_and_notified(self):
+        report = import_users(_records(CSV_ROWS), batch_size=3, hash_workers=1)
+        deliver_queued_emails()
+
+        self.assertEqual((report.rows, report.created, report.skipped, report.notified), (7, 2, 5, 1))
+        self.assertEqual(
+            sorted((error.row, error.field) for error in report.errors),
+            [(4, "email"), (5, "email"), (6, "email"), (7, "role"), (8, "pesel")],
+        )
+        pending = User.objects.get(email="nowy.admin@example.com")
+        self.assertFalse(pending.is_active)
+        self.assertFalse(pending.has_usable_password())
+        self.assertEqual(pending.role, User.UserRole.ENTITY_ADMIN)
+        active = User.objects.get(email="raportujacy@example.com")
+        self.assertTrue(active.is_active and active.must_change_password)
+        self.assertTrue(active.check_password("Mocne!Haslo123"))
+        self.assertEqual(active.role, User.UserRole.SUBMITTER)
+        self.assertEqual([message.to for message in mail.outbox], [["nowy.admin@example.com"]])
+
+    def test_dry_run_does_not_write_or_send(self):
+        report = import_users(_records(CSV_ROWS), dry_run=True)
+        deliver_queued_emails()
+
+        self.assertEqual(report.created, 2)
+        self.assertFalse(User.objects.filter(email="nowy.admin@example.com").exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_passwords_are_hashed_in_a_process_pool(self):
+        passwords = [f"Haslo-{index}" for index in range(12)]
+
+        hashes = hash_passwords(passwords, workers=2)
+
+        self.assertEqual(len(hashes), len(passwords))
+        self.assertTrue(all(check_password(password, hashed) for password, hashed in zip(passwords, hashes)))
+
+    def test_one_pool_serves_every_batch(self):
+        rows = "E-mail;Hasło\n" + "".join(f"pula{index}@example.com;Mocne!Haslo{index}\n" for index in range(20))
+
+        with mock.patch("accounts.hashing.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool:
+            report = import_users(_records(rows), batch_size=10, hash_workers=2, send_activation=False)
+
+        self.assertEqual(report.created, 20)
+        self.assertEqual(pool.call_count, 1)
+        self.assertTrue(User.objects.get(email="pula15@example.com").check_password("Mocne!Haslo15"))
+
+    @override_settings(USER_IMPORT_MAX_PASSWORD_ROWS=1)
+    def test_import_endpoint_caps_rows_with_passwords(self):
+        admin = User.objects.create_user(
+            email="import-limit@example.com", password="Strong!Pass1", role=User.UserRole.SYSTEM_ADMIN
+        )
+        self.client.force_authenticate(admin)
+        rows = CSV_ROWS + "drugi@example.com;Ala;Kot;;Mocne!Haslo456;\n"
+
+        with mock.patch("accounts.hashing.ProcessPoolExecutor") as pool:
+            rejected = self.client.post(
+                reverse("user-directory-import"), {"file": SimpleUploadedFile("uzytkownicy.csv", rows.encode())}, format="multipart"
+            )
+            accepted = self.client.post(
+                reverse("user-directory-import"),
+                {"file": SimpleUploadedFile("uzytkownicy.csv", CSV_ROWS.encode()), "send_activation": "false"},
+                format="multipart",
+            )
+
+        self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("manage.py import_users", rejected.data["detail"])
+        self.assertFalse(User.objects.filter(email="drugi@example.com").exists())
+        self.assertEqual(accepted.status_code, status.HTTP_200_OK)
+        pool.assert_not_called()
+
+    def test_import_endpoint_requires_system_admin(self):
+        url = reverse("user-directory-import")
+        upload = lambda: SimpleUploadedFile("uzytkownicy.csv", CSV_ROWS.encode())  # noqa: E731
+        supervisor = User.objects.create_user(
+            email="import-nadzorca@example.com", password="Strong!Pass1", role=User.UserRole.SUPERVISOR
+        )
+        self.client.force_authenticate(supervisor)
+        self.assertEqual(self.client.post(url, {"file": upload()}, format="multipart").status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_user(
+            email="import-admin@example.com", password="Strong!Pass1", role=User.UserRole.SYSTEM_ADMIN
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.post(url, {"file": upload(), "send_activation": "false"}, format="multipart")
+        deliver_queued_emails()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["created"], response.data["notified"]), (2, 0))
+        self.assertEqual(mail.outbox, [])
+
+
+class UserExportTests(APITestCase):
+    def setUp(self):
+        self.supervisor = User.objects.create_user(
+            email="eksport-nadzorca@example.com", password="Strong!Pass1", role=User.UserRole.SUPERVISOR
+        )
+        User.objects.create_user(email="eksport-a@example.com", password="Strong!Pass1", first_name="Ala", pesel="90010112345")
+        User.objects.create_user(email="eksport-b@example.com", password="Strong!Pass1", first_name="Bartek")
+        self.client.force_authenticate(self.supervisor)
+
+    def test_csv_export_streams_selected_fields_with_filters(self):
+        response = self.client.get(reverse("user-directory-export"), {"fields": "email,first_name", "search": "eksport-"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+        self.assertEqual(lines[0], "email,first_name")
+        self.assertEqual(
+            sorted(lines[1:]),
+            ["eksport-a@example.com,Ala", "eksport-b@example.com,Bartek", "eksport-nadzorca@example.com,"],
+        )
+
+    def test_xlsx_export_is_a_workbook(self):
+        response = self.client.get(reverse("user-directory-export"), {"output": "xlsx", "fields": "email,is_active"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn("eksport-a@example.com", sheet)
+        self.assertIn("<t xml:space=\"preserve\">is_active</t>", sheet)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse("user-directory-export"), {"fields": "email,pesel"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import AccessRequest, RegulatedEntity, User
+from accounts.visibility_benchmark import VisibilityScale, measure_visibility, seed_visibility_dataset
+
+TINY_SCALE = VisibilityScale(entities=12, access_requests=60, requesters=10, probe_entities=4)
+
+
+class VisibilityBenchmarkTests(TestCase):
+    def test_variants_agree_on_seeded_data(self):
+        probes = seed_visibility_dataset(TINY_SCALE)
+
+        measurements = measure_visibility(probes, repeat=1, explain=True)
+
+        self.assertEqual(len(measurements), len(probes) * 2)
+        for legacy, current in zip(measurements[::2], measurements[1::2]):
+            self.assertEqual(legacy.case, current.case)
+            self.assertEqual(legacy.rows, current.rows)
+            self.assertTrue(current.plan)
+
+    def test_command_writes_json_and_cleans_up(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "wyniki.json"
+            call_command(
+                "benchmark_access_request_visibility",
+                entities=10,
+                requests=40,
+                probe_entities=3,
+                repeat=1,
+                output=str(output),
+                stderr=StringIO(),
+            )
+            report = json.loads(output.read_text(encoding="utf-8"))
+
+        self.assertEqual({result["variant"] for result in report["results"]}, {"legacy_join_distinct", "id_in_subquery"})
+        self.assertFalse(RegulatedEntity.objects.filter(registration_number__startswith="BENCH").exists())
+        self.assertFalse(User.objects.filter(email__endswith="@benchmark.invalid").exists())
+        self.assertFalse(AccessRequest.objects.exists())
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from tempfile import NamedTemporaryFile
 from typing import Any
 
+from django.conf import settings
 from django.contrib.auth import login, logout
+from django.db.models import Count, DateTimeField, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework import mixins, status, viewsets
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.exceptions import MethodNotAllowed, PermissionDenied, NotFound
 
 from administration.models import AuditLogEntry
+from uknf_platform.downloads import serve_protected_file
+from uknf_platform.exports import StreamingExportMixin
 from .models import (
     AccessRequest,
     AccessRequestAttachment,
@@ -29,33 +39,44 @@ from .models import (
     UserGroup,
     UserSessionContext,
 )
+from .authentication import token_cache
+from .authorization import get_authorization_context
+from .exports import ENTITY_EXPORT, USER_EXPORT
+from .imports import ImportFileError, count_user_passwords, import_entities_file, import_users_file
 from .permissions import HasRole, IsEntityMember, IsInternalUser
 from .serializers import (
     ActivateAccountSerializer,
     AccessRequestAttachmentSerializer,
     AccessRequestAttachmentUploadSerializer,
+    AccessRequestBulkDecisionSerializer,
     AccessRequestDecisionSerializer,
     AccessRequestMessageCreateSerializer,
     AccessRequestMessageSerializer,
     AccessRequestSerializer,
+    AccessRequestSummarySerializer,
     AccessRequestUpdateSerializer,
     AuthTokenSerializer,
     ContactSubmissionSerializer,
+    EntityImportSerializer,
     EntityMembershipSerializer,
     NotificationPreferenceSerializer,
     RegisterUserSerializer,
     RegulatedEntitySerializer,
     RoleDisplaySerializer,
     UserGroupSerializer,
+    UserImportSerializer,
     UserSerializer,
     UserSessionContextSerializer,
 )
 from .services import (
+    LineDecision,
     approve_line,
     block_line,
+    decide_lines,
     ensure_initial_access_request,
     return_to_requester,
     submit_access_request,
+    visible_access_requests,
 )
 
 ROLE_DESCRIPTIONS = {
@@ -108,6 +129,7 @@ class LogoutView(APIView):
 
     def post(self, request, *args, **kwargs):
         AuditLogEntry.record(actor=request.user, action="auth.logout")
+        token_cache.invalidate_user(request.user.pk)
         Token.objects.filter(user=request.user).delete()
         logout(request)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -130,13 +152,14 @@ def get_or_create_session(user: User) -> UserSessionContext:
     return session
 
 
-class RegulatedEntityViewSet(viewsets.ModelViewSet):
+class RegulatedEntityViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = RegulatedEntity.objects.all().order_by("name")
     serializer_class = RegulatedEntitySerializer
     permission_classes = [IsAuthenticated]
     filterset_fields = ["sector", "status", "city"]
     search_fields = ["name", "registration_number"]
     ordering_fields = ["name", "registration_number", "updated_at"]
+    export_spec = ENTITY_EXPORT
 
     def get_permissions(self):
         if self.action in {"create", "update", "partial_update", "destroy"}:
@@ -151,6 +174,41 @@ class RegulatedEntityViewSet(viewsets.ModelViewSet):
         AuditLogEntry.record(actor=request.user, action="entity.verified", metadata={"entity_id": entity.pk})
         return Response(self.get_serializer(entity).data)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        permission_classes=[IsInternalUser],
+        parser_classes=[MultiPartParser],
+    )
+    def import_entities(self, request, *args, **kwargs):
+        serializer = EntityImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        uploaded_file = serializer.validated_data["file"]
+        # The readers stream from disk, so the upload is spooled to a named file.
+        with NamedTemporaryFile(suffix=Path(uploaded_file.name).suffix.lower()) as handle:
+            for chunk in uploaded_file.chunks():
+                handle.write(chunk)
+            handle.flush()
+            try:
+                report = import_entities_file(
+                    handle.name,
+                    sheet=serializer.validated_data.get("sheet") or None,
+                    dry_run=serializer.validated_data["dry_run"],
+                    data_source=f"import:{Path(uploaded_file.name).name}",
+                )
+            except ImportFileError as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        payload = report.to_dict()
+        if not report.dry_run:
+            AuditLogEntry.record(
+                actor=request.user,
+                action="entity.imported",
+                metadata={key: payload[key] for key in ("rows", "created", "updated", "skipped")},
+            )
+        return Response(payload)
+
 
 class EntityMembershipViewSet(viewsets.ModelViewSet):
     queryset = EntityMembership.objects.select_related("user", "entity").all()
@@ -160,7 +218,7 @@ class EntityMembershipViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         qs = super().get_queryset()
-        if self.request.user.is_internal:
+        if get_authorization_context(self.request).is_internal:
             return qs
         return qs.filter(user=self.request.user)
 
@@ -194,23 +252,43 @@ class EntityMembershipViewSet(viewsets.ModelViewSet):
         AuditLogEntry.record(actor=actor, action="entity_membership.deleted", metadata=metadata)
 
     def _assert_can_manage_entity(self, actor: User, entity: RegulatedEntity) -> None:
-        if actor.is_internal:
+        context = get_authorization_context(self.request)
+        if context.is_internal:
             return
-        if actor.role != User.UserRole.ENTITY_ADMIN:
+        if context.role != User.UserRole.ENTITY_ADMIN:
             raise PermissionDenied("Brak uprawnień do zarządzania użytkownikami podmiotu.")
-        if not entity.memberships.filter(user=actor, role=EntityMembership.MembershipRole.ADMIN).exists():
+        if not context.has_entity_role(entity.pk, EntityMembership.MembershipRole.ADMIN):
             raise PermissionDenied("Brak powiązania z podmiotem.")
 
 
+def _subquery_count(queryset):
+    counted = queryset.order_by().values("request").annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+class AccessRequestPagination(CursorPagination):
+    # Keyset pagination over the (created_at, id) index keeps deep pages of
+    # the UKNF review queue as cheap as the first one.
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
 class AccessRequestViewSet(viewsets.ModelViewSet):
     serializer_class = AccessRequestSerializer
     permission_classes = [IsAuthenticated]
     http_method_names = ["get", "post", "put", "patch", "head", "options"]
+    pagination_class = AccessRequestPagination
 
     def get_queryset(self):
-        base = (
-            AccessRequest.objects.select_related("requester", "decided_by")
-            .prefetch_related(
+        base = AccessRequest.objects.order_by("-created_at", "-id")
+        if self.action == "list":
+            # The list only needs snapshot columns and a few counters; the
+            # nested lines/history/messages are reserved for detail views.
+            base = self._annotate_summary(base)
+        else:
+            base = base.select_related("requester", "decided_by").prefetch_related(
                 "lines__entity",
                 "lines__permissions",
                 "attachments",
@@ -218,43 +296,64 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
                 "messages__attachments",
                 "messages__sender",
             )
-            .order_by("-created_at")
-        )
 
         user = self.request.user
         if not user or not user.is_authenticated:
             return AccessRequest.objects.none()
-
-        if user.is_internal:
-            filter_name = (self.request.query_params.get("filter") or "").lower().strip()
-            if filter_name == "moje-podmioty":
-                base = base.filter(lines__entity__in=user.managed_entities.all())
-            elif filter_name in {"wymaga-dzialania-uknf", "wymaga działania uknf"}:
-                base = base.filter(next_actor=AccessRequest.NextActor.UKNF)
-            elif filter_name == "obslugiwany-przez-uknf":
-                base = base.filter(handled_by_uknf=True)
-            return base.distinct()
-
-        if user.role == User.UserRole.ENTITY_ADMIN:
-            return (
-                base.filter(
-                    lines__entity__memberships__user=user,
-                    lines__entity__memberships__role=EntityMembership.MembershipRole.ADMIN,
-                )
-                .distinct()
-            )
-
-        entity_ids = list(user.memberships.values_list("entity_id", flat=True))
-        if entity_ids:
-            return base.filter(lines__entity_id__in=entity_ids).distinct()
-
-        return base.filter(requester=user).distinct()
+        return visible_access_requests(
+            base,
+            user,
+            filter_name=self.request.query_params.get("filter") or "",
+            context=get_authorization_context(self.request),
+        )
 
     def get_serializer_class(self):
+        if self.action == "list":
+            return AccessRequestSummarySerializer
         if self.action in {"update", "partial_update"}:
             return AccessRequestUpdateSerializer
         return super().get_serializer_class()
 
+    def _annotate_summary(self, queryset):
+        """Annotate per-request counters with correlated subqueries.
+
+        Subqueries instead of ``Count`` over joins: aggregating lines and
+        messages in one grouped join would multiply the counts.
+        """
+        user = self.request.user
+        lines = AccessRequestLine.objects.filter(request=OuterRef("pk"))
+        pending = lines.filter(
+            status__in=[AccessRequestLine.LineStatus.PENDING, AccessRequestLine.LineStatus.NEEDS_UPDATE]
+        )
+        messages = AccessRequestMessage.objects.filter(request=OuterRef("pk"))
+        if not get_authorization_context(self.request).is_internal:
+            messages = messages.filter(is_internal=False)
+        # Without read receipts, "unread" means posted by someone else after
+        # the caller's own most recent message in the thread.
+        last_own_message = (
+            AccessRequestMessage.objects.filter(request=OuterRef("pk"), sender=user)
+            .order_by("-created_at")
+            .values("created_at")[:1]
+        )
+        unread = messages.exclude(sender=user).filter(created_at__gt=OuterRef("last_own_message_at"))
+        last_history = (
+            AccessRequestHistoryEntry.objects.filter(request=OuterRef("pk"))
+            .order_by("-created_at")
+            .values("created_at")[:1]
+        )
+        return queryset.annotate(
+            last_own_message_at=Coalesce(
+                Subquery(last_own_message),
+                Value(datetime(1970, 1, 1, tzinfo=dt_timezone.utc)),
+                output_field=DateTimeField(),
+            ),
+        ).annotate(
+            lines_count=_subquery_count(lines),
+            lines_pending=_subquery_count(pending),
+            unread_messages=_subquery_count(unread),
+            last_activity_at=Coalesce(Subquery(last_history), "updated_at", output_field=DateTimeField()),
+        )
+
     def create(self, request, *args, **kwargs):  # pragma: no cover - safety net
         raise MethodNotAllowed("POST")
 
@@ -366,6 +465,62 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
         serializer = AccessRequestSerializer(access_request, context=self.get_serializer_context())
         return Response(serializer.data)
 
+    @action(detail=False, methods=["post"], url_path="decisions")
+    def decide(self, request, *args, **kwargs):
+        serializer = AccessRequestBulkDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        entries = serializer.validated_data["decisions"]
+        lines = {
+            line.pk: line
+            for line in AccessRequestLine.objects.filter(
+                pk__in=[entry["line_id"] for entry in entries],
+                request__in=self.get_queryset().values("pk"),
+            )
+            .select_related("request__requester")
+            .prefetch_related("permissions")
+        }
+        missing = [entry["line_id"] for entry in entries if entry["line_id"] not in lines]
+        if missing:
+            raise NotFound(f"Linie wniosku nie istnieją: {', '.join(map(str, missing))}.")
+        for line in lines.values():
+            self._assert_can_decide_line(line, request.user)
+
+        result = decide_lines(
+            [
+                LineDecision(lines[entry["line_id"]], approve=entry["decision"] == "approve", notes=entry["notes"])
+                for entry in entries
+            ],
+            request.user,
+            notes=serializer.validated_data["notes"],
+        )
+        AuditLogEntry.record_many(
+            [
+                AuditLogEntry.build(
+                    actor=request.user,
+                    action="access_request.line_approved" if entry["decision"] == "approve" else "access_request.line_blocked",
+                    metadata={"request_id": lines[entry["line_id"]].request_id, "line_id": entry["line_id"], "bulk": True},
+                    request=request,
+                )
+                for entry in entries
+            ]
+        )
+        return Response(
+            {
+                "approved": result.approved,
+                "blocked": result.blocked,
+                "emails_queued": result.emails_queued,
+                "requests": [
+                    {
+                        "id": access_request.pk,
+                        "reference_code": access_request.reference_code,
+                        "status": access_request.status,
+                        "next_actor": access_request.next_actor,
+                    }
+                    for access_request in result.requests
+                ],
+            }
+        )
+
     @action(detail=True, methods=["get", "post"], url_path="messages")
     def messages(self, request, *args, **kwargs):
         access_request = self.get_object()
@@ -378,7 +533,7 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
         data_serializer = AccessRequestMessageCreateSerializer(data=request.data)
         data_serializer.is_valid(raise_exception=True)
         is_internal = data_serializer.validated_data.get("is_internal", False)
-        if is_internal and not request.user.is_internal:
+        if is_internal and not get_authorization_context(request).is_internal:
             raise PermissionDenied("Tylko użytkownicy UKNF mogą publikować wewnętrzne wiadomości.")
         message = AccessRequestMessage.objects.create(
             request=access_request,
@@ -418,7 +573,7 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
             file=serializer.validated_data["file"],
             description=serializer.validated_data.get("description", ""),
         )
-        if not request.user.is_internal:
+        if not get_authorization_context(request).is_internal:
             access_request.mark_updated(actor=request.user)
         AccessRequestHistoryEntry.objects.create(
             request=access_request,
@@ -434,6 +589,33 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
         response_serializer = AccessRequestAttachmentSerializer(attachment, context=self.get_serializer_context())
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=True, methods=["get"], url_path=r"attachments/(?P<attachment_id>\d+)/download")
+    def download_attachment(self, request, attachment_id=None, *args, **kwargs):
+        access_request = self.get_object()
+        attachment = access_request.attachments.filter(pk=attachment_id).first()
+        if attachment is None:
+            raise NotFound("Załącznik nie istnieje.")
+        return serve_protected_file(
+            request, attachment.file.storage, attachment.file.name, filename=attachment.original_name or None
+        )
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path=r"message-attachments/(?P<attachment_id>\d+)/download",
+    )
+    def download_message_attachment(self, request, attachment_id=None, *args, **kwargs):
+        access_request = self.get_object()
+        attachments = AccessRequestMessageAttachment.objects.filter(pk=attachment_id, message__request=access_request)
+        if not get_authorization_context(request).is_internal:
+            attachments = attachments.filter(message__is_internal=False)
+        attachment = attachments.first()
+        if attachment is None:
+            raise NotFound("Załącznik nie istnieje.")
+        return serve_protected_file(
+            request, attachment.file.storage, attachment.file.name, filename=attachment.original_name or None
+        )
+
     def _get_line(self, access_request: AccessRequest, line_id: str | None) -> AccessRequestLine:
         if not line_id:
             raise NotFound("Nie przekazano identyfikatora linii wniosku.")
@@ -443,23 +625,31 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
             raise NotFound("Linia wniosku nie istnieje.") from exc
 
     def _assert_can_edit(self, access_request: AccessRequest, actor: User) -> None:
-        if actor.is_internal or access_request.requester_id == actor.id:
+        context = get_authorization_context(self.request)
+        if context.is_internal or access_request.requester_id == actor.id:
             return
-        if actor.role == User.UserRole.ENTITY_ADMIN and access_request.lines.filter(
-            entity__memberships__user=actor,
-            entity__memberships__role=EntityMembership.MembershipRole.ADMIN,
-        ).exists():
+        administered = context.entity_ids_with_role(EntityMembership.MembershipRole.ADMIN)
+        if (
+            context.role == User.UserRole.ENTITY_ADMIN
+            and administered
+            and access_request.lines.filter(entity_id__in=administered).exists()
+        ):
             return
         raise PermissionDenied("Brak uprawnień do modyfikacji wniosku.")
 
     def _assert_can_decide_line(self, line: AccessRequestLine, actor: User) -> None:
-        if actor.is_internal:
+        context = get_authorization_context(self.request)
+        if context.is_internal:
             return
-        if line.permissions.filter(code=AccessRequestLinePermission.PermissionCode.ENTITY_ADMIN).exists():
+        # Iterating ``all()`` reuses permissions prefetched by the bulk decision endpoint.
+        if any(
+            permission.code == AccessRequestLinePermission.PermissionCode.ENTITY_ADMIN
+            for permission in line.permissions.all()
+        ):
             raise PermissionDenied("Akceptacja tej linii wymaga użytkownika UKNF.")
-        if actor.role != User.UserRole.ENTITY_ADMIN:
+        if context.role != User.UserRole.ENTITY_ADMIN:
             raise PermissionDenied("Brak uprawnień do zarządzania linią wniosku.")
-        if not line.entity.memberships.filter(user=actor, role=EntityMembership.MembershipRole.ADMIN).exists():
+        if not context.has_entity_role(line.entity_id, EntityMembership.MembershipRole.ADMIN):
             raise PermissionDenied("Brak powiązania z podmiotem.")
 
 
@@ -534,12 +724,13 @@ class RoleCatalogView(APIView):
         return Response(data)
 
 
-class UserDirectoryView(viewsets.ReadOnlyModelViewSet):
+class UserDirectoryView(StreamingExportMixin, viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all().order_by("email")
     serializer_class = UserSerializer
     permission_classes = [IsInternalUser]
     filterset_fields = ["role", "is_active", "user_type"]
     search_fields = ["email", "first_name", "last_name"]
+    export_spec = USER_EXPORT
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -548,6 +739,53 @@ class UserDirectoryView(viewsets.ReadOnlyModelViewSet):
             qs = qs.exclude(role=User.UserRole.SYSTEM_ADMIN)
         return qs
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        permission_classes=[HasRole.for_roles(User.UserRole.SYSTEM_ADMIN)],
+        parser_classes=[MultiPartParser],
+    )
+    def import_users(self, request, *args, **kwargs):
+        serializer = UserImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        uploaded_file = serializer.validated_data["file"]
+        with NamedTemporaryFile(suffix=Path(uploaded_file.name).suffix.lower()) as handle:
+            for chunk in uploaded_file.chunks():
+                handle.write(chunk)
+            handle.flush()
+            sheet = serializer.validated_data.get("sheet") or None
+            try:
+                # Hashing is ~0.35 s per password and runs inside the request
+                # process; larger files go through ``manage.py import_users``.
+                passwords = count_user_passwords(handle.name, sheet=sheet)
+                if passwords > settings.USER_IMPORT_MAX_PASSWORD_ROWS:
+                    raise ImportFileError(
+                        f"Plik zawiera {passwords} haseł, a import przez API przyjmuje najwyżej "
+                        f"{settings.USER_IMPORT_MAX_PASSWORD_ROWS}. Większe pliki należy zaimportować "
+                        "poleceniem manage.py import_users."
+                    )
+                report = import_users_file(
+                    handle.name,
+                    sheet=sheet,
+                    dry_run=serializer.validated_data["dry_run"],
+                    send_activation=serializer.validated_data["send_activation"],
+                    request=request,
+                    hash_workers=1,
+                )
+            except ImportFileError as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        payload = report.to_dict()
+        if not report.dry_run:
+            AuditLogEntry.record(
+                actor=request.user,
+                action="user.imported",
+                metadata={key: payload[key] for key in ("rows", "created", "skipped", "notified")},
+                request=request,
+            )
+        return Response(payload)
+
 
 class UserGroupViewSet(viewsets.ModelViewSet):
     queryset = UserGroup.objects.prefetch_related("users")
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from administration.benchmarks import BATCH_SIZE, BENCHMARK_EMAIL_DOMAIN, BENCHMARK_PREFIX, purge_dataset
+
+from .models import AccessRequest, AccessRequestLine, EntityMembership, RegulatedEntity, User
+from .services import visible_access_requests
+
+PAGE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class VisibilityScale:
+    entities: int = 2_000
+    access_requests: int = 20_000
+    max_lines_per_request: int = 3
+    requesters: int = 4_000
+    # Entities attached to each probe user (managed, administered, member of).
+    probe_entities: int = 100
+
+
+@dataclass
+class VisibilityProbe:
+    name: str
+    user: User
+    filter_name: str = ""
+
+
+@dataclass
+class VisibilityMeasurement:
+    case: str
+    variant: str
+    rows: int
+    page_seconds: list[float] = field(default_factory=list)
+    count_seconds: list[float] = field(default_factory=list)
+    plan: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "case": self.case,
+            "variant": self.variant,
+            "rows": self.rows,
+            "page_median_ms": round(statistics.median(self.page_seconds) * 1000, 3),
+            "count_median_ms": round(statistics.median(self.count_seconds) * 1000, 3),
+            "plan": self.plan,
+        }
+
+
+def legacy_visible_access_requests(queryset: QuerySet, user: User, *, filter_name: str = "") -> QuerySet:
+    """The join + ``DISTINCT`` filters ``visible_access_requests`` replaced, kept for comparison."""
+    if user.is_internal:
+        filter_name = filter_name.lower().strip()
+        if filter_name == "moje-podmioty":
+            queryset = queryset.filter(lines__entity__in=user.managed_entities.all())
+        elif filter_name in {"wymaga-dzialania-uknf", "wymaga działania uknf"}:
+            queryset = queryset.filter(next_actor=AccessRequest.NextActor.UKNF)
+        elif filter_name == "obslugiwany-przez-uknf":
+            queryset = queryset.filter(handled_by_uknf=True)
+        return queryset.distinct()
+
+    if user.role == User.UserRole.ENTITY_ADMIN:
+        return queryset.filter(
+            lines__entity__memberships__user=user,
+            lines__entity__memberships__role=EntityMembership.MembershipRole.ADMIN,
+        ).distinct()
+
+    entity_ids = list(user.memberships.values_list("entity_id", flat=True))
+    if entity_ids:
+        return queryset.filter(lines__entity_id__in=entity_ids).distinct()
+    return queryset.filter(requester=user).distinct()
+
+
+VARIANTS: dict[str, Callable[..., QuerySet]] = {
+    "legacy_join_distinct": legacy_visible_access_requests,
+    "id_in_subquery": visible_access_requests,
+}
+
+
+def seed_visibility_dataset(scale: VisibilityScale, *, seed: int = 0) -> list[VisibilityProbe]:
+    """Bulk-insert entities, requests and lines, returning the users to probe with.
+
+    Rows carry the same ``BENCH`` markers as ``administration.benchmarks``, so
+    ``purge_dataset`` removes them.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(None)
+
+    with transaction.atomic():
+        entities = RegulatedEntity.objects.bulk_create(
+            [
+                RegulatedEntity(
+                    name=f"Podmiot testowy {index}",
+                    registration_number=f"{BENCHMARK_PREFIX}{index:07d}",
+                    sector="Bank",
+                    address=f"ul. Testowa {index}",
+                    postal_code="00-001",
+                    city="Warszawa",
+                    contact_email=f"entity{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    contact_phone="48000000000",
+                )
+                for index in range(scale.entities)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        admins = User.objects.bulk_create(
+            [
+                User(
+                    email=f"admin{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    username=f"admin{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    password=password,
+                    role=User.UserRole.ENTITY_ADMIN,
+                )
+                for index in range(scale.entities)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        requesters = User.objects.bulk_create(
+            [
+                User(
+                    email=f"requester{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    username=f"requester{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    password=password,
+                    first_name="Jan",
+                    last_name=f"Testowy{index}",
+                    role=User.UserRole.SUBMITTER,
+                )
+                for index in range(scale.requesters)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        supervisor, group_admin, member = User.objects.bulk_create(
+            [
+                User(email=f"probe.{name}@{BENCHMARK_EMAIL_DOMAIN}", username=f"probe.{name}@{BENCHMARK_EMAIL_DOMAIN}", password=password, role=role)
+                for name, role in (
+                    ("supervisor", User.UserRole.SUPERVISOR),
+                    ("admin", User.UserRole.ENTITY_ADMIN),
+                    ("member", User.UserRole.SUBMITTER),
+                )
+            ]
+        )
+
+        probe_entities = rng.sample(entities, min(scale.probe_entities, len(entities)))
+        memberships = [
+            EntityMembership(user=admin, entity=entity, role=EntityMembership.MembershipRole.ADMIN, is_primary=True)
+            for admin, entity in zip(admins, entities)
+        ]
+        for entity in probe_entities:
+            memberships.append(EntityMembership(user=group_admin, entity=entity, role=EntityMembership.MembershipRole.ADMIN))
+            memberships.append(EntityMembership(user=member, entity=entity, role=EntityMembership.MembershipRole.SUBMITTER))
+        EntityMembership.objects.bulk_create(memberships, batch_size=BATCH_SIZE)
+        supervisor.managed_entities.add(*probe_entities)
+
+        assigned = [requesters[index % len(requesters)] for index in range(scale.access_requests)]
+        access_requests = AccessRequest.objects.bulk_create(
+            [
+                AccessRequest(
+                    reference_code=f"AR-{BENCHMARK_PREFIX}{index:07d}",
+                    requester=requester,
+                    status=rng.choice([AccessRequest.AccessStatus.NEW, AccessRequest.AccessStatus.APPROVED]),
+                    next_actor=rng.choice(AccessRequest.NextActor.values),
+                    requester_first_name=requester.first_name,
+                    requester_last_name=requester.last_name,
+                    requester_email=requester.email,
+                    submitted_at=now,
+                )
+                for index, requester in enumerate(assigned)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # bulk_create skips AccessRequestLine.save(), which would query permissions per line.
+        AccessRequestLine.objects.bulk_create(
+            [
+                AccessRequestLine(request=access_request, entity=entity)
+                for access_request in access_requests
+                for entity in rng.sample(entities, rng.randint(1, min(scale.max_lines_per_request, len(entities))))
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+    return [
+        VisibilityProbe("internal.moje-podmioty", supervisor, "moje-podmioty"),
+        VisibilityProbe("entity_admin", group_admin),
+        VisibilityProbe("entity_member", member),
+    ]
+
+
+def measure_visibility(probes: list[VisibilityProbe], *, repeat: int = 5, explain: bool = False) -> list[VisibilityMeasurement]:
+    """Time the first page and the total count of every probe under both variants.
+
+    The page is fetched as full model rows in list order, which is what the
+    ``DISTINCT`` of the legacy variant has to deduplicate.
+    """
+    measurements = []
+    for probe in probes:
+        pages: dict[str, list[int]] = {}
+        for variant, build in VARIANTS.items():
+            queryset = build(AccessRequest.objects.order_by("-created_at", "-id"), probe.user, filter_name=probe.filter_name)
+            measurement = VisibilityMeasurement(case=probe.name, variant=variant, rows=queryset.count())
+            for _ in range(repeat):
+                started = time.perf_counter()
+                page = list(queryset[:PAGE_SIZE])
+                measurement.page_seconds.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                queryset.count()
+                measurement.count_seconds.append(time.perf_counter() - started)
+            pages[variant] = [item.pk for item in page]
+            if explain:
+                measurement.plan = queryset[:PAGE_SIZE].explain()
+            measurements.append(measurement)
+        if len({tuple(ids) for ids in pages.values()}) != 1:
+            raise RuntimeError(f"Warianty zwracają różne wyniki dla przypadku {probe.name}.")
+    return measurements
+
+
+def run_visibility_benchmark(
+    scale: VisibilityScale,
+    *,
+    repeat: int = 5,
+    seed: int = 0,
+    explain: bool = False,
+    keep_data: bool = False,
+) -> list[VisibilityMeasurement]:
+    # Left-overs of an interrupted run would collide with the new rows.
+    purge_dataset()
+    probes = seed_visibility_dataset(scale, seed=seed)
+    try:
+        return measure_visibility(probes, repeat=repeat, explain=explain)
+    finally:
+        if not keep_data:
+            purge_dataset()
+
+
+__all__ = [
+    "VisibilityScale",
+    "legacy_visible_access_requests",
+    "measure_visibility",
+    "run_visibility_benchmark",
+    "seed_visibility_dataset",
+]
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_SYNC = "sync"
+DURABILITY_ON_COMMIT = "on_commit"
+DURABILITY_FIRE_AND_FORGET = "fire_and_forget"
+DURABILITY_MODES = {DURABILITY_SYNC, DURABILITY_ON_COMMIT, DURABILITY_FIRE_AND_FORGET}
+
+
+@dataclass
+class AuditQueueStats:
+    queued: int = 0
+    enqueued_total: int = 0
+    flushed_total: int = 0
+    dropped_total: int = 0
+    failed_flushes: int = 0
+    flushes: int = 0
+    last_flush_seconds: float = 0.0
+
+
+class AuditLogWriter:
+    """Per-process buffer that writes audit entries with ``bulk_create``.
+
+    ``sync`` saves every entry immediately. ``on_commit`` queues an entry once
+    the surrounding transaction commits (entries of rolled back work are never
+    written) and the queue is flushed at the end of each request, when it
+    reaches ``AUDIT_LOG_BUFFER_SIZE`` or after ``AUDIT_LOG_FLUSH_INTERVAL``
+    seconds. ``fire_and_forget`` queues immediately and leaves flushing to a
+    background thread, so the request never waits for the insert; entries
+    still buffered when the process dies are lost.
+    """
+
+    def __init__(self) -> None:
+        self._queue: deque = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._last_flush = time.monotonic()
+        self._stats = AuditQueueStats()
+
+    @property
+    def durability(self) -> str:
+        mode = getattr(settings, "AUDIT_LOG_DURABILITY", DURABILITY_SYNC)
+        return mode if mode in DURABILITY_MODES else DURABILITY_SYNC
+
+    @property
+    def buffer_size(self) -> int:
+        return max(int(getattr(settings, "AUDIT_LOG_BUFFER_SIZE", 100)), 1)
+
+    @property
+    def flush_interval(self) -> float:
+        return float(getattr(settings, "AUDIT_LOG_FLUSH_INTERVAL", 2.0))
+
+    @property
+    def max_queue(self) -> int:
+        return max(int(getattr(settings, "AUDIT_LOG_MAX_QUEUE", 10_000)), self.buffer_size)
+
+    def write(self, entry) -> bool:
+        """Save or queue ``entry``; returns ``True`` when it was inserted right away."""
+        mode = self.durability
+        if mode == DURABILITY_SYNC:
+            entry.save()
+            return True
+        if mode == DURABILITY_ON_COMMIT:
+            transaction.on_commit(lambda: self._enqueue(entry, flush_inline=True))
+        else:
+            self._enqueue(entry, flush_inline=False)
+        return False
+
+    def write_many(self, entries) -> bool:
+        entries = list(entries)
+        if not entries:
+            return True
+        mode = self.durability
+        if mode == DURABILITY_SYNC:
+            from .models import AuditLogEntry
+
+            AuditLogEntry.objects.bulk_create(entries, batch_size=self.buffer_size)
+            return True
+        if mode == DURABILITY_ON_COMMIT:
+            transaction.on_commit(lambda: self._enqueue_many(entries, flush_inline=True))
+        else:
+            self._enqueue_many(entries, flush_inline=False)
+        return False
+
+    def flush(self) -> int:
+        """Write every queued entry; returns the number of rows inserted."""
+        from .models import AuditLogEntry
+
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._queue)
+                self._queue.clear()
+                self._last_flush = time.monotonic()
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            try:
+                AuditLogEntry.objects.bulk_create(batch, batch_size=self.buffer_size)
+            except Exception:
+                logger.exception("Nie udało się zapisać %s wpisów dziennika audytu.", len(batch))
+                with self._lock:
+                    self._stats.failed_flushes += 1
+                    self._queue.extendleft(reversed(batch))
+                    self._trim()
+                return 0
+            with self._lock:
+                self._stats.flushes += 1
+                self._stats.flushed_total += len(batch)
+                self._stats.last_flush_seconds = time.perf_counter() - started
+            return len(batch)
+
+    def flush_if_pending(self) -> None:
+        if self._queue and self.durability == DURABILITY_ON_COMMIT:
+            self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._stats.queued = len(self._queue)
+            return asdict(self._stats)
+
+    def _enqueue(self, entry, *, flush_inline: bool) -> None:
+        self._enqueue_many([entry], flush_inline=flush_inline)
+
+    def _enqueue_many(self, entries, *, flush_inline: bool) -> None:
+        with self._lock:
+            self._queue.extend(entries)
+            self._stats.enqueued_total += len(entries)
+            self._trim()
+            due = (
+                len(self._queue) >= self.buffer_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if flush_inline:
+            if due:
+                self.flush()
+            return
+        self._ensure_flusher()
+        if due:
+            self._wakeup.set()
+
+    def _trim(self) -> None:
+        # Caller holds ``self._lock``. A bounded queue keeps memory in check
+        # when the database is unavailable; the oldest entries go first.
+        overflow = len(self._queue) - self.max_queue
+        for _ in range(max(overflow, 0)):
+            self._queue.popleft()
+            self._stats.dropped_total += 1
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._run_flusher, name="audit-log-flusher", daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+
+audit_writer = AuditLogWriter()
+# Buffered entries are written when the interpreter exits normally.
+atexit.register(audit_writer.flush)
+
+
+class AuditLogFlushMiddleware:
+    """Flush entries queued in ``on_commit`` mode before the response leaves."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        audit_writer.flush_if_pending()
+        return response
+
+
+__all__ = ["AuditLogFlushMiddleware", "AuditLogWriter", "audit_writer"]
@@ -0,0 +1,489 @@
+from __future__ import annotations
+
+import json
+import platform
+import random
+import time
+from dataclasses import asdict, dataclass, field, fields, replace
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import (
+    AccessRequest,
+    AccessRequestHistoryEntry,
+    AccessRequestLine,
+    AccessRequestLinePermission,
+    AccessRequestMessage,
+    EntityMembership,
+    RegulatedEntity,
+    User,
+)
+from communication.models import LibraryDocument, Message, MessageThread, Report
+from communication.services import validate_report_workbook
+from library.services import select_relevant_documents
+
+from .models import AuditLogEntry
+
+BENCHMARK_EMAIL_DOMAIN = "benchmark.invalid"
+BENCHMARK_PREFIX = "BENCH"
+BATCH_SIZE = 1000
+SAMPLE_WORKBOOKS = ("G. RIP100000_Q1_2025.xlsx", "G. RIP100000_Q2_2025.xlsx")
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass(frozen=True)
+class BenchmarkScale:
+    """Row counts of the synthetic dataset; :meth:`scaled` multiplies them."""
+
+    entities: int = 50
+    users_per_entity: int = 4
+    threads: int = 200
+    messages_per_thread: int = 10
+    reports: int = 500
+    access_requests: int = 200
+    # Each request covers 1..max_lines_per_request entities with 1-3 permissions per line.
+    max_lines_per_request: int = 3
+    messages_per_access_request: int = 2
+    library_documents: int = 300
+    embedding_dimensions: int = 256
+    audit_entries: int = 5000
+
+    def scaled(self, factor: float) -> "BenchmarkScale":
+        return replace(
+            self,
+            **{
+                item.name: max(1, round(getattr(self, item.name) * factor))
+                for item in fields(self)
+                if item.name
+                not in {
+                    "users_per_entity",
+                    "messages_per_thread",
+                    "max_lines_per_request",
+                    "messages_per_access_request",
+                    "embedding_dimensions",
+                }
+            },
+        )
+
+
+@dataclass
+class SeededDataset:
+    internal_user: User
+    entity_user: User
+    thread_id: int
+    embedding_dimensions: int
+    seconds: float
+    rows: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    run: Callable[[], Any]
+
+
+def seed_dataset(scale: BenchmarkScale, *, seed: int = 0) -> SeededDataset:
+    """Insert a synthetic dataset with bulk inserts.
+
+    Every row is tagged (``BENCH`` registration numbers and titles, e-mails in
+    ``benchmark.invalid``) so :func:`purge_dataset` can remove it afterwards.
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(None)
+    rows: dict[str, int] = {}
+
+    with transaction.atomic():
+        entities = RegulatedEntity.objects.bulk_create(
+            [
+                RegulatedEntity(
+                    name=f"Podmiot testowy {index}",
+                    registration_number=f"{BENCHMARK_PREFIX}{index:07d}",
+                    sector=rng.choice(["Bank", "Towarzystwo ubezpieczeń", "Dom maklerski"]),
+                    address=f"ul. Testowa {index}",
+                    postal_code="00-001",
+                    city="Warszawa",
+                    contact_email=f"entity{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    contact_phone="48000000000",
+                )
+                for index in range(scale.entities)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["entities"] = len(entities)
+
+        staff = User.objects.bulk_create(
+            [
+                User(
+                    email=f"staff{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    username=f"staff{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    password=password,
+                    role=role,
+                )
+                for index, role in enumerate([User.UserRole.SUPERVISOR, User.UserRole.ANALYST, User.UserRole.COMMUNICATION_OFFICER])
+            ]
+        )
+        external = User.objects.bulk_create(
+            [
+                User(
+                    email=f"user{entity_index}.{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    username=f"user{entity_index}.{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                    password=password,
+                    first_name="Jan",
+                    last_name=f"Testowy{index}",
+                    role=User.UserRole.ENTITY_ADMIN if index == 0 else User.UserRole.SUBMITTER,
+                )
+                for entity_index in range(scale.entities)
+                for index in range(scale.users_per_entity)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["users"] = len(staff) + len(external)
+        users_by_entity = [
+            external[position : position + scale.users_per_entity]
+            for position in range(0, len(external), scale.users_per_entity)
+        ]
+
+        memberships = EntityMembership.objects.bulk_create(
+            [
+                EntityMembership(
+                    user=user,
+                    entity=entity,
+                    role=EntityMembership.MembershipRole.ADMIN if index == 0 else EntityMembership.MembershipRole.SUBMITTER,
+                    is_primary=True,
+                )
+                for entity, members in zip(entities, users_by_entity)
+                for index, user in enumerate(members)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["memberships"] = len(memberships)
+
+        threads = MessageThread.objects.bulk_create(
+            [
+                MessageThread(
+                    entity=entities[index % len(entities)],
+                    subject=f"{BENCHMARK_PREFIX} wątek {index}",
+                    created_by=users_by_entity[index % len(entities)][0],
+                )
+                for index in range(scale.threads)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["threads"] = len(threads)
+        through = MessageThread.participants.through
+        through.objects.bulk_create(
+            [
+                through(messagethread_id=thread.pk, user_id=user.pk)
+                for index, thread in enumerate(threads)
+                for user in (users_by_entity[index % len(entities)][0], staff[index % len(staff)])
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        messages = Message.objects.bulk_create(
+            [
+                Message(
+                    thread=thread,
+                    sender=users_by_entity[index % len(entities)][0] if position % 2 == 0 else staff[index % len(staff)],
+                    body=f"Wiadomość {position} w sprawie sprawozdania kwartalnego nr {rng.randint(1, 10_000)}.",
+                )
+                for index, thread in enumerate(threads)
+                for position in range(scale.messages_per_thread)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["messages"] = len(messages)
+
+        reports = Report.objects.bulk_create(
+            [
+                Report(
+                    entity=entities[index % len(entities)],
+                    submitted_by=users_by_entity[index % len(entities)][-1],
+                    title=f"{BENCHMARK_PREFIX} sprawozdanie {index}",
+                    report_type=rng.choice(["F01", "F02", "RIP"]),
+                    period_start=date(2025, 1, 1),
+                    period_end=date(2025, 3, 31),
+                    status=rng.choice(Report.ReportStatus.values),
+                    submitted_at=now - timedelta(days=rng.randint(0, 365)),
+                )
+                for index in range(scale.reports)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["reports"] = len(reports)
+
+        access_requests = AccessRequest.objects.bulk_create(
+            [
+                AccessRequest(
+                    reference_code=f"AR-{BENCHMARK_PREFIX}{index:07d}",
+                    requester=user,
+                    status=rng.choice([AccessRequest.AccessStatus.NEW, AccessRequest.AccessStatus.APPROVED]),
+                    requester_first_name=user.first_name,
+                    requester_last_name=user.last_name,
+                    requester_email=user.email,
+                    submitted_at=now,
+                )
+                for index, user in enumerate(external[: scale.access_requests])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["access_requests"] = len(access_requests)
+
+        # bulk_create skips AccessRequestLine.save(), which would query permissions per line.
+        lines = AccessRequestLine.objects.bulk_create(
+            [
+                AccessRequestLine(request=access_request, entity=entity, contact_email=access_request.requester_email)
+                for access_request in access_requests
+                for entity in rng.sample(entities, rng.randint(1, min(scale.max_lines_per_request, len(entities))))
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["access_request_lines"] = len(lines)
+        codes = AccessRequestLinePermission.PermissionCode.values
+        permissions = AccessRequestLinePermission.objects.bulk_create(
+            [
+                AccessRequestLinePermission(line=line, code=code)
+                for line in lines
+                for code in rng.sample(codes, rng.randint(1, len(codes)))
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["access_request_permissions"] = len(permissions)
+        request_messages = AccessRequestMessage.objects.bulk_create(
+            [
+                AccessRequestMessage(
+                    request=access_request,
+                    sender=access_request.requester if position % 2 == 0 else staff[index % len(staff)],
+                    body=f"Wiadomość {position} w sprawie wniosku {access_request.reference_code}.",
+                    is_internal=position % 2 == 1 and rng.random() < 0.3,
+                )
+                for index, access_request in enumerate(access_requests)
+                for position in range(scale.messages_per_access_request)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["access_request_messages"] = len(request_messages)
+        history = AccessRequestHistoryEntry.objects.bulk_create(
+            [
+                AccessRequestHistoryEntry(
+                    request=access_request,
+                    actor=access_request.requester,
+                    action="request.submitted",
+                    to_status=access_request.status,
+                )
+                for access_request in access_requests
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["access_request_history"] = len(history)
+
+        documents = LibraryDocument.objects.bulk_create(
+            [
+                LibraryDocument(
+                    title=f"{BENCHMARK_PREFIX} dokument {index} – sprawozdawczość kwartalna",
+                    category=rng.choice(LibraryDocument.DocumentCategory.values),
+                    version="1.0",
+                    description="Wytyczne dotyczące raportowania danych kredytowych.",
+                    content=" ".join(rng.choice(["kredyt", "sprawozdanie", "nadzór", "termin", "formularz"]) for _ in range(200)),
+                    embedding=_random_vector(rng, scale.embedding_dimensions),
+                    uploaded_by=staff[0],
+                )
+                for index in range(scale.library_documents)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["library_documents"] = len(documents)
+
+        audit_entries = AuditLogEntry.objects.bulk_create(
+            [
+                AuditLogEntry(
+                    action=rng.choice(["report.uploaded", "thread.message", "auth.login"]),
+                    actor=rng.choice(staff),
+                    metadata={"benchmark": True, "index": index},
+                    created_at=now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+                )
+                for index in range(scale.audit_entries)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        rows["audit_entries"] = len(audit_entries)
+
+    return SeededDataset(
+        internal_user=staff[0],
+        entity_user=users_by_entity[0][0],
+        thread_id=threads[0].pk,
+        embedding_dimensions=scale.embedding_dimensions,
+        seconds=time.perf_counter() - started,
+        rows=rows,
+    )
+
+
+def purge_dataset() -> None:
+    """Remove every row created by :func:`seed_dataset`."""
+    with transaction.atomic():
+        AuditLogEntry.objects.filter(metadata__benchmark=True).delete()
+        LibraryDocument.objects.filter(title__startswith=f"{BENCHMARK_PREFIX} ").delete()
+        MessageThread.objects.filter(subject__startswith=f"{BENCHMARK_PREFIX} ").delete()
+        # Entities cascade to memberships and reports, users to access requests.
+        RegulatedEntity.objects.filter(registration_number__startswith=BENCHMARK_PREFIX).delete()
+        User.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}").delete()
+
+
+def build_cases(dataset: SeededDataset, *, data_dir: Path | None = None, seed: int = 0) -> list[BenchmarkCase]:
+    internal = APIClient()
+    internal.force_authenticate(user=dataset.internal_user)
+    external = APIClient()
+    external.force_authenticate(user=dataset.entity_user)
+    question_embedding = _random_vector(random.Random(seed), dataset.embedding_dimensions)
+
+    cases = [
+        BenchmarkCase("reports.list.internal", lambda: internal.get("/api/communication/reports/")),
+        BenchmarkCase("reports.list.entity", lambda: external.get("/api/communication/reports/")),
+        BenchmarkCase("threads.list.internal", lambda: internal.get("/api/communication/messages/")),
+        BenchmarkCase("threads.list.entity", lambda: external.get("/api/communication/messages/")),
+        BenchmarkCase("threads.messages", lambda: internal.get(f"/api/communication/messages/{dataset.thread_id}/messages/")),
+        BenchmarkCase("access_requests.list.internal", lambda: internal.get("/api/auth/access-requests/")),
+        BenchmarkCase("access_requests.list.entity", lambda: external.get("/api/auth/access-requests/")),
+        BenchmarkCase("library.search", lambda: external.get("/api/library/search", {"q": "kwartalna"})),
+        BenchmarkCase(
+            "library.select_relevant_documents",
+            lambda: select_relevant_documents("terminy sprawozdań kwartalnych", dataset.entity_user, embedding=question_embedding),
+        ),
+    ]
+    data_dir = data_dir or Path(settings.BASE_DIR).parent / "data"
+    for filename in SAMPLE_WORKBOOKS:
+        path = data_dir / filename
+        if path.exists():
+            cases.append(BenchmarkCase(f"workbook.validate.{path.stem.split('_', 1)[-1]}", lambda path=path: validate_report_workbook(path)))
+    return cases
+
+
+def run_benchmarks(
+    cases: list[BenchmarkCase],
+    *,
+    iterations: int = 20,
+    warmup: int = 2,
+    only: list[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Run each case ``warmup + iterations`` times and summarise latency and query counts."""
+    results: dict[str, dict[str, Any]] = {}
+    hosts = settings.ALLOWED_HOSTS if "*" in settings.ALLOWED_HOSTS else [*settings.ALLOWED_HOSTS, "testserver"]
+    with override_settings(ALLOWED_HOSTS=hosts):
+        for case in cases:
+            if only and not any(case.name.startswith(prefix) for prefix in only):
+                continue
+            for _ in range(warmup):
+                case.run()
+            durations: list[float] = []
+            queries: list[int] = []
+            status = None
+            for _ in range(iterations):
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    outcome = case.run()
+                    durations.append((time.perf_counter() - started) * 1000)
+                queries.append(len(captured))
+                status = getattr(outcome, "status_code", status)
+            results[case.name] = _summarise(durations, queries, status)
+    return results
+
+
+def build_report(
+    results: dict[str, dict[str, Any]],
+    *,
+    scale: BenchmarkScale,
+    dataset: SeededDataset | None,
+    iterations: int,
+) -> dict[str, Any]:
+    return {
+        "generated_at": timezone.now().isoformat(),
+        "environment": {
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scale": asdict(scale),
+        "seed": {"seconds": round(dataset.seconds, 3), "rows": dataset.rows} if dataset else None,
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def compare_reports(current: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Describe p50/p95 and query count changes against an earlier report."""
+    lines = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            lines.append(f"{name}: brak w wyniku bazowym")
+            continue
+        changes = [
+            f"{metric} {previous[metric]:.1f} → {result[metric]:.1f} ms ({_relative_change(previous[metric], result[metric])})"
+            for metric in ("p50_ms", "p95_ms")
+        ]
+        if previous["queries"] != result["queries"]:
+            changes.append(f"zapytania {previous['queries']} → {result['queries']}")
+        lines.append(f"{name}: " + ", ".join(changes))
+    return lines
+
+
+def write_report(report: dict[str, Any], path: Path) -> None:
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def _summarise(durations: list[float], queries: list[int], status: int | None) -> dict[str, Any]:
+    ordered = sorted(durations)
+    summary: dict[str, Any] = {f"p{pct}_ms": round(_percentile(ordered, pct), 3) for pct in PERCENTILES}
+    summary.update(
+        mean_ms=round(sum(ordered) / len(ordered), 3),
+        min_ms=round(ordered[0], 3),
+        max_ms=round(ordered[-1], 3),
+        queries=sorted(queries)[len(queries) // 2],
+        queries_max=max(queries),
+    )
+    if status is not None:
+        summary["status"] = status
+    return summary
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _relative_change(before: float, after: float) -> str:
+    if not before:
+        return "n/d"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def _random_vector(rng: random.Random, dimensions: int) -> list[float]:
+    return [round(rng.uniform(-1.0, 1.0), 6) for _ in range(dimensions)]
+
+
+__all__ = [
+    "BenchmarkScale",
+    "build_cases",
+    "build_report",
+    "compare_reports",
+    "purge_dataset",
+    "run_benchmarks",
+    "seed_dataset",
+    "write_report",
+]
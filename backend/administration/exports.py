@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.db.models import QuerySet
+
+from uknf_platform.exports import ExportSpec
+
+from .models import AuditLogEntry
+
+AUDIT_LOG_EXPORT = ExportSpec(
+    name="audit-log",
+    audit_action="audit_log.exported",
+    columns={
+        "id": "id",
+        "created_at": "created_at",
+        "action": "action",
+        "severity": "severity",
+        "actor_id": "actor_id",
+        "actor_email": "actor__email",
+        "ip_address": "ip_address",
+        "user_agent": "user_agent",
+        "metadata": "metadata",
+    },
+    formats=("csv", "ndjson", "xlsx"),
+)
+EXPORT_FORMATS = AUDIT_LOG_EXPORT.formats
+
+
+def stream_audit_log(queryset: QuerySet[AuditLogEntry], output: str):
+    """Stream ``queryset`` as CSV, NDJSON or XLSX without materialising it.
+
+    Rows are read as tuples through a server-side cursor in chunks of
+    ``EXPORT_CHUNK_SIZE``, so memory use does not depend on the export size.
+    """
+    return AUDIT_LOG_EXPORT.stream(queryset, output)
+
+
+__all__ = ["AUDIT_LOG_EXPORT", "EXPORT_FORMATS", "stream_audit_log"]
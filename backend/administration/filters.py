@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from django_filters import rest_framework as filters
+
+from .models import AuditLogEntry
+
+
+class AuditLogFilter(filters.FilterSet):
+    created_after = filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="gte")
+    created_before = filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="lt")
+    action_prefix = filters.CharFilter(field_name="action", lookup_expr="startswith")
+
+    class Meta:
+        model = AuditLogEntry
+        fields = ["severity", "actor", "action"]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from administration.retention import DEFAULT_CHUNK_SIZE, enforce_retention, supported_data_types
+
+
+class Command(BaseCommand):
+    help = "Usuwa dane starsze niż okresy zdefiniowane w politykach retencji (wraz z plikami)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--data-type",
+            action="append",
+            dest="data_types",
+            choices=supported_data_types(),
+            help="Ogranicz przebieg do wskazanego typu danych (można podać wielokrotnie).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Liczba wierszy usuwanych w jednej transakcji.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Tylko raportuj, nie usuwaj danych.")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Działaj jako proces roboczy i powtarzaj przebieg co --interval-minutes minut.",
+        )
+        parser.add_argument("--interval-minutes", type=int, default=60 * 24)
+
+    def handle(self, *args, **options):
+        while True:
+            self._run(options)
+            if not options["loop"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval_minutes"] * 60)
+
+    def _run(self, options):
+        results = enforce_retention(
+            data_types=options["data_types"],
+            chunk_size=options["chunk_size"],
+            dry_run=options["dry_run"],
+        )
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        if not results:
+            self.stdout.write(f"{prefix}Brak polityk retencji do zastosowania.")
+        for result in results:
+            line = f"{prefix}{result.data_type}: {result.rows} wierszy, {result.files} plików ({result.bytes_reclaimed} B)"
+            if result.partitions_dropped:
+                line += f", usunięte partycje: {', '.join(result.partitions_dropped)}"
+            self.stdout.write(self.style.SUCCESS(line + "."))
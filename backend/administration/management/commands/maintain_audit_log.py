@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from administration.partitions import (
+    AUDIT_RETENTION_DATA_TYPE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MONTHS_AHEAD,
+    apply_retention,
+    ensure_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = "Tworzy kolejne miesięczne partycje dziennika audytu i usuwa wpisy starsze niż okres retencji."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=DEFAULT_MONTHS_AHEAD,
+            help="Liczba przyszłych miesięcy, dla których należy przygotować partycje.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Liczba wierszy usuwanych w jednej porcji poza całymi partycjami.",
+        )
+        parser.add_argument("--skip-retention", action="store_true", help="Nie usuwaj przeterminowanych wpisów.")
+
+    def handle(self, *args, **options):
+        created = ensure_partitions(months_ahead=options["months_ahead"])
+        if created:
+            self.stdout.write(f"Utworzono partycje: {', '.join(created)}.")
+
+        if options["skip_retention"]:
+            return
+        result = apply_retention(chunk_size=options["chunk_size"])
+        if result is None:
+            self.stdout.write(f"Brak polityki retencji „{AUDIT_RETENTION_DATA_TYPE}” – pominięto usuwanie wpisów.")
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Usunięto wpisy sprzed {result.cutoff:%Y-%m-%d}: {len(result.partitions_dropped)} partycji "
+                f"i {result.rows_deleted} pojedynczych wierszy."
+            )
+        )
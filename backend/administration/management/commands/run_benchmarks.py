@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from administration.benchmarks import (
+    BenchmarkScale,
+    build_cases,
+    build_report,
+    compare_reports,
+    purge_dataset,
+    run_benchmarks,
+    seed_dataset,
+    write_report,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generuje syntetyczny zbiór danych i mierzy opóźnienia oraz liczbę zapytań "
+        "kluczowych endpointów API, zapisując wynik w formacie JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Mnożnik liczby wierszy zbioru danych (1.0 = 50 podmiotów, 200 wątków, 500 sprawozdań…).",
+        )
+        parser.add_argument("--iterations", type=int, default=20, help="Liczba mierzonych wywołań każdego przypadku.")
+        parser.add_argument("--warmup", type=int, default=2, help="Liczba wywołań rozgrzewających (niemierzonych).")
+        parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora danych syntetycznych.")
+        parser.add_argument(
+            "--only",
+            action="append",
+            help="Uruchom wyłącznie przypadki o nazwie zaczynającej się od podanego prefiksu (można podać wielokrotnie).",
+        )
+        parser.add_argument("--output", help="Ścieżka pliku JSON z wynikami (domyślnie standardowe wyjście).")
+        parser.add_argument("--baseline", help="Wcześniejszy wynik JSON, z którym należy porównać bieżący przebieg.")
+        parser.add_argument("--keep-data", action="store_true", help="Nie usuwaj danych syntetycznych po zakończeniu.")
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations musi być dodatnie.")
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = json.loads(Path(options["baseline"]).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Nie można odczytać wyniku bazowego: {exc}") from exc
+
+        scale = BenchmarkScale().scaled(options["scale"])
+        # Left-overs of an interrupted run would collide with the new rows.
+        purge_dataset()
+        dataset = seed_dataset(scale, seed=options["seed"])
+        self.stderr.write(f"Wygenerowano dane w {dataset.seconds:.1f} s: {dataset.rows}")
+        try:
+            results = run_benchmarks(
+                build_cases(dataset, seed=options["seed"]),
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                only=options["only"],
+            )
+        finally:
+            if not options["keep_data"]:
+                purge_dataset()
+
+        report = build_report(results, scale=scale, dataset=dataset, iterations=options["iterations"])
+        if options["output"]:
+            write_report(report, Path(options["output"]))
+            self.stderr.write(self.style.SUCCESS(f"Zapisano wyniki do {options['output']}."))
+        else:
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+        if baseline:
+            for line in compare_reports(report, baseline):
+                self.stderr.write(line)
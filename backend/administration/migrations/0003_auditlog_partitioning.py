@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import migrations, models
+
+TABLE = "administration_auditlogentry"
+LEGACY = f"{TABLE}_legacy"
+MONTHS_AHEAD = 3
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def partition_audit_log(apps, schema_editor):
+    """Rebuild the audit table as ``PARTITION BY RANGE (created_at)`` on Postgres.
+
+    Monthly partitions are named ``<table>_pYYYYMM``; a default partition
+    catches anything outside the created ranges. Other backends keep the plain
+    table and rely on the ``created_at`` indexes added below.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [TABLE])
+        if cursor.fetchone():
+            return
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [TABLE, f"{TABLE}_pkey"],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute("SELECT attidentity FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'id'", [TABLE])
+        is_identity = bool(cursor.fetchone()[0])
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+        sequence = cursor.fetchone()[0]
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1, MIN(created_at) FROM {TABLE}")
+        next_id, oldest = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY}")
+        cursor.execute(f"ALTER INDEX {TABLE}_pkey RENAME TO {LEGACY}_pkey")
+        if is_identity:
+            # Partitioned tables cannot carry identity columns before Postgres 17.
+            cursor.execute(f"ALTER TABLE {LEGACY} ALTER COLUMN id DROP IDENTITY")
+            sequence = f"{TABLE}_id_seq"
+            cursor.execute(f"CREATE SEQUENCE {sequence} START WITH {int(next_id)}")
+        else:
+            cursor.execute(f"ALTER TABLE {LEGACY} ALTER COLUMN id DROP DEFAULT")
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS INCLUDING STORAGE) PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id")
+        # The partition key has to be part of every unique constraint.
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, created_at)")
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+        now = datetime.now(timezone.utc)
+        start = (oldest or now).astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last = _add_months(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), MONTHS_AHEAD)
+        while start <= last:
+            end = _add_months(start, 1)
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{start:%Y%m} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            start = end
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {LEGACY}")
+        cursor.execute(f"DROP TABLE {LEGACY}")
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0002_auditlogentry_recorded_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # The partitioned table has the same columns, so older code keeps
+        # working against it and the reverse step has nothing to undo.
+        migrations.RunPython(partition_audit_log, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='auditlogentry',
+            index=models.Index(fields=['created_at', 'id'], name='audit_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlogentry',
+            index=models.Index(fields=['action', 'created_at'], name='audit_action_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlogentry',
+            index=models.Index(fields=['actor', 'created_at'], name='audit_actor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlogentry',
+            index=models.Index(fields=['severity', 'created_at'], name='audit_severity_created_idx'),
+        ),
+    ]
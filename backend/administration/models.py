@@ -4,6 +4,8 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from .audit import audit_writer
+
 
 class PasswordPolicy(models.Model):
     min_length = models.PositiveIntegerField(default=12)
@@ -34,16 +36,23 @@ class AuditLogEntry(models.Model):
     metadata = models.JSONField(default=dict, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is recorded rather than when a buffered batch is written.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="audit_created_idx"),
+            models.Index(fields=["action", "created_at"], name="audit_action_created_idx"),
+            models.Index(fields=["actor", "created_at"], name="audit_actor_created_idx"),
+            models.Index(fields=["severity", "created_at"], name="audit_severity_created_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.created_at} {self.action}"
 
     @classmethod
-    def record(cls, *, actor=None, action: str, metadata: dict | None = None, severity: str | None = None, request=None) -> "AuditLogEntry":
+    def build(cls, *, actor=None, action: str, metadata: dict | None = None, severity: str | None = None, request=None) -> "AuditLogEntry":
         entry = cls(
             actor=actor,
             action=action,
@@ -53,9 +62,27 @@ class AuditLogEntry(models.Model):
         if request:
             entry.ip_address = request.META.get("REMOTE_ADDR")
             entry.user_agent = request.META.get("HTTP_USER_AGENT", "")
-        entry.save()
         return entry
 
+    @classmethod
+    def record(cls, **kwargs) -> "AuditLogEntry | None":
+        """Write an audit entry; returns the saved entry in ``sync`` mode.
+
+        In the buffered ``on_commit`` and ``fire_and_forget`` modes the row is
+        inserted later, so there is no primary key to hand back and ``None``
+        is returned.
+        """
+        entry = cls.build(**kwargs)
+        return entry if audit_writer.write(entry) else None
+
+    @classmethod
+    def record_many(cls, entries: list["AuditLogEntry"]) -> list["AuditLogEntry"] | None:
+        """Record entries prepared with :meth:`build` in a single write.
+
+        Like :meth:`record`, returns ``None`` when the entries were buffered.
+        """
+        return entries if audit_writer.write_many(entries) else None
+
 
 class DataRetentionPolicy(models.Model):
     data_type = models.CharField(max_length=128, unique=True)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import AuditLogEntry, DataRetentionPolicy
+
+AUDIT_TABLE = AuditLogEntry._meta.db_table
+AUDIT_RETENTION_DATA_TYPE = "audit_log"
+DEFAULT_MONTHS_AHEAD = 3
+DEFAULT_CHUNK_SIZE = 5000
+_PARTITION_PATTERN = re.compile(rf"^{AUDIT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+@dataclass
+class AuditPurgeResult:
+    cutoff: datetime
+    partitions_dropped: list[str] = field(default_factory=list)
+    rows_deleted: int = 0
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [AUDIT_TABLE])
+        return cursor.fetchone() is not None
+
+
+def month_start(value: datetime) -> datetime:
+    return value.astimezone(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def list_partitions() -> list[tuple[str, datetime, datetime]]:
+    """Return ``(name, start, end)`` of the monthly audit partitions, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = %s::regclass",
+            [AUDIT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        match = _PARTITION_PATTERN.match(name)
+        if match:
+            start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=dt_timezone.utc)
+            partitions.append((name, start, add_months(start, 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_partitions(*, months_ahead: int = DEFAULT_MONTHS_AHEAD, now: datetime | None = None) -> list[str]:
+    """Create monthly partitions up to ``months_ahead`` months from now.
+
+    Rows that already landed in the default partition for a newly created
+    month are moved into it. Returns the names of the created partitions and
+    does nothing on backends without partitioning.
+    """
+    if not is_partitioned():
+        return []
+    existing = {name for name, _, _ in list_partitions()}
+    start = month_start(now or timezone.now())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(start, offset)
+        name = f"{AUDIT_TABLE}_p{month:%Y%m}"
+        if name not in existing:
+            _create_partition(name, month, add_months(month, 1))
+            created.append(name)
+    return created
+
+
+def purge_before(cutoff: datetime, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AuditPurgeResult:
+    """Remove audit entries older than ``cutoff``.
+
+    Monthly partitions lying entirely before the cutoff are dropped as a whole;
+    what remains (the partially expired month, the default partition or the
+    plain table on SQLite) is deleted in primary-key ranges of ``chunk_size``.
+    """
+    result = AuditPurgeResult(cutoff=cutoff)
+    if is_partitioned():
+        for name, _, end in list_partitions():
+            if end > cutoff:
+                break
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {name}")
+                cursor.execute(f"DROP TABLE {name}")
+            result.partitions_dropped.append(name)
+
+    expired = AuditLogEntry.objects.filter(created_at__lt=cutoff).order_by("id")
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            break
+        deleted, _ = AuditLogEntry.objects.filter(id__gte=ids[0], id__lte=ids[-1], created_at__lt=cutoff).delete()
+        result.rows_deleted += deleted
+    return result
+
+
+def apply_retention(*, now: datetime | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AuditPurgeResult | None:
+    """Purge entries older than the ``audit_log`` :class:`DataRetentionPolicy`, if one exists."""
+    policy = DataRetentionPolicy.objects.filter(data_type=AUDIT_RETENTION_DATA_TYPE).first()
+    if policy is None:
+        return None
+    cutoff = (now or timezone.now()) - timedelta(days=policy.retention_period_days)
+    return purge_before(cutoff, chunk_size=chunk_size)
+
+
+def _create_partition(name: str, start: datetime, end: datetime) -> None:
+    bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Creating the partition directly would fail if the default partition
+        # already holds rows for this month, so build it detached first.
+        cursor.execute(f"CREATE TABLE {name} (LIKE {AUDIT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {AUDIT_TABLE}_default WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved",
+            [start, end],
+        )
+        cursor.execute(f"ALTER TABLE {AUDIT_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}")
+
+
+__all__ = [
+    "AUDIT_RETENTION_DATA_TYPE",
+    "AuditPurgeResult",
+    "apply_retention",
+    "ensure_partitions",
+    "is_partitioned",
+    "list_partitions",
+    "purge_before",
+]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import FileField
+from django.utils import timezone
+
+from uknf_platform.storage import ContentAddressedStorage, collect_unreferenced_blobs
+
+from .models import AuditLogEntry, DataRetentionPolicy
+from .partitions import AUDIT_RETENTION_DATA_TYPE, purge_before
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class RetentionRule:
+    """How expired rows of one ``DataRetentionPolicy.data_type`` are removed.
+
+    Rows older than the policy are deleted, or – when ``clear_field`` is set –
+    only that file field is emptied. ``storage_path_field`` names a text column
+    holding a path in the default storage whose file goes with the row.
+    """
+
+    model: str
+    date_field: str = "created_at"
+    clear_field: str | None = None
+    storage_path_field: str | None = None
+
+
+RETENTION_RULES: dict[str, RetentionRule] = {
+    "reports": RetentionRule("communication.Report", storage_path_field="file_path"),
+    "message_attachments": RetentionRule("communication.Message", clear_field="attachment"),
+    "access_request_attachments": RetentionRule("accounts.AccessRequestAttachment"),
+    "access_request_history": RetentionRule("accounts.AccessRequestHistoryEntry"),
+    "contact_submissions": RetentionRule("accounts.ContactSubmission"),
+    "notification_events": RetentionRule("communication.NotificationEvent"),
+}
+
+
+@dataclass
+class RetentionResult:
+    data_type: str
+    cutoff: datetime
+    rows: int = 0
+    files: int = 0
+    bytes_reclaimed: int = 0
+    partitions_dropped: list[str] = field(default_factory=list)
+
+
+def supported_data_types() -> list[str]:
+    return sorted([AUDIT_RETENTION_DATA_TYPE, *RETENTION_RULES])
+
+
+def enforce_retention(
+    *,
+    data_types: list[str] | None = None,
+    now: datetime | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> list[RetentionResult]:
+    """Apply every :class:`DataRetentionPolicy` (or the selected ``data_types``).
+
+    Rows are removed in primary-key ranges of ``chunk_size``, each in its own
+    short transaction, so no lock is held for long. Files stored in the default
+    storage are deleted once their chunk commits; attachment blobs are shared
+    and are reclaimed by a blob collection pass at the end of the run.
+    """
+    now = now or timezone.now()
+    policies = DataRetentionPolicy.objects.order_by("data_type")
+    if data_types:
+        policies = policies.filter(data_type__in=data_types)
+
+    results = []
+    releases_blobs = False
+    for policy in policies:
+        cutoff = now - timedelta(days=policy.retention_period_days)
+        if policy.data_type == AUDIT_RETENTION_DATA_TYPE:
+            results.append(_enforce_audit_log(cutoff, chunk_size=chunk_size, dry_run=dry_run))
+            continue
+        rule = RETENTION_RULES.get(policy.data_type)
+        if rule is None:
+            logger.warning("Brak reguły retencji dla typu danych %s – pominięto.", policy.data_type)
+            continue
+        result = _enforce_rule(policy.data_type, rule, cutoff, chunk_size=chunk_size, dry_run=dry_run)
+        releases_blobs = releases_blobs or (result.rows > 0 and bool(_blob_fields(rule)))
+        results.append(result)
+
+    if releases_blobs and not dry_run:
+        collected = collect_unreferenced_blobs()
+        results.append(
+            RetentionResult(
+                data_type="attachment_blobs",
+                cutoff=now,
+                files=collected.removed,
+                bytes_reclaimed=collected.bytes_reclaimed,
+            )
+        )
+    return results
+
+
+def _enforce_rule(data_type: str, rule: RetentionRule, cutoff: datetime, *, chunk_size: int, dry_run: bool) -> RetentionResult:
+    model = apps.get_model(rule.model)
+    result = RetentionResult(data_type=data_type, cutoff=cutoff)
+    expired = model.objects.filter(**{f"{rule.date_field}__lt": cutoff})
+    if rule.clear_field:
+        expired = expired.exclude(**{rule.clear_field: ""}).exclude(**{f"{rule.clear_field}__isnull": True})
+
+    last_pk = None
+    while True:
+        remaining = expired if last_pk is None else expired.filter(pk__gt=last_pk)
+        ids = list(remaining.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            break
+        last_pk = ids[-1]
+        chunk = expired.filter(pk__gte=ids[0], pk__lte=ids[-1])
+        paths = list(chunk.values_list(rule.storage_path_field, flat=True)) if rule.storage_path_field else []
+        if dry_run:
+            result.rows += len(ids)
+        else:
+            with transaction.atomic():
+                if rule.clear_field:
+                    result.rows += chunk.update(**{rule.clear_field: ""})
+                else:
+                    result.rows += chunk.delete()[1].get(model._meta.label, 0)
+        files, reclaimed = _delete_storage_paths(paths, dry_run=dry_run)
+        result.files += files
+        result.bytes_reclaimed += reclaimed
+    return result
+
+
+def _enforce_audit_log(cutoff: datetime, *, chunk_size: int, dry_run: bool) -> RetentionResult:
+    if dry_run:
+        return RetentionResult(
+            data_type=AUDIT_RETENTION_DATA_TYPE,
+            cutoff=cutoff,
+            rows=AuditLogEntry.objects.filter(created_at__lt=cutoff).count(),
+        )
+    purged = purge_before(cutoff, chunk_size=chunk_size)
+    return RetentionResult(
+        data_type=AUDIT_RETENTION_DATA_TYPE,
+        cutoff=cutoff,
+        rows=purged.rows_deleted,
+        partitions_dropped=purged.partitions_dropped,
+    )
+
+
+def _delete_storage_paths(paths: list[str], *, dry_run: bool) -> tuple[int, int]:
+    paths = {path for path in paths if path}
+    if not paths:
+        return 0, 0
+    # Uploaded report workbooks are also published as library documents that
+    # point at the same file; those stay until the document is removed.
+    LibraryDocument = apps.get_model("communication", "LibraryDocument")
+    paths -= set(LibraryDocument.objects.filter(file__in=paths).values_list("file", flat=True))
+
+    files = reclaimed = 0
+    for path in paths:
+        if not default_storage.exists(path):
+            continue
+        size = default_storage.size(path)
+        if not dry_run:
+            default_storage.delete(path)
+        files += 1
+        reclaimed += size
+    return files, reclaimed
+
+
+def _blob_fields(rule: RetentionRule) -> list[FileField]:
+    model = apps.get_model(rule.model)
+    return [
+        model_field
+        for model_field in model._meta.get_fields()
+        if isinstance(model_field, FileField) and isinstance(model_field.storage, ContentAddressedStorage)
+    ]
+
+
+__all__ = ["RETENTION_RULES", "RetentionResult", "RetentionRule", "enforce_retention", "supported_data_types"]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from administration.models import AuditLogEntry
+
+
+class AuditLogExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(email="admin@test.com", password="testpass123", role=User.UserRole.SYSTEM_ADMIN)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        now = timezone.now()
+        AuditLogEntry.objects.all().delete()
+        AuditLogEntry.objects.bulk_create(
+            [
+                AuditLogEntry(action="report.uploaded", actor=self.admin, metadata={"report_id": 1}, created_at=now - timedelta(days=40)),
+                AuditLogEntry(action="report.uploaded", actor=self.admin, metadata={"report_id": 2, "opis": "zażółć"}, created_at=now - timedelta(days=2)),
+                AuditLogEntry(action="auth.login", metadata={}, created_at=now - timedelta(days=1)),
+            ]
+        )
+        self.since = (now - timedelta(days=10)).isoformat()
+
+    def _content(self, response) -> str:
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_csv_export_streams_filtered_rows(self):
+        response = self.client.get(
+            "/api/admin/audit-logs/export/",
+            {"action": "report.uploaded", "created_after": self.since, "actor": self.admin.pk},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(self._content(response).lstrip("\ufeff"))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["actor_email"], "admin@test.com")
+        self.assertEqual(json.loads(rows[0]["metadata"]), {"report_id": 2, "opis": "zażółć"})
+
+    def test_ndjson_export_and_unknown_format(self):
+        response = self.client.get("/api/admin/audit-logs/export/", {"output": "ndjson", "action_prefix": "auth."})
+
+        lines = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([line["action"] for line in lines], ["auth.login"])
+        self.assertIsNone(lines[0]["actor_email"])
+
+        self.assertEqual(self.client.get("/api/admin/audit-logs/export/", {"output": "xml"}).status_code, 400)
+        self.assertTrue(AuditLogEntry.objects.filter(action="audit_log.exported").exists())
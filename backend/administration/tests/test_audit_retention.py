@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from administration.models import AuditLogEntry, DataRetentionPolicy
+from administration.partitions import apply_retention, purge_before
+
+
+class AuditLogRetentionTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        AuditLogEntry.objects.all().delete()
+        AuditLogEntry.objects.bulk_create(
+            AuditLogEntry(action="test.entry", metadata={"age": days}, created_at=self.now - timedelta(days=days))
+            for days in range(0, 100, 3)
+        )
+
+    def test_purge_deletes_expired_rows_in_chunks(self):
+        result = purge_before(self.now - timedelta(days=30), chunk_size=4)
+
+        self.assertEqual(result.rows_deleted, 23)
+        self.assertEqual(AuditLogEntry.objects.count(), 11)
+        self.assertFalse(AuditLogEntry.objects.filter(created_at__lt=self.now - timedelta(days=30)).exists())
+
+    def test_retention_follows_policy(self):
+        self.assertIsNone(apply_retention(now=self.now))
+
+        DataRetentionPolicy.objects.create(data_type="audit_log", retention_period_days=60, description="Dziennik audytu")
+        call_command("maintain_audit_log", stdout=StringIO())
+
+        self.assertEqual(AuditLogEntry.objects.count(), 20)
+
+    def test_list_endpoint_uses_keyset_pagination(self):
+        admin = User.objects.create_user(email="admin@test.com", password="testpass123", role=User.UserRole.SYSTEM_ADMIN)
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        first = client.get("/api/admin/audit-logs/", {"page_size": 20, "action": "test.entry"}).json()
+        second = client.get(first["next"]).json()
+
+        self.assertEqual([entry["metadata"]["age"] for entry in first["results"]], list(range(0, 60, 3)))
+        self.assertEqual([entry["metadata"]["age"] for entry in second["results"]], list(range(60, 100, 3)))
+        self.assertIsNone(second["next"])
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from administration.audit import AuditLogWriter, audit_writer
+from administration.models import AuditLogEntry
+
+
+class AuditLogWriterTests(TestCase):
+    def setUp(self):
+        self.addCleanup(audit_writer.flush)
+
+    @override_settings(AUDIT_LOG_DURABILITY="on_commit", AUDIT_LOG_BUFFER_SIZE=3, AUDIT_LOG_FLUSH_INTERVAL=3600)
+    def test_on_commit_entries_are_batched_and_skip_rollbacks(self):
+        writer = AuditLogWriter()
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(2):
+                writer.write(AuditLogEntry(action="test.batched", metadata={"index": index}))
+        self.assertEqual(writer.stats()["queued"], 2)
+        self.assertFalse(AuditLogEntry.objects.filter(action="test.batched").exists())
+
+        with self.captureOnCommitCallbacks(execute=False):
+            writer.write(AuditLogEntry(action="test.rolled_back"))
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks(execute=True):
+            writer.write(AuditLogEntry(action="test.batched", metadata={"index": 2}))
+
+        stats = writer.stats()
+        self.assertEqual((stats["queued"], stats["flushed_total"], stats["flushes"]), (0, 3, 1))
+        self.assertEqual(AuditLogEntry.objects.filter(action="test.batched").count(), 3)
+        self.assertFalse(AuditLogEntry.objects.filter(action="test.rolled_back").exists())
+
+    @override_settings(AUDIT_LOG_DURABILITY="on_commit", AUDIT_LOG_BUFFER_SIZE=100, AUDIT_LOG_FLUSH_INTERVAL=3600)
+    def test_request_end_flushes_buffered_entries(self):
+        user = User.objects.create_user(email="admin@test.com", password="testpass123", role=User.UserRole.SYSTEM_ADMIN)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                "/api/admin/maintenance/",
+                {"title": "Przerwa", "start_time": "2025-01-01T10:00:00Z", "end_time": "2025-01-01T12:00:00Z"},
+                format="json",
+            )
+        # The on_commit callback runs after the response; flush as the next request would.
+        audit_writer.flush_if_pending()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(AuditLogEntry.objects.filter(action="maintenance_window.created").exists())
+
+        stats = client.get("/api/admin/audit-logs/queue/").json()
+        self.assertEqual(stats["durability"], "on_commit")
+        self.assertIn("flushed_total", stats)
+
+    @override_settings(
+        AUDIT_LOG_DURABILITY="on_commit", AUDIT_LOG_BUFFER_SIZE=1, AUDIT_LOG_MAX_QUEUE=2, AUDIT_LOG_FLUSH_INTERVAL=3600
+    )
+    def test_failed_flushes_keep_a_bounded_queue(self):
+        writer = AuditLogWriter()
+        outage = mock.patch.object(AuditLogEntry.objects, "bulk_create", side_effect=DatabaseError("niedostępna"))
+        with outage, self.assertLogs("administration.audit", "ERROR"), self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                writer.write(AuditLogEntry(action="test.outage"))
+
+        stats = writer.stats()
+        self.assertEqual((stats["queued"], stats["dropped_total"], stats["failed_flushes"]), (2, 1, 3))
+        self.assertEqual(writer.flush(), 2)
+
+    def test_write_many_inserts_in_one_statement(self):
+        writer = AuditLogWriter()
+        entries = [AuditLogEntry.build(action="test.many", metadata={"index": index}) for index in range(5)]
+
+        with self.assertNumQueries(1):
+            writer.write_many(entries)
+
+        self.assertEqual(AuditLogEntry.objects.filter(action="test.many").count(), 5)
+
+    def test_record_returns_the_entry_only_once_it_is_saved(self):
+        saved = AuditLogEntry.record(action="test.sync")
+        self.assertIsNotNone(saved.pk)
+
+        with override_settings(AUDIT_LOG_DURABILITY="on_commit"), self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(AuditLogEntry.record(action="test.buffered"))
+            self.assertIsNone(AuditLogEntry.record_many([AuditLogEntry.build(action="test.buffered")]))
+        audit_writer.flush()
+        self.assertEqual(AuditLogEntry.objects.filter(action="test.buffered").count(), 2)
+
+    def test_only_the_shared_writer_flushes_at_exit(self):
+        with mock.patch("administration.audit.atexit.register") as register:
+            AuditLogWriter()
+        register.assert_not_called()
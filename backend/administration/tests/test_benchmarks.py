@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import AccessRequestLine, RegulatedEntity, User
+from administration.benchmarks import BenchmarkScale, build_cases, build_report, compare_reports, purge_dataset, run_benchmarks, seed_dataset
+from communication.models import Message, MessageThread
+
+
+TINY_SCALE = BenchmarkScale(
+    entities=2,
+    users_per_entity=2,
+    threads=3,
+    messages_per_thread=2,
+    reports=4,
+    access_requests=2,
+    library_documents=3,
+    embedding_dimensions=8,
+    audit_entries=10,
+)
+
+
+class BenchmarkHarnessTests(TestCase):
+    def test_seed_run_and_purge(self):
+        dataset = seed_dataset(TINY_SCALE)
+
+        self.assertEqual(dataset.rows["messages"], 6)
+        self.assertEqual(dataset.rows["access_request_messages"], 4)
+        self.assertEqual(dataset.rows["access_request_history"], 2)
+        self.assertTrue(2 <= dataset.rows["access_request_lines"] <= 4)
+        self.assertGreaterEqual(dataset.rows["access_request_permissions"], dataset.rows["access_request_lines"])
+        self.assertEqual(MessageThread.objects.get(pk=dataset.thread_id).participants.count(), 2)
+        results = run_benchmarks(build_cases(dataset), iterations=2, warmup=0)
+
+        self.assertIn("threads.list.internal", results)
+        self.assertIn("access_requests.list.entity", results)
+        self.assertIn("workbook.validate.Q1_2025", results)
+        for name, result in results.items():
+            self.assertEqual(result.get("status", 200), 200, name)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertEqual(results["workbook.validate.Q1_2025"]["queries"], 0)
+
+        report = build_report(results, scale=TINY_SCALE, dataset=dataset, iterations=2)
+        self.assertEqual(len(compare_reports(report, report)), len(results))
+
+        purge_dataset()
+        self.assertFalse(RegulatedEntity.objects.filter(registration_number__startswith="BENCH").exists())
+        self.assertFalse(User.objects.filter(email__endswith="@benchmark.invalid").exists())
+        self.assertFalse(Message.objects.filter(thread_id=dataset.thread_id).exists())
+        self.assertFalse(AccessRequestLine.objects.exists())
+
+    def test_command_writes_json_and_cleans_up(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "wyniki.json"
+            call_command("run_benchmarks", scale=0.02, iterations=1, warmup=0, only=["library."], output=str(output), stderr=StringIO())
+            report = json.loads(output.read_text(encoding="utf-8"))
+
+        self.assertEqual(set(report["results"]), {"library.search", "library.select_relevant_documents"})
+        self.assertEqual(report["seed"]["rows"]["entities"], 1)
+        self.assertFalse(User.objects.filter(email__endswith="@benchmark.invalid").exists())
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from django.test import TestCase, override_settings
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from communication.models import MessageThread
+from uknf_platform.profiling import fingerprint_sql, metrics_registry
+
+
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        metrics_registry.reset()
+        self.addCleanup(metrics_registry.reset)
+        self.staff = User.objects.create_user(email="staff@test.com", password="testpass123", role=User.UserRole.SUPERVISOR)
+        self.external = User.objects.create_user(email="ext@test.com", password="testpass123")
+        self.client = APIClient()
+
+    def test_fingerprint_collapses_literals(self):
+        self.assertEqual(
+            fingerprint_sql("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'Jan''s'   AND x = %s"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? AND x = %s",
+        )
+
+    @override_settings(REQUEST_PROFILING_ENABLED=True)
+    def test_profiled_request_sets_server_timing_and_feeds_metrics(self):
+        self.client.force_authenticate(user=self.staff)
+
+        response = self.client.get("/api/communication/messages/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        body = self.client.get("/api/metrics").content.decode()
+        self.assertIn('uknf_http_requests_total{method="GET",route="api/communication/messages/",status="200"} 1', body)
+        self.assertIn("uknf_db_queries_total", body)
+        self.assertIn("uknf_audit_log_queue_depth", body)
+
+    @override_settings(REQUEST_PROFILING_ENABLED=True)
+    def test_serializer_time_comes_from_opted_in_serializers(self):
+        data_property = BaseSerializer.__dict__["data"]
+        MessageThread.objects.create(subject="Profilowanie", created_by=self.staff).participants.add(self.staff)
+        self.client.force_authenticate(user=self.staff)
+
+        self.client.get("/api/communication/messages/")
+
+        self.assertIs(BaseSerializer.__dict__["data"], data_property)
+        body = self.client.get("/api/metrics").content.decode()
+        line = next(line for line in body.splitlines() if line.startswith('uknf_serializer_seconds_total{method="GET",route="api/communication/messages/"'))
+        self.assertGreater(float(line.rsplit(" ", 1)[1]), 0)
+
+    def test_profiling_is_off_by_default(self):
+        self.client.force_authenticate(user=self.staff)
+
+        response = self.client.get("/api/communication/messages/")
+
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_metrics_access(self):
+        self.assertIn(self.client.get("/api/metrics").status_code, (401, 403))
+        self.client.force_authenticate(user=self.external)
+        self.assertEqual(self.client.get("/api/metrics").status_code, 403)
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret").status_code, 200)
+        self.assertIn(self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, (401, 403))
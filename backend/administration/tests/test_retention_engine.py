@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import ContactSubmission, RegulatedEntity, User
+from administration.models import DataRetentionPolicy
+from administration.retention import enforce_retention
+from communication.models import Message, MessageThread, Report
+from uknf_platform.storage import attachment_storage
+
+
+class RetentionEngineTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.old = timezone.now() - timedelta(days=400)
+        self.entity = RegulatedEntity.objects.create(
+            name="Bank Testowy",
+            registration_number="RIP0000001",
+            sector="Bank",
+            address="ul. Prosta 1",
+            postal_code="00-001",
+            city="Warszawa",
+            contact_email="bank@test.com",
+            contact_phone="48111222333",
+        )
+
+    def _report(self, title: str, payload: bytes) -> Report:
+        path = default_storage.save(f"reports/{title}.xlsx", ContentFile(payload))
+        return Report.objects.create(
+            entity=self.entity,
+            title=title,
+            report_type="F01",
+            period_start=date(2024, 1, 1),
+            period_end=date(2024, 3, 31),
+            file_path=path,
+        )
+
+    def test_expired_rows_and_files_are_removed_in_chunks(self):
+        expired = [self._report(f"stare-{index}", b"x" * 100) for index in range(3)]
+        current = self._report("biezace", b"y" * 100)
+        Report.objects.filter(pk__in=[report.pk for report in expired]).update(created_at=self.old)
+        for index in range(5):
+            ContactSubmission.objects.create(sender_name="Jan", sender_email="jan@test.com", subject=str(index), message="-")
+        ContactSubmission.objects.filter(subject__in=["0", "1"]).update(created_at=self.old)
+        DataRetentionPolicy.objects.create(data_type="reports", retention_period_days=365, description="Sprawozdania")
+        DataRetentionPolicy.objects.create(data_type="contact_submissions", retention_period_days=30, description="Kontakt")
+
+        dry_run = {result.data_type: result for result in enforce_retention(chunk_size=2, dry_run=True)}
+        self.assertEqual((dry_run["reports"].rows, dry_run["reports"].bytes_reclaimed), (3, 300))
+        self.assertEqual(Report.objects.count(), 4)
+
+        results = {result.data_type: result for result in enforce_retention(chunk_size=2)}
+
+        self.assertEqual((results["reports"].rows, results["reports"].files, results["reports"].bytes_reclaimed), (3, 3, 300))
+        self.assertEqual(results["contact_submissions"].rows, 2)
+        self.assertEqual(list(Report.objects.values_list("pk", flat=True)), [current.pk])
+        self.assertEqual(ContactSubmission.objects.count(), 3)
+        self.assertFalse(any(default_storage.exists(report.file_path) for report in expired))
+        self.assertTrue(default_storage.exists(current.file_path))
+
+    def test_expired_message_attachments_are_detached_and_collected(self):
+        user = User.objects.create_user(email="sender@test.com", password="testpass123")
+        thread = MessageThread.objects.create(subject="Załączniki", created_by=user)
+        message = thread.add_message(sender=user, content="treść", attachment=ContentFile(b"z" * 64, name="pismo.pdf"))
+        blob_name = message.attachment.name
+        Message.objects.filter(pk=message.pk).update(created_at=self.old)
+        DataRetentionPolicy.objects.create(data_type="message_attachments", retention_period_days=90, description="Załączniki")
+
+        # Blobs younger than the collector's grace period are never removed.
+        stale = self.old.timestamp()
+        os.utime(attachment_storage().path(blob_name), (stale, stale))
+
+        results = {result.data_type: result for result in enforce_retention()}
+
+        message.refresh_from_db()
+        self.assertEqual(results["message_attachments"].rows, 1)
+        self.assertFalse(message.attachment)
+        self.assertEqual(message.body, "treść")
+        self.assertEqual(results["attachment_blobs"].files, 1)
+        self.assertFalse(attachment_storage().exists(blob_name))
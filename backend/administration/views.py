@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.permissions import IsInternalUser
+from .audit import audit_writer
+from .exports import EXPORT_FORMATS, stream_audit_log
+from .filters import AuditLogFilter
 from .models import AuditLogEntry, DataRetentionPolicy, MaintenanceWindow, PasswordPolicy
 from .serializers import (
     AuditLogSerializer,
@@ -31,12 +36,44 @@ class PasswordPolicyView(APIView):
         return Response(serializer.data)
 
 
+class AuditLogPagination(CursorPagination):
+    # Keyset pagination over the (created_at, id) index: every page is an
+    # index range scan, no matter how deep the client has paged.
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
 class AuditLogViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     queryset = AuditLogEntry.objects.select_related("actor").all()
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated, IsInternalUser]
-    filterset_fields = ["severity", "actor"]
-    ordering = ["-created_at"]
+    pagination_class = AuditLogPagination
+    filterset_class = AuditLogFilter
+    ordering_fields = ["created_at"]
+    ordering = ["-created_at", "-id"]
+
+    @action(detail=False, methods=["get"])
+    def queue(self, request, *args, **kwargs):
+        return Response({"durability": audit_writer.durability, **audit_writer.stats()})
+
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        output = request.query_params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"Nieobsługiwany format eksportu: {output}. Dostępne: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        AuditLogEntry.record(
+            actor=request.user,
+            action="audit_log.exported",
+            metadata={"format": output, "filters": {key: value for key, value in request.query_params.items()}},
+            request=request,
+        )
+        return stream_audit_log(queryset, output)
 
 
 class DataRetentionPolicyViewSet(viewsets.ModelViewSet):
@@ -11,6 +11,8 @@ from .models import (
     LibraryDocument,
     Message,
     MessageThread,
+    NotificationEvent,
+    OutboundEmail,
     Report,
     ReportTimelineEntry,
 )
@@ -93,3 +95,17 @@ class ReportTimelineEntryAdmin(admin.ModelAdmin):
 @admin.register(CaseTimelineEntry)
 class CaseTimelineEntryAdmin(admin.ModelAdmin):
     list_display = ("case", "status", "created_at", "created_by")
+
+
+@admin.register(NotificationEvent)
+class NotificationEventAdmin(admin.ModelAdmin):
+    list_display = ("user", "kind", "title", "created_at", "read_at")
+    list_filter = ("kind",)
+    raw_id_fields = ("user",)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "to")
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import DigestCursor, NotificationEvent
+
+DEFAULT_BATCH_SIZE = 500
+MAX_ITEMS_PER_KIND = 20
+
+DIGEST_SUBJECTS = {
+    DigestCursor.Frequency.DAILY: "Dzienne podsumowanie powiadomień – Platforma Komunikacyjna UKNF",
+    DigestCursor.Frequency.WEEKLY: "Tygodniowe podsumowanie powiadomień – Platforma Komunikacyjna UKNF",
+}
+
+
+@dataclass
+class DigestRunResult:
+    users: int = 0
+    emails_sent: int = 0
+    events: int = 0
+
+
+def send_digests(
+    frequency: str,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    connection=None,
+) -> DigestRunResult:
+    """Send digests of new notification events to users subscribed to ``frequency``.
+
+    Only users with events after their :class:`DigestCursor` are visited.
+    Users are processed in primary-key batches: one query for the batch, one
+    for its events, one send per digest over a connection kept open for the
+    whole run and one upsert moving the cursors forward. If sending fails
+    part-way, the cursors of the digests already delivered are still saved,
+    so the next run does not send them again.
+    """
+    result = DigestRunResult()
+    high_water_mark = NotificationEvent.objects.aggregate(last=Max("id"))["last"]
+    if high_water_mark is None:
+        return result
+
+    users = _subscribed_users(frequency, high_water_mark)
+    connection = connection or get_connection(fail_silently=False)
+    if not dry_run:
+        connection.open()
+    try:
+        last_user_id = 0
+        while True:
+            batch = list(users.filter(pk__gt=last_user_id).order_by("pk").values_list("pk", "email")[:batch_size])
+            if not batch:
+                break
+            last_user_id = batch[-1][0]
+            events = _pending_events([user_id for user_id, _ in batch], frequency, high_water_mark)
+
+            emails, cursors = [], []
+            now = timezone.now()
+            for user_id, email in batch:
+                user_events = events.get(user_id)
+                if not user_events:
+                    continue
+                emails.append(_render_digest(frequency, email, user_events))
+                cursors.append(
+                    DigestCursor(user_id=user_id, frequency=frequency, last_event_id=user_events[-1][0], sent_at=now)
+                )
+                result.users += 1
+                result.events += len(user_events)
+
+            if dry_run or not emails:
+                continue
+            delivered: list[DigestCursor] = []
+            try:
+                for message, cursor in zip(emails, cursors):
+                    if connection.send_messages([message]):
+                        delivered.append(cursor)
+            finally:
+                result.emails_sent += len(delivered)
+                _advance_cursors(delivered)
+    finally:
+        if not dry_run:
+            connection.close()
+    return result
+
+
+def _advance_cursors(cursors: list[DigestCursor]) -> None:
+    if cursors:
+        DigestCursor.objects.bulk_create(
+            cursors,
+            update_conflicts=True,
+            unique_fields=["user", "frequency"],
+            update_fields=["last_event_id", "sent_at"],
+        )
+
+
+def _subscribed_users(frequency: str, high_water_mark: int):
+    if frequency == DigestCursor.Frequency.DAILY:
+        # Users who never saved their preferences get the model defaults:
+        # e-mail notifications with a daily digest.
+        subscribed = Q(notification_preferences__isnull=True) | Q(
+            notification_preferences__daily_digest=True, notification_preferences__notify_via_email=True
+        )
+    else:
+        subscribed = Q(notification_preferences__weekly_digest=True, notification_preferences__notify_via_email=True)
+    return (
+        get_user_model()
+        .objects.filter(subscribed, is_active=True)
+        .exclude(email="")
+        .filter(Exists(_events_after_cursor(frequency, high_water_mark).filter(user_id=OuterRef("pk"))))
+    )
+
+
+def _events_after_cursor(frequency: str, high_water_mark: int):
+    cursor = DigestCursor.objects.filter(user_id=OuterRef("user_id"), frequency=frequency).values("last_event_id")[:1]
+    return NotificationEvent.objects.filter(id__lte=high_water_mark, id__gt=Coalesce(Subquery(cursor), Value(0)))
+
+
+def _pending_events(user_ids: list[int], frequency: str, high_water_mark: int) -> dict[int, list[tuple]]:
+    rows = (
+        _events_after_cursor(frequency, high_water_mark)
+        .filter(user_id__in=user_ids)
+        .order_by("user_id", "id")
+        .values_list("user_id", "id", "kind", "title", "created_at")
+    )
+    events: dict[int, list[tuple]] = defaultdict(list)
+    for user_id, *event in rows:
+        events[user_id].append(tuple(event))
+    return events
+
+
+def _render_digest(frequency: str, email: str, events: list[tuple]) -> EmailMessage:
+    by_kind: dict[str, list[tuple[str, datetime]]] = defaultdict(list)
+    for _, kind, title, created_at in events:
+        by_kind[kind].append((title, created_at))
+
+    lines = [
+        "Dzień dobry,",
+        "",
+        f"od ostatniego podsumowania w Platformie Komunikacyjnej UKNF pojawiło się {len(events)} nowych powiadomień.",
+    ]
+    for kind, label in NotificationEvent.EventKind.choices:
+        items = by_kind.get(kind)
+        if not items:
+            continue
+        lines.extend(["", f"{label} ({len(items)}):"])
+        for title, created_at in items[:MAX_ITEMS_PER_KIND]:
+            lines.append(f" - {timezone.localtime(created_at):%d.%m.%Y %H:%M} {title}")
+        if len(items) > MAX_ITEMS_PER_KIND:
+            lines.append(f" … oraz {len(items) - MAX_ITEMS_PER_KIND} kolejnych.")
+    lines.extend(
+        [
+            "",
+            f"Szczegóły znajdziesz w platformie: {settings.FRONTEND_BASE_URL}",
+            "",
+            "Zmiana częstotliwości podsumowań jest możliwa w ustawieniach powiadomień.",
+        ]
+    )
+    return EmailMessage(DIGEST_SUBJECTS[frequency], "\n".join(lines), settings.DEFAULT_FROM_EMAIL, [email])
+
+
+__all__ = ["DigestRunResult", "send_digests"]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from uknf_platform.exports import ExportSpec
+
+REPORT_EXPORT = ExportSpec(
+    name="reports",
+    audit_action="report.exported",
+    columns={
+        "id": "id",
+        "entity_id": "entity_id",
+        "entity_name": "entity__name",
+        "entity_registration_number": "entity__registration_number",
+        "title": "title",
+        "report_type": "report_type",
+        "period_start": "period_start",
+        "period_end": "period_end",
+        "status": "status",
+        "submitted_by_email": "submitted_by__email",
+        "submitted_at": "submitted_at",
+        "validated_at": "validated_at",
+        "validation_errors": "validation_errors",
+        "comments": "comments",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+)
+
+
+__all__ = ["REPORT_EXPORT"]
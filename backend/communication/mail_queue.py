@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+ENQUEUE_BATCH_SIZE = 500
+
+
+@dataclass
+class DeliveryResult:
+    sent: int = 0
+    retried: int = 0
+    dead: int = 0
+
+
+def enqueue_emails(messages: Iterable[EmailMessage]) -> int:
+    """Store ``messages`` in the outbound queue; returns how many were queued.
+
+    Rows are written in the caller's transaction, so the worker only sees
+    them once it commits and messages of rolled back work are never sent.
+    """
+    rows = [_to_row(message) for message in messages]
+    OutboundEmail.objects.bulk_create(rows, batch_size=ENQUEUE_BATCH_SIZE)
+    return len(rows)
+
+
+def enqueue_email(message: EmailMessage) -> None:
+    enqueue_emails([message])
+
+
+def deliver_queued_emails(*, batch_size: int | None = None, limit: int | None = None, connection=None) -> DeliveryResult:
+    """Send due messages from the queue over a single mail connection.
+
+    Messages are claimed in batches of ``batch_size``: the claim pushes
+    ``next_attempt_at`` forward by ``EMAIL_QUEUE_LEASE_SECONDS`` so parallel
+    workers skip them and a crashed worker's batch is picked up again later.
+    A failed message is retried with exponential backoff and moved to the
+    ``dead`` state after ``EMAIL_QUEUE_MAX_ATTEMPTS`` attempts. A connection
+    passed in by the caller is opened if needed and left open for reuse.
+    """
+    batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+    owns_connection = connection is None
+    connection = connection or get_connection(settings.EMAIL_QUEUE_BACKEND or None, fail_silently=False)
+    result = DeliveryResult()
+    try:
+        while limit is None or result.sent + result.retried + result.dead < limit:
+            size = batch_size if limit is None else min(batch_size, limit - result.sent - result.retried - result.dead)
+            batch = _claim(size)
+            if not batch:
+                break
+            _deliver_batch(batch, connection, result)
+    finally:
+        if owns_connection:
+            connection.close()
+    return result
+
+
+def requeue_dead_emails() -> int:
+    """Give dead-lettered messages a fresh set of attempts."""
+    return OutboundEmail.objects.filter(status=OutboundEmail.Status.DEAD).update(
+        status=OutboundEmail.Status.PENDING, attempts=0, next_attempt_at=timezone.now()
+    )
+
+
+def purge_sent_emails(older_than: timedelta) -> int:
+    deleted, _ = OutboundEmail.objects.filter(
+        status=OutboundEmail.Status.SENT, sent_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = settings.EMAIL_QUEUE_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.EMAIL_QUEUE_RETRY_MAX_SECONDS))
+
+
+def _to_row(message: EmailMessage) -> OutboundEmail:
+    if message.attachments or getattr(message, "alternatives", None):
+        raise ValueError("Kolejka wiadomości obsługuje wyłącznie wiadomości tekstowe bez załączników.")
+    return OutboundEmail(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(message.to),
+        cc=list(message.cc),
+        bcc=list(message.bcc),
+        reply_to=list(message.reply_to),
+        headers=dict(message.extra_headers),
+    )
+
+
+def _to_message(row: OutboundEmail) -> EmailMessage:
+    return EmailMessage(
+        row.subject,
+        row.body,
+        row.from_email,
+        row.to,
+        bcc=row.bcc,
+        cc=row.cc,
+        reply_to=row.reply_to,
+        headers=row.headers,
+    )
+
+
+def _claim(size: int) -> list[OutboundEmail]:
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")
+            .values_list("pk", flat=True)[:size]
+        )
+        if not ids:
+            return []
+        OutboundEmail.objects.filter(pk__in=ids).update(
+            attempts=F("attempts") + 1,
+            next_attempt_at=now + timedelta(seconds=settings.EMAIL_QUEUE_LEASE_SECONDS),
+        )
+    return list(OutboundEmail.objects.filter(pk__in=ids).order_by("id"))
+
+
+def _deliver_batch(batch: list[OutboundEmail], connection, result: DeliveryResult) -> None:
+    sent_ids: list[int] = []
+    failed: list[OutboundEmail] = []
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.warning("Nie udało się połączyć z serwerem poczty: %s", exc)
+        failed = batch
+        for row in batch:
+            row.last_error = _describe(exc)
+    else:
+        for row in batch:
+            # One message per call keeps the accounting exact; the connection
+            # stays open, so this costs the same as a single send_messages().
+            try:
+                connection.send_messages([_to_message(row)])
+            except Exception as exc:
+                row.last_error = _describe(exc)
+                failed.append(row)
+                _reconnect(connection)
+            else:
+                sent_ids.append(row.pk)
+
+    now = timezone.now()
+    if sent_ids:
+        OutboundEmail.objects.filter(pk__in=sent_ids).update(
+            status=OutboundEmail.Status.SENT, sent_at=now, last_error=""
+        )
+        result.sent += len(sent_ids)
+    for row in failed:
+        if row.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            row.status = OutboundEmail.Status.DEAD
+            result.dead += 1
+            logger.error("Wiadomość %s do %s trafiła do kolejki niedoręczalnych: %s", row.pk, row.to, row.last_error)
+        else:
+            row.next_attempt_at = now + retry_delay(row.attempts)
+            result.retried += 1
+    if failed:
+        OutboundEmail.objects.bulk_update(failed, ["status", "next_attempt_at", "last_error"])
+
+
+def _describe(exc: Exception) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _reconnect(connection) -> None:
+    # A failure may leave the SMTP session unusable; start the next message on a fresh one.
+    try:
+        connection.close()
+        connection.open()
+    except Exception:  # pragma: no cover - the next send reports the error
+        pass
+
+
+__all__ = [
+    "DeliveryResult",
+    "deliver_queued_emails",
+    "enqueue_email",
+    "enqueue_emails",
+    "purge_sent_emails",
+    "requeue_dead_emails",
+    "retry_delay",
+]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from communication.workbook_benchmark import (
+    DEFAULT_ROW_COUNTS,
+    DEFAULT_TEMPLATE_NAME,
+    PROFILERS,
+    run_workbook_benchmark,
+)
+
+
+def _row_counts(value: str) -> tuple[int, ...]:
+    try:
+        counts = tuple(int(part) for part in value.split(",") if part.strip())
+    except ValueError as exc:
+        raise CommandError("--rows oczekuje listy liczb rozdzielonych przecinkami.") from exc
+    if not counts or any(count < 0 for count in counts):
+        raise CommandError("--rows oczekuje listy nieujemnych liczb.")
+    return counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Mierzy czas, szczytowe zużycie pamięci i rozkład na fazy walidacji sprawozdań "
+        "dla syntetycznych skoroszytów o rosnącym rozmiarze."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--template",
+            default=str(Path(settings.BASE_DIR).parent / "data" / DEFAULT_TEMPLATE_NAME),
+            help="Skoroszyt XLSX, na podstawie którego powstają pliki testowe.",
+        )
+        parser.add_argument(
+            "--rows",
+            default=",".join(str(count) for count in DEFAULT_ROW_COUNTS),
+            help="Liczby wierszy dopisywanych do każdego rozszerzanego arkusza, rozdzielone przecinkami.",
+        )
+        parser.add_argument("--columns", type=int, default=12, help="Liczba kolumn w dopisywanych wierszach.")
+        parser.add_argument("--sheets", type=int, default=3, help="Liczba rozszerzanych arkuszy.")
+        parser.add_argument("--repeat", type=int, default=3, help="Liczba mierzonych walidacji każdego pliku.")
+        parser.add_argument("--profile", choices=PROFILERS, help="Zapisz profil wykonania dla każdego rozmiaru.")
+        parser.add_argument(
+            "--work-dir",
+            help="Katalog na wygenerowane skoroszyty i profile (domyślnie katalog tymczasowy usuwany po zakończeniu).",
+        )
+        parser.add_argument("--output", help="Ścieżka pliku JSON z wynikami (domyślnie standardowe wyjście).")
+
+    def handle(self, *args, **options):
+        template = Path(options["template"])
+        if not template.is_file() or template.suffix.lower() != ".xlsx":
+            raise CommandError(f"Nie znaleziono szablonu XLSX: {template}")
+        if options["repeat"] < 1:
+            raise CommandError("--repeat musi być dodatnie.")
+        row_counts = _row_counts(options["rows"])
+
+        if options["work_dir"]:
+            measurements = self._run(template, Path(options["work_dir"]), row_counts, options)
+        else:
+            with tempfile.TemporaryDirectory(prefix="uknf-workbook-bench-") as directory:
+                measurements = self._run(template, Path(directory), row_counts, options)
+
+        report = {
+            "template": template.name,
+            "columns": options["columns"],
+            "sheets": options["sheets"],
+            "repeat": options["repeat"],
+            "results": [measurement.to_dict() for measurement in measurements],
+        }
+        payload = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            Path(options["output"]).write_text(payload + "\n", encoding="utf-8")
+        else:
+            self.stdout.write(payload)
+        for measurement in measurements:
+            summary = measurement.to_dict()
+            self.stderr.write(
+                f"{summary['padded_rows']:>8} wierszy, {summary['cells']:>8} komórek, {summary['file_bytes'] // 1024:>6} KiB: "
+                f"{summary['median_ms']:.1f} ms, szczyt pamięci {summary['peak_memory_bytes'] / 2**20:.1f} MiB, "
+                f"fazy {summary['phases_ms']}"
+            )
+
+    def _run(self, template: Path, work_dir: Path, row_counts: tuple[int, ...], options):
+        try:
+            return run_workbook_benchmark(
+                template,
+                work_dir,
+                row_counts=row_counts,
+                columns=options["columns"],
+                sheets=options["sheets"],
+                repeat=options["repeat"],
+                profiler=options["profile"],
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
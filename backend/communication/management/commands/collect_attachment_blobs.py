@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from uknf_platform.storage import DEFAULT_GRACE_PERIOD, collect_unreferenced_blobs
+
+
+class Command(BaseCommand):
+    help = "Usuwa z magazynu załączników pliki, do których nie odwołuje się żaden rekord."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=int(DEFAULT_GRACE_PERIOD.total_seconds() // 60),
+            help="Pomiń pliki młodsze niż podana liczba minut.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Tylko raportuj, nie usuwaj plików.")
+
+    def handle(self, *args, **options):
+        result = collect_unreferenced_blobs(
+            grace_period=timedelta(minutes=options["grace_minutes"]),
+            dry_run=options["dry_run"],
+        )
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}Przeskanowano {result.scanned} plików, usunięto {result.removed} "
+                f"({result.bytes_reclaimed} B)."
+            )
+        )
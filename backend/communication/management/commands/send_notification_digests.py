@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from communication.digests import DEFAULT_BATCH_SIZE, send_digests
+from communication.models import DigestCursor
+
+
+class Command(BaseCommand):
+    help = "Wysyła dzienne lub tygodniowe podsumowania powiadomień do subskrybentów."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--frequency",
+            choices=DigestCursor.Frequency.values,
+            default=DigestCursor.Frequency.DAILY,
+            help="Rodzaj podsumowania.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Liczba użytkowników obsługiwanych w jednej partii wysyłki.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Tylko raportuj, nie wysyłaj wiadomości.")
+
+    def handle(self, *args, **options):
+        result = send_digests(
+            options["frequency"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}Podsumowania dla {result.users} użytkowników ({result.events} powiadomień), "
+                f"wysłano {result.emails_sent} wiadomości."
+            )
+        )
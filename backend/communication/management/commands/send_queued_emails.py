@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from communication.mail_queue import DeliveryResult, deliver_queued_emails, purge_sent_emails, requeue_dead_emails
+
+
+class Command(BaseCommand):
+    help = "Wysyła wiadomości e-mail z kolejki wychodzącej (z ponowieniami i kolejką niedoręczalnych)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_QUEUE_BATCH_SIZE,
+            help="Liczba wiadomości pobieranych z kolejki w jednej partii.",
+        )
+        parser.add_argument("--limit", type=int, help="Zakończ po obsłużeniu tylu wiadomości.")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Działaj jako proces roboczy i sprawdzaj kolejkę co --interval sekund.",
+        )
+        parser.add_argument("--interval", type=float, default=5.0)
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="Przywróć do wysyłki wiadomości oznaczone jako niedoręczalne.",
+        )
+        parser.add_argument("--purge-sent-days", type=int, help="Usuń wysłane wiadomości starsze niż N dni.")
+
+    def handle(self, *args, **options):
+        if options["requeue_dead"]:
+            self.stdout.write(f"Przywrócono do wysyłki {requeue_dead_emails()} wiadomości.")
+        if options["purge_sent_days"] is not None:
+            purged = purge_sent_emails(timedelta(days=options["purge_sent_days"]))
+            self.stdout.write(f"Usunięto {purged} wysłanych wiadomości.")
+
+        # The worker keeps one mail connection open while there is work and
+        # closes it when the queue runs dry, so idle servers do not drop it.
+        connection = get_connection(settings.EMAIL_QUEUE_BACKEND or None, fail_silently=False)
+        try:
+            while True:
+                result = deliver_queued_emails(
+                    batch_size=options["batch_size"], limit=options["limit"], connection=connection
+                )
+                if result.sent or result.retried or result.dead or not options["loop"]:
+                    self._report(result)
+                if not options["loop"]:
+                    return
+                if not (result.sent or result.retried or result.dead):
+                    connection.close()
+                close_old_connections()
+                time.sleep(options["interval"])
+        finally:
+            connection.close()
+
+    def _report(self, result: DeliveryResult) -> None:
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wysłano {result.sent} wiadomości, do ponowienia {result.retried}, niedoręczalne {result.dead}."
+            )
+        )
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from django.db import transaction
+from django.utils import timezone
+
+from administration.models import AuditLogEntry
+from uknf_platform.storage import remember_original_name
+
+from .models import Message, MessageThread
+from .notifications import notify_messages
+
+
+@dataclass
+class OutgoingMessage:
+    """A single message queued for :func:`post_messages`."""
+
+    thread: MessageThread
+    body: str
+    sender: Any = None
+    recipient: Any = None
+    attachment: Any = None
+    is_internal_note: bool = False
+
+
+def post_message(
+    thread: MessageThread,
+    *,
+    sender,
+    content: str,
+    attachment=None,
+    is_internal_note: bool = False,
+    recipient=None,
+    audit_action: str = "thread.message",
+    request=None,
+) -> Message:
+    """Store a message, register participants and write the audit entry atomically.
+
+    Issues a fixed number of statements: the message insert, one participant
+    insert that skips existing links, the thread ``updated_at`` update, the
+    audit entry and the recipients' notification events.
+    """
+    with transaction.atomic():
+        message = thread.add_message(
+            sender=sender,
+            content=content,
+            attachment=attachment,
+            is_internal_note=is_internal_note,
+            recipient=recipient,
+        )
+        AuditLogEntry.record(
+            actor=sender,
+            action=audit_action,
+            metadata={"thread_id": thread.pk, "message_id": message.pk},
+            request=request,
+        )
+        notify_messages([message])
+    return message
+
+
+def post_messages(
+    outgoing: Iterable[OutgoingMessage],
+    *,
+    actor=None,
+    audit_action: str = "thread.notification",
+) -> list[Message]:
+    """Post many (typically system-generated) messages in one transaction.
+
+    The number of statements does not depend on the number of messages: one
+    bulk insert each for messages, participant links, audit entries and
+    notification events, plus a single update touching all affected threads.
+    """
+    outgoing = list(outgoing)
+    if not outgoing:
+        return []
+
+    now = timezone.now()
+    messages = [
+        Message(
+            thread=item.thread,
+            sender=item.sender,
+            recipient=item.recipient,
+            body=item.body,
+            attachment=item.attachment,
+            is_internal_note=item.is_internal_note,
+        )
+        for item in outgoing
+    ]
+    for message in messages:
+        remember_original_name(message, "attachment")
+    links = {
+        (item.thread.pk, user.pk)
+        for item in outgoing
+        for user in (item.sender, item.recipient)
+        if user is not None
+    }
+    thread_ids = {item.thread.pk for item in outgoing}
+    through = MessageThread.participants.through
+
+    with transaction.atomic():
+        Message.objects.bulk_create(messages)
+        if links:
+            through.objects.bulk_create(
+                [through(messagethread_id=thread_id, user_id=user_id) for thread_id, user_id in links],
+                ignore_conflicts=True,
+            )
+        MessageThread.objects.filter(pk__in=thread_ids).update(updated_at=now)
+        AuditLogEntry.record_many(
+            [
+                AuditLogEntry.build(
+                    actor=actor,
+                    action=audit_action,
+                    metadata={"thread_id": message.thread_id, "message_id": message.pk},
+                )
+                for message in messages
+            ]
+        )
+        notify_messages(messages)
+
+    for item in outgoing:
+        item.thread.updated_at = now
+        getattr(item.thread, "_prefetched_objects_cache", {}).pop("participants", None)
+    return messages
+
+
+__all__ = ["OutgoingMessage", "post_message", "post_messages"]
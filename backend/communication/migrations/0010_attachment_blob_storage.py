@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:01
+
+import uknf_platform.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0009_librarydocument_uploaded_by'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='librarydocument',
+            name='file',
+            field=models.FileField(blank=True, max_length=255, null=True, storage=uknf_platform.storage.attachment_storage, upload_to='library/documents/'),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='attachment',
+            field=models.FileField(blank=True, max_length=255, null=True, storage=uknf_platform.storage.attachment_storage, upload_to='communication/messages/'),
+        ),
+    ]
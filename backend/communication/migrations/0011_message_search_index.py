@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+POSTGRES_INDEXES = [
+    (
+        "communication_message_body_fts",
+        "communication_message",
+        "to_tsvector('simple'::regconfig, COALESCE(\"body\", ''))",
+    ),
+    (
+        "communication_thread_subject_fts",
+        "communication_messagethread",
+        "to_tsvector('simple'::regconfig, COALESCE(\"subject\", ''))",
+    ),
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE communication_message_fts USING fts5(
+        body,
+        subject,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    INSERT INTO communication_message_fts (rowid, body, subject)
+    SELECT message.id, message.body, thread.subject
+    FROM communication_message AS message
+    JOIN communication_messagethread AS thread ON thread.id = message.thread_id
+    """,
+    """
+    CREATE TRIGGER communication_message_fts_insert AFTER INSERT ON communication_message
+    BEGIN
+        INSERT INTO communication_message_fts (rowid, body, subject)
+        VALUES (
+            new.id,
+            new.body,
+            (SELECT subject FROM communication_messagethread WHERE id = new.thread_id)
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER communication_message_fts_delete AFTER DELETE ON communication_message
+    BEGIN
+        DELETE FROM communication_message_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER communication_message_fts_update AFTER UPDATE OF body, thread_id ON communication_message
+    BEGIN
+        DELETE FROM communication_message_fts WHERE rowid = old.id;
+        INSERT INTO communication_message_fts (rowid, body, subject)
+        VALUES (
+            new.id,
+            new.body,
+            (SELECT subject FROM communication_messagethread WHERE id = new.thread_id)
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER communication_thread_fts_subject AFTER UPDATE OF subject ON communication_messagethread
+    BEGIN
+        UPDATE communication_message_fts SET subject = new.subject
+        WHERE rowid IN (SELECT id FROM communication_message WHERE thread_id = new.id);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS communication_thread_fts_subject",
+    "DROP TRIGGER IF EXISTS communication_message_fts_update",
+    "DROP TRIGGER IF EXISTS communication_message_fts_delete",
+    "DROP TRIGGER IF EXISTS communication_message_fts_insert",
+    "DROP TABLE IF EXISTS communication_message_fts",
+]
+
+
+def _sqlite_has_fts5(cursor) -> bool:
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for name, table, expression in POSTGRES_INDEXES:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({expression})")
+        elif connection.vendor == "sqlite" and _sqlite_has_fts5(cursor):
+            for statement in SQLITE_FORWARD:
+                cursor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for name, _, _ in POSTGRES_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        elif connection.vendor == "sqlite":
+            for statement in SQLITE_BACKWARD:
+                cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communication", "0010_attachment_blob_storage"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
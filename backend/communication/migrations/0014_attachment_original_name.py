@@ -0,0 +1,50 @@
+# Generated by Django 5.0.14 on 2026-10-19 19:31
+
+from pathlib import PurePosixPath
+
+from django.db import migrations, models
+
+
+def backfill_original_names(apps, schema_editor):
+    # Existing rows keep showing the last segment of their stored name.
+    for model_name, field_name in (("LibraryDocument", "file"), ("Message", "attachment")):
+        model = apps.get_model("communication", model_name)
+        rows = []
+        queryset = model.objects.exclude(**{f"{field_name}__isnull": True}).exclude(**{field_name: ""})
+        for row in queryset.only("pk", field_name).iterator(chunk_size=2000):
+            row.original_name = PurePosixPath(getattr(row, field_name).name).name[:255]
+            rows.append(row)
+        model.objects.bulk_update(rows, ["original_name"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0013_outbound_email_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='librarydocument',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        # A plain ADD COLUMN: rebuilding the table, as SQLite would for an
+        # AddField with a default, trips over the search index triggers.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "ALTER TABLE communication_message ADD COLUMN original_name varchar(255) NOT NULL DEFAULT ''",
+                    "ALTER TABLE communication_message DROP COLUMN original_name",
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='message',
+                    name='original_name',
+                    field=models.CharField(blank=True, max_length=255),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_original_names, migrations.RunPython.noop),
+    ]
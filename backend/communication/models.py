@@ -5,6 +5,7 @@ from django.db import models
 from django.utils import timezone
 
 from accounts.models import RegulatedEntity, UserGroup
+from uknf_platform.storage import attachment_storage, remember_original_name
 
 
 class Report(models.Model):
@@ -150,14 +151,25 @@ class MessageThread(models.Model):
             is_internal_note=is_internal_note,
             recipient=recipient,
         )
-        if sender:
-            self.participants.add(sender)
-        if recipient:
-            self.participants.add(recipient)
-        self.updated_at = timezone.now()
-        self.save(update_fields=["updated_at"])
+        self.add_participants({user.pk for user in (sender, recipient) if user is not None})
+        self.touch()
         return message
 
+    def add_participants(self, user_ids) -> None:
+        """Insert participant links in one statement, skipping existing ones."""
+        if not user_ids:
+            return
+        through = MessageThread.participants.through
+        through.objects.bulk_create(
+            [through(messagethread_id=self.pk, user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+        getattr(self, "_prefetched_objects_cache", {}).pop("participants", None)
+
+    def touch(self) -> None:
+        self.updated_at = timezone.now()
+        MessageThread.objects.filter(pk=self.pk).update(updated_at=self.updated_at)
+
     def __str__(self) -> str:  # pragma: no cover
         return f"Thread({self.subject})"
 
@@ -166,7 +178,14 @@ class Message(models.Model):
     thread = models.ForeignKey(MessageThread, on_delete=models.CASCADE, related_name="messages")
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     body = models.TextField()
-    attachment = models.FileField(upload_to="communication/messages/", null=True, blank=True)
+    attachment = models.FileField(
+        upload_to="communication/messages/",
+        storage=attachment_storage,
+        max_length=255,
+        null=True,
+        blank=True,
+    )
+    original_name = models.CharField(max_length=255, blank=True)
     is_internal_note = models.BooleanField(default=False)
     recipient = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -180,6 +199,10 @@ class Message(models.Model):
     class Meta:
         ordering = ["created_at"]
 
+    def save(self, *args, **kwargs):
+        remember_original_name(self, "attachment")
+        super().save(*args, **kwargs)
+
 
 class Announcement(models.Model):
     title = models.CharField(max_length=255)
@@ -223,7 +246,14 @@ class LibraryDocument(models.Model):
     published_at = models.DateTimeField(default=timezone.now)
     description = models.TextField(blank=True)
     document_url = models.URLField(blank=True)
-    file = models.FileField(upload_to="library/documents/", null=True, blank=True)
+    file = models.FileField(
+        upload_to="library/documents/",
+        storage=attachment_storage,
+        max_length=255,
+        null=True,
+        blank=True,
+    )
+    original_name = models.CharField(max_length=255, blank=True)
     content = models.TextField(blank=True)
     embedding = models.JSONField(blank=True, default=list)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -244,6 +274,10 @@ class LibraryDocument(models.Model):
             return self.file.url
         return ""
 
+    def save(self, *args, **kwargs):
+        remember_original_name(self)
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:  # pragma: no cover
         return f"LibraryDocument({self.title})"
 
@@ -261,3 +295,81 @@ class FaqEntry(models.Model):
 
     def __str__(self) -> str:  # pragma: no cover
         return self.question
+
+
+class NotificationEvent(models.Model):
+    class EventKind(models.TextChoices):
+        MESSAGE = "message", "Nowa wiadomość"
+        REPORT_STATUS = "report_status", "Zmiana statusu sprawozdania"
+        ANNOUNCEMENT = "announcement", "Komunikat do potwierdzenia"
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notification_events")
+    kind = models.CharField(max_length=32, choices=EventKind.choices)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["user", "read_at"], name="comm_notif_user_read_idx"),
+            models.Index(fields=["user", "id"], name="comm_notif_user_id_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"NotificationEvent({self.user_id}, {self.kind})"
+
+
+class DigestCursor(models.Model):
+    """Last notification event included in a user's daily or weekly digest."""
+
+    class Frequency(models.TextChoices):
+        DAILY = "daily", "Dzienny"
+        WEEKLY = "weekly", "Tygodniowy"
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="digest_cursors")
+    frequency = models.CharField(max_length=16, choices=Frequency.choices)
+    last_event_id = models.PositiveBigIntegerField(default=0)
+    sent_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "frequency"], name="comm_digest_cursor_unique"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"DigestCursor({self.user_id}, {self.frequency})"
+
+
+class OutboundEmail(models.Model):
+    """E-mail waiting in the outbound queue drained by ``send_queued_emails``."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Oczekuje na wysyłkę"
+        SENT = "sent", "Wysłano"
+        DEAD = "dead", "Niedoręczalna"
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    headers = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="comm_outbox_due_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"OutboundEmail({self.pk}, {self.status})"
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from itertools import islice
+from typing import Iterable
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from accounts.models import EntityMembership, UserGroupMembership
+
+from .models import Announcement, Message, MessageThread, NotificationEvent, Report
+
+EVENT_BATCH_SIZE = 1000
+
+
+def notify_messages(messages: Iterable[Message]) -> None:
+    """Record a ``message`` event for everyone who can see each new message.
+
+    Direct messages notify their recipient; messages without one notify the
+    thread participants, target user and group members and, for entity
+    threads, the entity's members (internal notes only reach internal users).
+    Each kind of audience is loaded with one query for all threads.
+    """
+    messages = list(messages)
+    broadcast = [message for message in messages if message.recipient_id is None]
+    audience = _thread_audience(broadcast) if broadcast else {}
+
+    events = []
+    for message in messages:
+        if message.recipient_id is not None:
+            user_ids = {message.recipient_id}
+        else:
+            user_ids = {
+                user_id
+                for user_id, is_internal in audience.get(message.thread_id, ())
+                if is_internal or not message.is_internal_note
+            }
+        user_ids.discard(message.sender_id)
+        title = f"Nowa wiadomość: {message.thread.subject}"[:255]
+        events.extend(
+            NotificationEvent(user_id=user_id, kind=NotificationEvent.EventKind.MESSAGE, object_id=message.pk, title=title)
+            for user_id in user_ids
+        )
+    _bulk_insert(events)
+
+
+def notify_report_status(report: Report, *, actor=None) -> None:
+    """Record a ``report_status`` event for the submitter and entity members."""
+    user_ids = set(
+        EntityMembership.objects.filter(entity_id=report.entity_id).values_list("user_id", flat=True)
+    )
+    if report.submitted_by_id:
+        user_ids.add(report.submitted_by_id)
+    if actor is not None:
+        user_ids.discard(actor.pk)
+    title = f"Sprawozdanie „{report.title}”: {report.get_status_display()}"[:255]
+    _bulk_insert(
+        NotificationEvent(user_id=user_id, kind=NotificationEvent.EventKind.REPORT_STATUS, object_id=report.pk, title=title)
+        for user_id in user_ids
+    )
+
+
+def notify_announcement(announcement: Announcement) -> None:
+    """Record an ``announcement`` event for every targeted active user.
+
+    Only announcements requiring acknowledgement produce events. The fan-out
+    runs once the publishing transaction commits, so it holds no locks of
+    that transaction and never refers to a rolled back announcement;
+    recipients are streamed and inserted in batches of ``EVENT_BATCH_SIZE``.
+    """
+    if not announcement.requires_acknowledgement:
+        return
+    transaction.on_commit(lambda: _fan_out_announcement(announcement))
+
+
+def _fan_out_announcement(announcement: Announcement) -> None:
+    users = get_user_model().objects.filter(is_active=True)
+    if announcement.target_roles:
+        users = users.filter(role__in=announcement.target_roles)
+    if announcement.created_by_id:
+        users = users.exclude(pk=announcement.created_by_id)
+    title = f"Komunikat do potwierdzenia: {announcement.title}"[:255]
+    _bulk_insert(
+        NotificationEvent(user_id=user_id, kind=NotificationEvent.EventKind.ANNOUNCEMENT, object_id=announcement.pk, title=title)
+        for user_id in users.values_list("id", flat=True).iterator(chunk_size=EVENT_BATCH_SIZE)
+    )
+
+
+def unread_counts(user) -> dict[str, int]:
+    """Return unread event counters per kind plus ``total`` with a single query."""
+    rows = (
+        NotificationEvent.objects.filter(user=user, read_at__isnull=True)
+        .values("kind")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    counts = {kind: 0 for kind in NotificationEvent.EventKind.values}
+    for row in rows:
+        counts[row["kind"]] = row["count"]
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def mark_read(user, *, kind: str | None = None, ids: Iterable[int] | None = None) -> int:
+    events = NotificationEvent.objects.filter(user=user, read_at__isnull=True)
+    if kind:
+        events = events.filter(kind=kind)
+    if ids is not None:
+        events = events.filter(pk__in=list(ids))
+    return events.update(read_at=timezone.now())
+
+
+def _thread_audience(messages: list[Message]) -> dict[int, list[tuple[int, bool]]]:
+    User = get_user_model()
+    thread_ids = {message.thread_id for message in messages}
+    group_threads: dict[int, set[int]] = defaultdict(set)
+    for message in messages:
+        if message.thread.target_group_id:
+            group_threads[message.thread.target_group_id].add(message.thread_id)
+
+    entity_threads: dict[int, set[int]] = defaultdict(set)
+    target_users: dict[int, set[int]] = defaultdict(set)
+    for message in messages:
+        if message.thread.entity_id:
+            entity_threads[message.thread.entity_id].add(message.thread_id)
+        if message.thread.target_user_id:
+            target_users[message.thread.target_user_id].add(message.thread_id)
+
+    audience: dict[int, list[tuple[int, bool]]] = defaultdict(list)
+    participants = MessageThread.participants.through.objects.filter(messagethread_id__in=thread_ids)
+    for thread_id, user_id, role in participants.values_list("messagethread_id", "user_id", "user__role"):
+        audience[thread_id].append((user_id, role in User.INTERNAL_ROLES))
+    if entity_threads:
+        # Entity members see the entity's threads without being participants.
+        members = EntityMembership.objects.filter(entity_id__in=entity_threads, user__is_active=True).distinct()
+        for entity_id, user_id, role in members.values_list("entity_id", "user_id", "user__role"):
+            for thread_id in entity_threads[entity_id]:
+                audience[thread_id].append((user_id, role in User.INTERNAL_ROLES))
+    if target_users:
+        for user_id, role in User.objects.filter(pk__in=target_users, is_active=True).values_list("pk", "role"):
+            for thread_id in target_users[user_id]:
+                audience[thread_id].append((user_id, role in User.INTERNAL_ROLES))
+    if group_threads:
+        members = UserGroupMembership.objects.filter(group_id__in=group_threads, user__is_active=True)
+        for group_id, user_id, role in members.values_list("group_id", "user_id", "user__role"):
+            for thread_id in group_threads[group_id]:
+                audience[thread_id].append((user_id, role in User.INTERNAL_ROLES))
+    return audience
+
+
+def _bulk_insert(events: Iterable[NotificationEvent]) -> None:
+    events = iter(events)
+    while batch := list(islice(events, EVENT_BATCH_SIZE)):
+        NotificationEvent.objects.bulk_create(batch)
+
+
+__all__ = ["mark_read", "notify_announcement", "notify_messages", "notify_report_status", "unread_counts"]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+from html import escape
+
+from django.db import connection
+from django.db.models import F, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from .models import Message, MessageThread
+
+FTS_TABLE = "communication_message_fts"
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+SNIPPET_TOKENS = 24
+SEARCH_CONFIG = "simple"
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_messages(queryset: QuerySet[Message], query: str) -> QuerySet[Message]:
+    """Filter ``queryset`` to messages matching ``query`` in the body or thread subject.
+
+    Results are ordered by relevance and annotated with ``body_highlight`` and
+    ``subject_highlight`` snippets in which matches are wrapped in
+    ``HIGHLIGHT_START``/``HIGHLIGHT_END`` markers (see :func:`render_highlight`).
+    Postgres uses GIN-indexed ``tsvector`` expressions, SQLite the FTS5 table
+    maintained by triggers; other backends fall back to ``icontains``.
+    """
+    if connection.vendor == "postgresql":
+        return _search_postgres(queryset, query)
+    if connection.vendor == "sqlite" and fts5_index_exists():
+        return _search_sqlite(queryset, query)
+    return _search_fallback(queryset, query)
+
+
+def render_highlight(snippet: str | None) -> str | None:
+    if snippet is None:
+        return None
+    return escape(snippet).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_END, "</mark>")
+
+
+def fts5_index_exists() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _search_postgres(queryset: QuerySet[Message], query: str) -> QuerySet[Message]:
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    body_vector = SearchVector("body", config=SEARCH_CONFIG)
+    # Both expressions are identical to the GIN index definitions created in
+    # migration 0011, which lets the planner use the indexes.
+    matching_threads = (
+        MessageThread.objects.annotate(subject_vector=SearchVector("subject", config=SEARCH_CONFIG))
+        .filter(subject_vector=search_query)
+        .values("id")
+    )
+    headline_options = {
+        "config": SEARCH_CONFIG,
+        "start_sel": HIGHLIGHT_START,
+        "stop_sel": HIGHLIGHT_END,
+        "max_words": SNIPPET_TOKENS,
+        "min_words": SNIPPET_TOKENS // 2,
+    }
+    return (
+        queryset.annotate(body_vector=body_vector)
+        .filter(Q(body_vector=search_query) | Q(thread_id__in=matching_threads))
+        .annotate(
+            rank=SearchRank(body_vector, search_query),
+            body_highlight=SearchHeadline("body", search_query, **headline_options),
+            subject_highlight=SearchHeadline("thread__subject", search_query, highlight_all=True, **headline_options),
+        )
+        .order_by("-rank", "-created_at")
+    )
+
+
+def _search_sqlite(queryset: QuerySet[Message], query: str) -> QuerySet[Message]:
+    match = _fts5_match_expression(query)
+    if not match:
+        return queryset.none()
+    table = Message._meta.db_table
+    matched_row = f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {table}.id"
+    return (
+        queryset.filter(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+        .annotate(
+            rank=RawSQL(f"SELECT -bm25({FTS_TABLE}, 1.0, 0.5) {matched_row}", [match]),
+            body_highlight=RawSQL(
+                f"SELECT snippet({FTS_TABLE}, 0, %s, %s, '…', %s) {matched_row}",
+                [HIGHLIGHT_START, HIGHLIGHT_END, SNIPPET_TOKENS, match],
+            ),
+            subject_highlight=RawSQL(
+                f"SELECT highlight({FTS_TABLE}, 1, %s, %s) {matched_row}",
+                [HIGHLIGHT_START, HIGHLIGHT_END, match],
+            ),
+        )
+        .order_by("-rank", "-created_at")
+    )
+
+
+def _search_fallback(queryset: QuerySet[Message], query: str) -> QuerySet[Message]:
+    tokens = _TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return queryset.none()
+    for token in tokens:
+        queryset = queryset.filter(Q(body__icontains=token) | Q(thread__subject__icontains=token))
+    return queryset.annotate(body_highlight=F("body"), subject_highlight=F("thread__subject")).order_by("-created_at")
+
+
+def _fts5_match_expression(query: str) -> str:
+    # Every token is quoted (so FTS5 operators in user input are inert) and
+    # prefix-matched; tokens are implicitly AND-ed.
+    return " ".join(f'"{token}"*' for token in _TOKEN_PATTERN.findall(query))
+
+
+__all__ = ["render_highlight", "search_messages"]
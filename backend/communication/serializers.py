@@ -5,10 +5,13 @@ import json
 from pathlib import Path
 
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from rest_framework import serializers
 
 from accounts.models import UserGroup
 from accounts.serializers import RegulatedEntitySerializer, UserSerializer
+from uknf_platform.profiling import ProfiledSerializerMixin
+from .search import render_highlight
 from .models import (
     Announcement,
     AnnouncementAcknowledgement,
@@ -18,6 +21,7 @@ from .models import (
     LibraryDocument,
     Message,
     MessageThread,
+    NotificationEvent,
     Report,
     ReportTimelineEntry,
 )
@@ -33,7 +37,7 @@ class ReportTimelineSerializer(serializers.ModelSerializer):
         fields = ["id", "status", "notes", "created_at", "created_by"]
 
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     entity = RegulatedEntitySerializer(read_only=True)
     entity_id = serializers.IntegerField(write_only=True)
     submitted_by = UserSerializer(read_only=True)
@@ -182,14 +186,45 @@ class MessageSerializer(serializers.ModelSerializer):
             return None
         request = self.context.get("request") if hasattr(self, "context") else None
         url = obj.attachment.url
+        download_url = reverse("thread-message-attachment", kwargs={"pk": obj.thread_id, "message_id": obj.pk})
         if request is not None:
             url = request.build_absolute_uri(url)
+            download_url = request.build_absolute_uri(download_url)
         return {
             "url": url,
-            "name": Path(obj.attachment.name).name,
+            "download_url": download_url,
+            "name": obj.original_name or Path(obj.attachment.name).name,
         }
 
 
+class MessageSearchResultSerializer(serializers.ModelSerializer):
+    sender = SimpleUserSerializer(read_only=True)
+    thread_subject = serializers.CharField(source="thread.subject", read_only=True)
+    entity_id = serializers.IntegerField(source="thread.entity_id", read_only=True)
+    subject_highlight = serializers.SerializerMethodField()
+    body_highlight = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Message
+        fields = [
+            "id",
+            "thread",
+            "thread_subject",
+            "entity_id",
+            "sender",
+            "created_at",
+            "subject_highlight",
+            "body_highlight",
+        ]
+        read_only_fields = fields
+
+    def get_subject_highlight(self, obj: Message) -> str | None:
+        return render_highlight(getattr(obj, "subject_highlight", None))
+
+    def get_body_highlight(self, obj: Message) -> str | None:
+        return render_highlight(getattr(obj, "body_highlight", None))
+
+
 class MessageCreateSerializer(serializers.ModelSerializer):
     attachment = serializers.FileField(required=False, allow_null=True)
 
@@ -198,7 +233,7 @@ class MessageCreateSerializer(serializers.ModelSerializer):
         fields = ["body", "attachment", "is_internal_note"]
 
 
-class MessageThreadSerializer(serializers.ModelSerializer):
+class MessageThreadSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     entity = RegulatedEntitySerializer(read_only=True)
     entity_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     created_by = UserSerializer(read_only=True)
@@ -306,6 +341,18 @@ class GlobalMessageBroadcastSerializer(serializers.Serializer):
         return attrs
 
 
+class NotificationEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = NotificationEvent
+        fields = ["id", "kind", "object_id", "title", "created_at", "read_at"]
+        read_only_fields = fields
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=NotificationEvent.EventKind.choices, required=False)
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+
 class LibraryDocumentSerializer(serializers.ModelSerializer):
     document_url = serializers.SerializerMethodField()
 
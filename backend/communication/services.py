@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import io
+import math
+import mmap
 import re
+import shutil
+import tempfile
 import zipfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Collection, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 import xml.etree.ElementTree as ET
@@ -15,6 +24,13 @@ REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
 RID_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
 EXCEL_EPOCH = date(1899, 12, 30)
 FORM_ID_PATTERN = re.compile(r"^F\d{2}\.\d{2}\.\d{2}(?:\.[a-z])?\Z", re.IGNORECASE)
+# Worksheets read by ``validate_workbook``; the others are never parsed.
+VALIDATED_SHEETS = frozenset({"INFO", "F01.00.01", "F01.01.01.a", "F01.02.01", "F01.05.02"})
+# Shared-string tables above this size are spooled to a memory-mapped temp file.
+SHARED_STRINGS_MMAP_THRESHOLD = 32 * 1024 * 1024
+_SHARED_STRING_START = re.compile(rb"<si(?=[\s>/])")
+_SHARED_STRINGS_END = re.compile(rb"</sst\s*>")
+_PLAIN_SHARED_STRING = re.compile(rb'<si>\s*<t(?: xml:space="preserve")?>([^<&]*)</t>\s*</si>\s*\Z')
 
 
 @dataclass
@@ -64,11 +80,333 @@ class ValidationResult:
         }
 
 
+class SharedStrings(Sequence):
+    """Shared-string table decoded on demand.
+
+    One scan over ``sharedStrings.xml`` records where every ``<si>`` item
+    starts; an item is decoded (and cached) only when a cell references it.
+    Large tables are spooled to a temporary file and memory-mapped, so the
+    table must be closed (or used as a context manager) once done with.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap, *, spool=None):
+        self._buffer = buffer
+        self._spool = spool
+        self._offsets = array("q", (match.start() for match in _SHARED_STRING_START.finditer(buffer)))
+        end = _SHARED_STRINGS_END.search(buffer, self._offsets[-1] if self._offsets else 0)
+        self._offsets.append(end.start() if end else len(buffer))
+        self._cache: dict[int, str] = {}
+
+    @classmethod
+    def from_archive(cls, archive: zipfile.ZipFile, name: str) -> "SharedStrings":
+        info = archive.getinfo(name)
+        if info.file_size <= SHARED_STRINGS_MMAP_THRESHOLD:
+            return cls(archive.read(info))
+        spool = tempfile.TemporaryFile()
+        with archive.open(info) as source:
+            shutil.copyfileobj(source, spool)
+        spool.flush()
+        return cls(mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ), spool=spool)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:  # type: ignore[override]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        try:
+            return self._cache[index]
+        except KeyError:
+            pass
+        raw = self._buffer[self._offsets[index] : self._offsets[index + 1]]
+        plain = _PLAIN_SHARED_STRING.match(raw)
+        if plain:
+            text = plain.group(1).decode("utf-8")
+        else:
+            item = ET.fromstring(b'<sst xmlns="' + EXCEL_NS[1:-1].encode() + b'">' + raw + b"</sst>")[0]
+            text = _shared_string_text(item)
+        self._cache[index] = text
+        return text
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._spool is not None:
+            self._spool.close()
+
+    def __enter__(self) -> "SharedStrings":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _shared_string_text(item) -> str:
+    text_parts: list[str] = []
+    for node in item:
+        if node.tag == f"{EXCEL_NS}t":
+            text_parts.append(node.text or "")
+        elif node.tag == f"{EXCEL_NS}r":
+            run_text = node.find(f"{EXCEL_NS}t")
+            if run_text is not None and run_text.text:
+                text_parts.append(run_text.text)
+    return "".join(text_parts)
+
+
+CELL_EMPTY, CELL_NUMBER, CELL_BOOLEAN, CELL_STRING, CELL_SHARED_STRING = range(5)
+_CELL_REFERENCE = re.compile(r"([A-Z]{1,3})([1-9]\d*)")
+
+
+class _SparseColumn:
+    """Filled cells of one column: sorted row indexes with parallel kind and payload arrays."""
+
+    __slots__ = ("rows", "kinds", "values")
+
+    def __init__(self) -> None:
+        self.rows = array("I")
+        self.kinds = array("b")
+        self.values = array("d")
+
+    def find(self, row: int) -> int:
+        position = bisect_left(self.rows, row)
+        if position < len(self.rows) and self.rows[position] == row:
+            return position
+        return -1
+
+    def span(self, first_row: int, last_row: int | None) -> range:
+        """Positions of the cells between ``first_row`` and ``last_row`` (inclusive)."""
+        end = len(self.rows) if last_row is None else bisect_right(self.rows, last_row)
+        return range(bisect_left(self.rows, first_row), end)
+
+
+class ColumnarSheet(Mapping):
+    """Cells of one worksheet stored column by column.
+
+    Each column keeps only its filled cells: a sorted ``array("I")`` of row
+    indexes next to a cell kind (``array("b")``) and a float64 payload
+    (``array("d")``) holding the number, the boolean or the index of the text
+    in an interned string table (or in the workbook's shared strings, decoded
+    only when read). Memory therefore follows the number of cells, not the
+    extent of the used range, so a lone cell at ``XFD1048576`` costs as much
+    as one at ``A1``. Rows usually arrive in order and are appended; lookups
+    bisect the row index.
+
+    The sheet is also a read-only mapping of A1 references to values
+    (``Decimal``, ``bool`` or ``str``), iterated column by column.
+    """
+
+    def __init__(self, shared_strings: Sequence[str] = ()):
+        self._columns: dict[int, _SparseColumn] = {}
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self._shared_strings = shared_strings
+        self._count = 0
+
+    def set_number(self, row: int, column: int, value: float) -> None:
+        self._set(row, column, CELL_NUMBER, value)
+
+    def set_boolean(self, row: int, column: int, value: bool) -> None:
+        self._set(row, column, CELL_BOOLEAN, 1.0 if value else 0.0)
+
+    def set_string(self, row: int, column: int, text: str) -> None:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self._strings)
+            self._strings.append(text)
+        self._set(row, column, CELL_STRING, string_id)
+
+    def set_shared_string(self, row: int, column: int, index: int) -> None:
+        self._set(row, column, CELL_SHARED_STRING, index)
+
+    def value_at(self, row: int, column: int) -> Any:
+        """Value of the cell at zero-based ``row``/``column`` or ``None``."""
+        cells = self._columns.get(column)
+        if cells is None:
+            return None
+        position = cells.find(row)
+        if position < 0:
+            return None
+        return self._decode(cells.kinds[position], cells.values[position])
+
+    def get_range(self, cell_range: str) -> list[list[Any]]:
+        """Values of ``cell_range`` (e.g. ``"D7:D40"``) as rows, ``None`` for empty cells."""
+        (first_row, first_column), (last_row, last_column) = _parse_range(cell_range)
+        return [
+            [self.value_at(row, column) for column in range(first_column, last_column + 1)]
+            for row in range(first_row, last_row + 1)
+        ]
+
+    def numeric_column(self, column: int, first_row: int = 0, last_row: int | None = None) -> array:
+        """Float64 values of a zero-based column slice; empty and non-numeric cells are NaN.
+
+        Without ``last_row`` the slice ends at the column's last filled cell.
+        The result is a new buffer, so callers cannot modify the sheet.
+        """
+        cells = self._columns.get(column)
+        if cells is None or not cells.rows:
+            return array("d")
+        if last_row is None:
+            last_row = cells.rows[-1]
+        result = array("d", [math.nan]) * max(last_row - first_row + 1, 0)
+        for position in cells.span(first_row, last_row):
+            if cells.kinds[position] == CELL_NUMBER:
+                result[cells.rows[position] - first_row] = cells.values[position]
+        return result
+
+    def sum_range(self, cell_range: str) -> Decimal | None:
+        """Sum of the numeric cells of ``cell_range``; ``None`` when it has none."""
+        (first_row, first_column), (last_row, last_column) = _parse_range(cell_range)
+        numbers = [
+            cells.values[position]
+            for column, cells in self._columns.items()
+            if first_column <= column <= last_column
+            for position in cells.span(first_row, last_row)
+            if cells.kinds[position] == CELL_NUMBER
+        ]
+        if not numbers:
+            return None
+        return Decimal(repr(math.fsum(numbers)))
+
+    def get(self, reference: str, default: Any = None) -> Any:
+        position = _parse_reference(reference)
+        if position is None:
+            return default
+        value = self.value_at(*position)
+        return default if value is None else value
+
+    def __getitem__(self, reference: str) -> Any:
+        value = self.get(reference)
+        if value is None:
+            raise KeyError(reference)
+        return value
+
+    def __iter__(self):
+        for reference, _ in self.items():
+            yield reference
+
+    def items(self):
+        for column in sorted(self._columns):
+            cells = self._columns[column]
+            label = _column_label(column)
+            for row, kind, value in zip(cells.rows, cells.kinds, cells.values):
+                yield f"{label}{row + 1}", self._decode(kind, value)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _decode(self, kind: int, value: float) -> Any:
+        if kind == CELL_NUMBER:
+            return Decimal(repr(value))
+        if kind == CELL_BOOLEAN:
+            return bool(value)
+        if kind == CELL_STRING:
+            return self._strings[int(value)]
+        try:
+            return self._shared_strings[int(value)]
+        except IndexError:
+            return ""
+
+    def _set(self, row: int, column: int, kind: int, value: float) -> None:
+        cells = self._columns.get(column)
+        if cells is None:
+            cells = self._columns[column] = _SparseColumn()
+        rows = cells.rows
+        if not rows or row > rows[-1]:
+            rows.append(row)
+            cells.kinds.append(kind)
+            cells.values.append(value)
+            self._count += 1
+            return
+        position = bisect_left(rows, row)
+        if position < len(rows) and rows[position] == row:
+            cells.kinds[position] = kind
+            cells.values[position] = value
+            return
+        rows.insert(position, row)
+        cells.kinds.insert(position, kind)
+        cells.values.insert(position, value)
+        self._count += 1
+
+
+def _parse_reference(reference: str) -> tuple[int, int] | None:
+    """Zero-based ``(row, column)`` of an A1 reference."""
+    match = _CELL_REFERENCE.fullmatch(reference)
+    if not match:
+        return None
+    return int(match.group(2)) - 1, _column_index(match.group(1))
+
+
+def _parse_range(cell_range: str) -> tuple[tuple[int, int], tuple[int, int]]:
+    first, _, last = cell_range.partition(":")
+    start = _parse_reference(first)
+    end = _parse_reference(last or first)
+    if start is None or end is None:
+        raise ValueError(f"Niepoprawny zakres komórek: {cell_range}")
+    return (min(start[0], end[0]), min(start[1], end[1])), (max(start[0], end[0]), max(start[1], end[1]))
+
+
+_CELL_TAG = f"{EXCEL_NS}c"
+_ROW_TAG = f"{EXCEL_NS}row"
+_SHEET_DATA_TAG = f"{EXCEL_NS}sheetData"
+_VALUE_TAG = f"{EXCEL_NS}v"
+_INLINE_TEXT_PATH = f"{EXCEL_NS}is/{EXCEL_NS}t"
+
+
+def _iter_row_elements(stream) -> Iterator[ET.Element]:
+    """Yield the complete ``<row>`` elements of a worksheet stream.
+
+    Each row is cleared and detached from ``<sheetData>`` once the caller is
+    done with it, so the XML tree of a large sheet never exists in full.
+    """
+    sheet_data = None
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if element.tag == _SHEET_DATA_TAG:
+                sheet_data = element
+            continue
+        if element.tag != _ROW_TAG:
+            continue
+        yield element
+        element.clear()
+        if sheet_data is not None:
+            sheet_data.remove(element)
+
+
+def _decode_cell(cell: ET.Element) -> tuple[str, str] | None:
+    """``(kind, text)`` of a worksheet ``<c>`` element, or ``None`` when it holds no value.
+
+    ``kind`` is ``"s"`` for a shared-string index, ``"b"`` for a boolean,
+    ``"n"`` for a number and ``"str"`` for literal text.
+    """
+    cell_type = cell.get("t")
+    if cell_type == "inlineStr":
+        text_node = cell.find(_INLINE_TEXT_PATH)
+        return None if text_node is None else ("str", text_node.text or "")
+    value_node = cell.find(_VALUE_TAG)
+    if value_node is None or value_node.text is None:
+        return None
+    if cell_type in {"s", "b"}:
+        return cell_type, value_node.text
+    if cell_type in {"str", "e"}:
+        return "str", value_node.text
+    return "n", value_node.text
+
+
 class WorkbookReader:
-    """Lightweight Excel reader tailored for UKNF sprawozdania templates."""
+    """Lightweight Excel reader tailored for UKNF sprawozdania templates.
+
+    Shared strings are resolved when cells are read, so the reader holds the
+    shared-string table open until :meth:`close` (or the end of a ``with``
+    block).
+    """
 
-    def __init__(self, file_path: str | Path):
+    def __init__(self, file_path: str | Path, *, sheets: Collection[str] | None = None):
+        """Parse ``file_path``; ``sheets`` limits parsing to the named worksheets."""
         self.file_path = Path(file_path)
+        self.requested_sheets = frozenset(sheets) if sheets is not None else None
+        self.shared_strings: Sequence[str] = []
         if not self.file_path.exists():
             raise FileNotFoundError(f"Brak pliku sprawozdania: {self.file_path}")
         try:
@@ -78,13 +416,39 @@ class WorkbookReader:
                 self.sheets = {
                     name: self._parse_sheet(archive.read(f"xl/{target}"))
                     for name, target in self.sheet_targets.items()
+                    if self._wants_sheet(name)
                 }
         except zipfile.BadZipFile:
+            self.close()
             self._load_xls_workbook()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "WorkbookReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        _close_shared_strings(self.shared_strings)
 
     def get(self, sheet: str, cell: str) -> Any:
         return self.sheets.get(sheet, {}).get(cell)
 
+    def get_range(self, sheet: str, cell_range: str) -> list[list[Any]]:
+        cells = self.sheets.get(sheet)
+        if cells is None:
+            return []
+        return cells.get_range(cell_range)
+
+    def sum_range(self, sheet: str, cell_range: str) -> Decimal | None:
+        cells = self.sheets.get(sheet)
+        if cells is None:
+            return None
+        return cells.sum_range(cell_range)
+
     def get_string(self, sheet: str, cell: str) -> str | None:
         value = self.get(sheet, cell)
         if value is None:
@@ -133,77 +497,37 @@ class WorkbookReader:
             return None
         return EXCEL_EPOCH + timedelta(days=serial)
 
-    def _load_shared_strings(self, archive: zipfile.ZipFile) -> list[str]:
-        try:
-            payload = archive.read("xl/sharedStrings.xml")
-        except KeyError:
-            return []
-        root = self._parse_xml(payload)
-        entries: list[str] = []
-        for item in root.findall(f"{EXCEL_NS}si"):
-            text_parts: list[str] = []
-            for node in item:
-                if node.tag == f"{EXCEL_NS}t":
-                    text_parts.append(node.text or "")
-                elif node.tag == f"{EXCEL_NS}r":
-                    run_text = node.find(f"{EXCEL_NS}t")
-                    if run_text is not None and run_text.text:
-                        text_parts.append(run_text.text)
-            if not text_parts:
-                text_element = item.find(f"{EXCEL_NS}t")
-                if text_element is not None and text_element.text:
-                    text_parts.append(text_element.text)
-            entries.append("".join(text_parts))
-        return entries
+    def _load_shared_strings(self, archive: zipfile.ZipFile) -> Sequence[str]:
+        return _load_shared_strings(archive)
 
     def _load_sheet_targets(self, archive: zipfile.ZipFile) -> dict[str, str]:
-        rels_root = self._parse_xml(archive.read("xl/_rels/workbook.xml.rels"))
-        relation_targets = {
-            node.get("Id"): node.get("Target")
-            for node in rels_root.findall(f"{REL_NS}Relationship")
-        }
-        workbook_root = self._parse_xml(archive.read("xl/workbook.xml"))
-        mapping: dict[str, str] = {}
-        for sheet in workbook_root.findall(f"{EXCEL_NS}sheets/{EXCEL_NS}sheet"):
-            relationship_id = sheet.get(f"{RID_NS}id")
-            if not relationship_id:
-                continue
-            target = relation_targets.get(relationship_id)
-            if not target:
-                continue
-            mapping[sheet.get("name", f"sheet{sheet.get('sheetId', '')}")] = target
-        return mapping
-
-    def _parse_sheet(self, payload: bytes) -> dict[str, Any]:
-        root = self._parse_xml(payload)
-        cells: dict[str, Any] = {}
-        for cell in root.findall(f".//{EXCEL_NS}c"):
-            reference = cell.get("r")
-            if not reference:
-                continue
-            cell_type = cell.get("t")
-            if cell_type == "inlineStr":
-                text_node = cell.find(f"{EXCEL_NS}is/{EXCEL_NS}t")
-                if text_node is not None:
-                    cells[reference] = text_node.text or ""
-                continue
-            value_node = cell.find(f"{EXCEL_NS}v")
-            if value_node is None:
-                continue
-            raw_value = value_node.text or ""
-            if cell_type == "s":
-                try:
-                    cells[reference] = self.shared_strings[int(raw_value)]
-                except (IndexError, ValueError):
-                    cells[reference] = ""
-                continue
-            if cell_type == "b":
-                cells[reference] = raw_value == "1"
-                continue
-            try:
-                cells[reference] = Decimal(raw_value)
-            except InvalidOperation:
-                cells[reference] = raw_value
+        return _load_sheet_targets(archive)
+
+    def _parse_sheet(self, payload: bytes) -> ColumnarSheet:
+        cells = ColumnarSheet(self.shared_strings)
+        cell_tag = f"{EXCEL_NS}c"
+        for row_element in _iter_row_elements(io.BytesIO(payload)):
+            for cell in row_element.iter(cell_tag):
+                position = _parse_reference(cell.get("r") or "")
+                decoded = _decode_cell(cell)
+                if position is None or decoded is None:
+                    continue
+                row, column = position
+                kind, text = decoded
+                if kind == "s":
+                    try:
+                        cells.set_shared_string(row, column, int(text))
+                    except ValueError:
+                        cells.set_string(row, column, "")
+                elif kind == "b":
+                    cells.set_boolean(row, column, text == "1")
+                elif kind == "n":
+                    try:
+                        cells.set_number(row, column, float(text))
+                    except ValueError:
+                        cells.set_string(row, column, text)
+                else:
+                    cells.set_string(row, column, text)
         return cells
 
     def _load_xls_workbook(self) -> None:
@@ -212,55 +536,137 @@ class WorkbookReader:
         except ImportError as exc:  # pragma: no cover - defensive fallback
             raise ValueError("Plik XLS nie jest obsługiwany w tym środowisku.") from exc
 
-        workbook = xlrd.open_workbook(self.file_path.as_posix())
+        # ``on_demand`` parses a worksheet only when it is requested.
+        workbook = xlrd.open_workbook(self.file_path.as_posix(), on_demand=True)
         try:
             sheet_names = workbook.sheet_names()
             self.shared_strings = []
             self.sheet_targets = {name: name for name in sheet_names}
-            self.sheets = {
-                name: self._parse_xls_sheet(workbook.sheet_by_name(name))
-                for name in sheet_names
-            }
+            self.sheets = {}
+            for name in sheet_names:
+                if not self._wants_sheet(name):
+                    continue
+                self.sheets[name] = self._parse_xls_sheet(workbook.sheet_by_name(name))
+                workbook.unload_sheet(name)
         finally:
             workbook.release_resources()
 
-    def _parse_xls_sheet(self, sheet: Any) -> dict[str, Any]:
+    def _parse_xls_sheet(self, sheet: Any) -> ColumnarSheet:
         import xlrd
 
-        cells: dict[str, Any] = {}
+        cells = ColumnarSheet()
         for row_index in range(sheet.nrows):
-            for column_index in range(sheet.ncols):
-                cell = sheet.cell(row_index, column_index)
-                value = self._convert_xls_cell(cell)
-                if value is None or value == "":
-                    continue
-                reference = f"{_column_label(column_index)}{row_index + 1}"
-                cells[reference] = value
+            # Rows are stored ragged; ``row_len`` excludes trailing empty cells.
+            row_length = sheet.row_len(row_index)
+            if not row_length:
+                continue
+            types = sheet.row_types(row_index, 0, row_length)
+            values = sheet.row_values(row_index, 0, row_length)
+            for column_index, (cell_type, raw_value) in enumerate(zip(types, values)):
+                if cell_type in (xlrd.XL_CELL_NUMBER, xlrd.XL_CELL_DATE):
+                    cells.set_number(row_index, column_index, float(raw_value))
+                elif cell_type == xlrd.XL_CELL_BOOLEAN:
+                    cells.set_boolean(row_index, column_index, bool(raw_value))
+                elif cell_type == xlrd.XL_CELL_TEXT and raw_value != "":
+                    cells.set_string(row_index, column_index, raw_value)
         return cells
 
-    def _convert_xls_cell(self, cell: Any) -> Any:
-        import xlrd
-
-        if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
-            return None
-        if cell.ctype == xlrd.XL_CELL_TEXT:
-            return cell.value
-        if cell.ctype == xlrd.XL_CELL_BOOLEAN:
-            return bool(cell.value)
-        if cell.ctype in (xlrd.XL_CELL_NUMBER, xlrd.XL_CELL_DATE):
-            try:
-                return Decimal(str(cell.value))
-            except InvalidOperation:
-                return cell.value
-        if cell.ctype == xlrd.XL_CELL_ERROR:
-            return None
-        return cell.value
+    def _wants_sheet(self, name: str) -> bool:
+        return self.requested_sheets is None or name in self.requested_sheets
 
     @staticmethod
     def _parse_xml(payload: bytes):
         return ET.fromstring(payload)
 
 
+def _load_shared_strings(archive: zipfile.ZipFile) -> Sequence[str]:
+    try:
+        shared_strings = SharedStrings.from_archive(archive, "xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    if len(shared_strings) == 0:
+        shared_strings.close()
+        # Prefixed namespaces are not recognised by the offset scan.
+        return [_shared_string_text(item) for item in ET.fromstring(archive.read("xl/sharedStrings.xml")) if item.tag == f"{EXCEL_NS}si"]
+    return shared_strings
+
+
+def _close_shared_strings(shared_strings: Sequence[str]) -> None:
+    if isinstance(shared_strings, SharedStrings):
+        shared_strings.close()
+
+
+def _load_sheet_targets(archive: zipfile.ZipFile) -> dict[str, str]:
+    rels_root = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    relation_targets = {
+        node.get("Id"): node.get("Target")
+        for node in rels_root.findall(f"{REL_NS}Relationship")
+    }
+    workbook_root = ET.fromstring(archive.read("xl/workbook.xml"))
+    mapping: dict[str, str] = {}
+    for sheet in workbook_root.findall(f"{EXCEL_NS}sheets/{EXCEL_NS}sheet"):
+        relationship_id = sheet.get(f"{RID_NS}id")
+        if not relationship_id:
+            continue
+        target = relation_targets.get(relationship_id)
+        if not target:
+            continue
+        mapping[sheet.get("name", f"sheet{sheet.get('sheetId', '')}")] = target
+    return mapping
+
+
+def iter_sheet_rows(file_path: str | Path, *, sheet: str | None = None) -> Iterator[tuple[int, list[Any]]]:
+    """Stream ``(row_number, values)`` pairs of one XLSX worksheet, the first by default.
+
+    The worksheet XML is parsed straight from the archive member and each row
+    is dropped once yielded, so memory stays flat however long the sheet is.
+    Row numbers are 1-based as in Excel; ``values`` holds ``str``,
+    ``Decimal`` or ``bool`` per column with ``None`` for empty cells.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        targets = _load_sheet_targets(archive)
+        if not targets:
+            return
+        if sheet is None:
+            sheet = next(iter(targets))
+        if sheet not in targets:
+            raise KeyError(f"Skoroszyt nie zawiera arkusza {sheet!r}.")
+        shared_strings = _load_shared_strings(archive)
+        try:
+            with archive.open(f"xl/{targets[sheet]}") as stream:
+                for element in _iter_row_elements(stream):
+                    values: list[Any] = []
+                    for position, cell in enumerate(element.iter(_CELL_TAG)):
+                        reference = _parse_reference(cell.get("r") or "")
+                        column = reference[1] if reference else position
+                        if column >= len(values):
+                            values.extend([None] * (column + 1 - len(values)))
+                        decoded = _decode_cell(cell)
+                        if decoded is None:
+                            continue
+                        kind, text = decoded
+                        if kind == "s":
+                            try:
+                                values[column] = shared_strings[int(text)]
+                            except ValueError:
+                                values[column] = ""
+                        elif kind == "b":
+                            values[column] = text == "1"
+                        elif kind == "n":
+                            try:
+                                values[column] = Decimal(text)
+                            except InvalidOperation:
+                                values[column] = text
+                        else:
+                            values[column] = text
+                    row_number = int(element.get("r") or 0)
+                    if any(value is not None and value != "" for value in values):
+                        yield row_number, values
+        finally:
+            _close_shared_strings(shared_strings)
+
+
+@lru_cache(maxsize=1024)
 def _column_label(index: int) -> str:
     label = ""
     while index >= 0:
@@ -270,6 +676,19 @@ def _column_label(index: int) -> str:
     return label
 
 
+_COLUMN_INDEXES: dict[str, int] = {}
+
+
+def _column_index(label: str) -> int:
+    index = _COLUMN_INDEXES.get(label)
+    if index is None:
+        index = 0
+        for character in label:
+            index = index * 26 + ord(character) - 64
+        index = _COLUMN_INDEXES[label] = index - 1
+    return index
+
+
 def _decimal_to_str(value: Decimal | None) -> str | None:
     if value is None:
         return None
@@ -317,7 +736,12 @@ def validate_report_workbook(file_path: str | Path) -> ValidationResult:
     validation issues so the caller can persist the status on the ``Report``
     model and present the feedback in the UI.
     """
-    workbook = WorkbookReader(file_path)
+    with WorkbookReader(file_path, sheets=VALIDATED_SHEETS) as workbook:
+        return validate_workbook(workbook)
+
+
+def validate_workbook(workbook: WorkbookReader) -> ValidationResult:
+    """Evaluate the business rules against an already parsed workbook."""
     period_start = workbook.get_date("INFO", "C7")
     period_end = workbook.get_date("INFO", "C8")
 
@@ -479,4 +903,4 @@ def validate_report_workbook(file_path: str | Path) -> ValidationResult:
     )
 
 
-__all__ = ["ValidationIssue", "ValidationResult", "validate_report_workbook"]
+__all__ = ["ColumnarSheet", "ValidationIssue", "ValidationResult", "WorkbookReader", "validate_report_workbook", "validate_workbook"]
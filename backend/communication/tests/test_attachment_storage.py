@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from communication.models import MessageThread
+from uknf_platform.storage import attachment_storage, blob_reference_counts, collect_unreferenced_blobs
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(email="sender@test.com", password="testpass123")
+        self.thread = MessageThread.objects.create(subject="Załączniki", created_by=self.user)
+
+    def _post(self, content: bytes, name: str):
+        return self.thread.add_message(sender=self.user, content="treść", attachment=ContentFile(content, name=name))
+
+    def test_identical_uploads_share_single_blob(self):
+        first = self._post(b"%PDF-1.4 zawartosc", "okolnik.pdf")
+        second = self._post(b"%PDF-1.4 zawartosc", "okolnik-kopia.pdf")
+        third = self._post(b"inna zawartosc", "okolnik.pdf")
+
+        self.assertEqual(first.attachment.name, second.attachment.name)
+        self.assertNotEqual(first.attachment.name, third.attachment.name)
+        self.assertTrue(first.attachment.name.startswith("cas/"))
+        self.assertEqual(first.attachment.read(), b"%PDF-1.4 zawartosc")
+
+        counts = blob_reference_counts()
+        self.assertEqual(sorted(counts.values()), [1, 2])
+
+    def test_shared_blob_does_not_reveal_the_first_uploaders_filename(self):
+        first = self._post(b"wspolna tresc", "poufne-zwolnienia-2025.pdf")
+        second = self._post(b"wspolna tresc", "okolnik.pdf")
+
+        self.assertNotIn("poufne", second.attachment.name)
+        self.assertEqual(second.original_name, "okolnik.pdf")
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse("thread-message-attachment", kwargs={"pk": self.thread.pk, "message_id": second.pk}))
+        self.assertIn("okolnik.pdf", response["Content-Disposition"])
+        self.assertEqual(first.original_name, "poufne-zwolnienia-2025.pdf")
+
+    def test_blob_collected_during_deduplication_is_written_again(self):
+        first = self._post(b"tresc do ponownego zapisu", "raport.pdf")
+        storage = attachment_storage()
+        real_utime = os.utime
+
+        def collected_meanwhile(path, *args, **kwargs):
+            os.remove(path)
+            return real_utime(path, *args, **kwargs)
+
+        with mock.patch("uknf_platform.storage.os.utime", side_effect=collected_meanwhile):
+            second = self._post(b"tresc do ponownego zapisu", "raport.pdf")
+
+        self.assertEqual(second.attachment.name, first.attachment.name)
+        self.assertTrue(storage.exists(second.attachment.name))
+        with storage.open(second.attachment.name) as handle:
+            self.assertEqual(handle.read(), b"tresc do ponownego zapisu")
+
+    def test_library_search_matches_the_uploaded_filename(self):
+        analyst = User.objects.create_user(email="biblioteka@test.com", password="testpass123", role=User.UserRole.ANALYST)
+        client = APIClient()
+        client.force_authenticate(analyst)
+        upload = SimpleUploadedFile("raport-roczny.pdf", b"%PDF-1.4", content_type="application/pdf")
+        with mock.patch("library.serializers.compute_text_embedding", return_value=None):
+            created = client.post(reverse("library-document-upload"), {"title": "Sprawozdanie", "category": "legal", "file": upload})
+        self.assertEqual(created.status_code, 201)
+
+        found = client.get(reverse("library-search"), {"q": "raport"})
+        blob_path = client.get(reverse("library-search"), {"q": "blob"})
+
+        self.assertEqual([document["title"] for document in found.data["results"]], ["Sprawozdanie"])
+        self.assertEqual(blob_path.data["results"], [])
+
+    def test_garbage_collection_removes_only_unreferenced_blobs(self):
+        kept = self._post(b"wspolny plik", "raport.xlsx")
+        removed = self._post(b"plik do usuniecia", "notatka.txt")
+        removed_name = removed.attachment.name
+        removed.delete()
+
+        storage = attachment_storage()
+        result = collect_unreferenced_blobs(grace_period=timedelta(0))
+
+        self.assertEqual(result.removed, 1)
+        self.assertGreater(result.bytes_reclaimed, 0)
+        self.assertFalse(storage.exists(removed_name))
+        self.assertTrue(storage.exists(kept.attachment.name))
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from datetime import date
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import EntityMembership, RegulatedEntity, User
+from communication.models import MessageThread, Report
+
+
+class ProtectedDownloadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, PROTECTED_MEDIA_BACKEND="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.entity = RegulatedEntity.objects.create(
+            name="Bank Testowy",
+            registration_number="RIP0000001",
+            sector="Bank",
+            address="ul. Prosta 1",
+            postal_code="00-001",
+            city="Warszawa",
+            contact_email="bank@test.com",
+            contact_phone="48111222333",
+        )
+        self.member = User.objects.create_user(
+            email="member@test.com", password="testpass123", role=User.UserRole.SUBMITTER
+        )
+        self.outsider = User.objects.create_user(
+            email="outsider@test.com", password="testpass123", role=User.UserRole.SUBMITTER
+        )
+        EntityMembership.objects.create(
+            user=self.member, entity=self.entity, role=EntityMembership.MembershipRole.SUBMITTER
+        )
+        self.payload = bytes(range(256)) * 40
+        file_path = default_storage.save("reports/sprawozdanie.xlsx", ContentFile(self.payload))
+        self.report = Report.objects.create(
+            entity=self.entity,
+            title="Sprawozdanie",
+            report_type="F01",
+            period_start=date(2025, 1, 1),
+            period_end=date(2025, 3, 31),
+            file_path=file_path,
+        )
+        self.url = f"/api/communication/reports/{self.report.pk}/download/"
+
+    def test_member_downloads_full_file_with_validators(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.payload)
+        self.assertIn("ETag", response)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("attachment", response["Content-Disposition"])
+
+        cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_range_request_returns_partial_content(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(self.payload)}")
+        self.assertEqual(b"".join(response.streaming_content), self.payload[100:200])
+
+        suffix = self.client.get(self.url, HTTP_RANGE="bytes=-10")
+        self.assertEqual(b"".join(suffix.streaming_content), self.payload[-10:])
+
+        unsatisfiable = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.payload)}-")
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+    def test_outsider_cannot_download_report(self):
+        self.client.force_authenticate(user=self.outsider)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(PROTECTED_MEDIA_BACKEND="nginx", PROTECTED_MEDIA_URL="/protected-media/")
+    def test_transfer_is_offloaded_to_web_server(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.report.file_path}")
+        self.assertEqual(response.content, b"")
+
+    def test_message_attachment_respects_recipient_visibility(self):
+        internal = User.objects.create_user(
+            email="uknf@test.com", password="testpass123", role=User.UserRole.SUPERVISOR
+        )
+        thread = MessageThread.objects.create(subject="Korespondencja", entity=self.entity, created_by=internal)
+        message = thread.add_message(
+            sender=internal,
+            content="Poufne",
+            attachment=ContentFile(b"poufny plik", name="pismo.pdf"),
+            recipient=internal,
+        )
+        url = f"/api/communication/messages/{thread.pk}/messages/{message.pk}/attachment/"
+
+        self.client.force_authenticate(user=self.member)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.force_authenticate(user=internal)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"poufny plik")
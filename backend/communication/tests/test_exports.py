@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import csv
+import io
+import zipfile
+from datetime import date
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import EntityMembership, RegulatedEntity, User
+from administration.models import AuditLogEntry
+from communication.models import LibraryDocument, Report
+
+
+def _csv_rows(response) -> list[dict[str, str]]:
+    content = b"".join(response.streaming_content).decode("utf-8-sig")
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+class StreamingExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.entities = [
+            RegulatedEntity.objects.create(
+                name=f"Bank Eksportowy {index}",
+                registration_number=f"RIP800000{index}",
+                sector="Bank",
+                address="ul. Prosta 1",
+                postal_code="00-001",
+                city="Warszawa" if index else "Kraków",
+                contact_email=f"bank{index}@test.com",
+                contact_phone="48111222333",
+            )
+            for index in range(2)
+        ]
+        self.member = User.objects.create_user(
+            email="eksport-member@test.com", password="testpass123", role=User.UserRole.SUBMITTER
+        )
+        EntityMembership.objects.create(
+            user=self.member, entity=self.entities[0], role=EntityMembership.MembershipRole.SUBMITTER
+        )
+        for entity in self.entities:
+            for status in (Report.ReportStatus.DRAFT, Report.ReportStatus.SUBMITTED):
+                Report.objects.create(
+                    entity=entity,
+                    title=f"Sprawozdanie {entity.registration_number} {status}",
+                    report_type="F01",
+                    period_start=date(2025, 1, 1),
+                    period_end=date(2025, 3, 31),
+                    status=status,
+                )
+
+    def test_report_export_applies_visibility_and_filters(self):
+        self.client.force_authenticate(self.member)
+
+        response = self.client.get(
+            "/api/communication/reports/export/",
+            {"status": "submitted", "fields": "title,entity_registration_number,status"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(
+            _csv_rows(response),
+            [{"title": "Sprawozdanie RIP8000000 submitted", "entity_registration_number": "RIP8000000", "status": "submitted"}],
+        )
+        self.assertTrue(AuditLogEntry.objects.filter(action="report.exported", actor=self.member).exists())
+
+    def test_entity_export_as_xlsx_uses_search(self):
+        self.client.force_authenticate(self.member)
+
+        response = self.client.get("/api/auth/entities/export/", {"output": "xlsx", "search": "Eksportowy", "city": "Kraków"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response["Content-Disposition"])
+        sheet = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))).read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn("RIP8000000", sheet)
+        self.assertNotIn("RIP8000001", sheet)
+
+    def test_export_rejects_unknown_format_and_fields(self):
+        self.client.force_authenticate(self.member)
+
+        self.assertEqual(self.client.get("/api/auth/entities/export/", {"output": "pdf"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/communication/reports/export/", {"fields": "file_path"}).status_code, 400)
+
+    def test_library_search_export_is_not_capped(self):
+        internal = User.objects.create_user(
+            email="eksport-analityk@test.com", password="testpass123", role=User.UserRole.ANALYST
+        )
+        LibraryDocument.objects.bulk_create(
+            LibraryDocument(title=f"Wytyczne {index}", category=LibraryDocument.DocumentCategory.LEGAL, version="1")
+            for index in range(60)
+        )
+        self.client.force_authenticate(internal)
+
+        search = self.client.get("/api/library/search", {"q": "wytyczne"})
+        export = self.client.get("/api/library/search/export", {"q": "wytyczne", "fields": "title,version"})
+
+        self.assertEqual(len(search.data["results"]), 50)
+        self.assertEqual(export.status_code, 200)
+        self.assertEqual(len(_csv_rows(export)), 60)
+
+    def test_library_export_names_files_as_uploaded(self):
+        internal = User.objects.create_user(email="eksport-plikow@test.com", password="testpass123", role=User.UserRole.ANALYST)
+        LibraryDocument.objects.create(
+            title="Wytyczne plikowe",
+            category=LibraryDocument.DocumentCategory.LEGAL,
+            version="1",
+            file=f"cas/ab/{'ab' * 32}/blob",
+            original_name="wytyczne-2025.pdf",
+        )
+        self.client.force_authenticate(internal)
+
+        export = self.client.get("/api/library/search/export", {"q": "plikowe", "fields": "title,original_name"})
+
+        self.assertEqual(_csv_rows(export), [{"title": "Wytyczne plikowe", "original_name": "wytyczne-2025.pdf"}])
+
+    def test_csv_cells_that_look_like_formulas_are_neutralised(self):
+        Report.objects.filter(entity=self.entities[0], status=Report.ReportStatus.DRAFT).update(title="=1+2")
+        Report.objects.filter(entity=self.entities[0], status=Report.ReportStatus.SUBMITTED).update(title="@SUMA(A1)")
+        self.client.force_authenticate(self.member)
+
+        csv_export = self.client.get("/api/communication/reports/export/", {"fields": "title,period_start"})
+        xlsx_export = self.client.get("/api/communication/reports/export/", {"fields": "title", "output": "xlsx"})
+
+        self.assertEqual(
+            sorted(_csv_rows(csv_export), key=lambda row: row["title"]),
+            [{"title": "'=1+2", "period_start": "2025-01-01"}, {"title": "'@SUMA(A1)", "period_start": "2025-01-01"}],
+        )
+        sheet = zipfile.ZipFile(io.BytesIO(b"".join(xlsx_export.streaming_content))).read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn(">=1+2<", sheet)
+        self.assertNotIn("'", sheet)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import smtplib
+import tempfile
+from contextlib import nullcontext
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from communication.mail_queue import deliver_queued_emails, enqueue_emails, requeue_dead_emails
+from communication.models import OutboundEmail
+
+
+def _message(index: int) -> EmailMessage:
+    return EmailMessage(f"Temat {index}", "Treść", None, [f"odbiorca{index}@example.com"], reply_to=["uknf@example.com"])
+
+
+class FlakyBackend(EmailBackend):
+    """Rejects every address listed in ``rejected`` and counts opened connections."""
+
+    rejected: set[str] = set()
+    opened = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        if any(address in self.rejected for message in messages for address in message.to):
+            raise smtplib.SMTPRecipientsRefused({})
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_QUEUE_RETRY_BASE_SECONDS=60, EMAIL_QUEUE_RETRY_MAX_SECONDS=600, EMAIL_QUEUE_MAX_ATTEMPTS=3)
+class OutboundEmailQueueTests(TestCase):
+    def setUp(self):
+        FlakyBackend.rejected = set()
+        FlakyBackend.opened = 0
+
+    def test_messages_are_queued_with_the_transaction(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            enqueue_emails([_message(0)])
+            raise RuntimeError
+        self.assertEqual(enqueue_emails(_message(index) for index in range(3)), 3)
+
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.Status.PENDING).count(), 3)
+
+    def test_batches_are_sent_over_one_connection(self):
+        enqueue_emails(_message(index) for index in range(5))
+
+        result = deliver_queued_emails(batch_size=2, connection=FlakyBackend())
+
+        self.assertEqual((result.sent, result.retried, result.dead), (5, 0, 0))
+        self.assertEqual(FlakyBackend.opened, 3)  # once per batch; a live SMTP session is reused
+        self.assertEqual([message.subject for message in mail.outbox], [f"Temat {index}" for index in range(5)])
+        self.assertEqual(mail.outbox[0].reply_to, ["uknf@example.com"])
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.Status.SENT).exists())
+
+    def test_failures_back_off_and_end_in_dead_letter(self):
+        enqueue_emails(_message(index) for index in range(2))
+        FlakyBackend.rejected = {"odbiorca1@example.com"}
+        start = timezone.now()
+
+        for attempt in range(1, 4):
+            now = mock.patch("communication.mail_queue.timezone.now", return_value=start + timedelta(days=attempt))
+            dead_letter_log = self.assertLogs("communication.mail_queue", "ERROR") if attempt == 3 else nullcontext()
+            with now, dead_letter_log:
+                result = deliver_queued_emails(connection=FlakyBackend())
+            failed = OutboundEmail.objects.get(to=["odbiorca1@example.com"])
+            self.assertEqual(failed.attempts, attempt)
+            if attempt < 3:
+                self.assertEqual(result.retried, 1)
+                delay = failed.next_attempt_at - (start + timedelta(days=attempt))
+                self.assertEqual(delay, timedelta(seconds=60 * 2 ** (attempt - 1)))
+
+        self.assertEqual(result.dead, 1)
+        self.assertEqual(failed.status, OutboundEmail.Status.DEAD)
+        self.assertTrue(failed.last_error.startswith("SMTPRecipientsRefused"))
+        self.assertEqual([message.to for message in mail.outbox], [["odbiorca0@example.com"]])
+
+        self.assertEqual(requeue_dead_emails(), 1)
+        FlakyBackend.rejected = set()
+        self.assertEqual(deliver_queued_emails(connection=FlakyBackend()).sent, 1)
+
+    def test_claimed_messages_are_not_picked_up_twice(self):
+        enqueue_emails([_message(0)])
+        OutboundEmail.objects.update(next_attempt_at=timezone.now() + timedelta(minutes=5))
+
+        self.assertEqual(deliver_queued_emails().sent, 0)
+
+    def test_worker_command_can_deliver_to_files(self):
+        enqueue_emails(_message(index) for index in range(2))
+        with tempfile.TemporaryDirectory() as directory:
+            backend = "django.core.mail.backends.filebased.EmailBackend"
+            with override_settings(EMAIL_QUEUE_BACKEND=backend, EMAIL_FILE_PATH=directory):
+                out = StringIO()
+                call_command("send_queued_emails", stdout=out)
+            written = "".join(path.read_text() for path in Path(directory).iterdir())
+
+        self.assertIn("Wysłano 2 wiadomości", out.getvalue())
+        self.assertIn("Subject: Temat 1", written)
+        self.assertEqual(mail.outbox, [])
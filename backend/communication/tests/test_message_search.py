@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import EntityMembership, RegulatedEntity, User
+from communication.models import MessageThread
+
+
+class MessageSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.entity = RegulatedEntity.objects.create(
+            name="Bank Testowy",
+            registration_number="RIP0000001",
+            sector="Bank",
+            address="ul. Prosta 1",
+            postal_code="00-001",
+            city="Warszawa",
+            contact_email="bank@test.com",
+            contact_phone="48111222333",
+        )
+        self.supervisor = User.objects.create_user(
+            email="uknf@test.com", password="testpass123", role=User.UserRole.SUPERVISOR
+        )
+        self.member = User.objects.create_user(
+            email="member@test.com", password="testpass123", role=User.UserRole.SUBMITTER
+        )
+        self.outsider = User.objects.create_user(
+            email="outsider@test.com", password="testpass123", role=User.UserRole.SUBMITTER
+        )
+        EntityMembership.objects.create(
+            user=self.member, entity=self.entity, role=EntityMembership.MembershipRole.SUBMITTER
+        )
+        self.thread = MessageThread.objects.create(
+            subject="Korekta sprawozdania kwartalnego", entity=self.entity, created_by=self.supervisor
+        )
+        self.thread.add_message(sender=self.supervisor, content="Prosimy o przesłanie korekty płynności <b>pilnie</b>.")
+        self.thread.add_message(sender=self.member, content="Korekta zostanie przesłana jutro.")
+        self.thread.add_message(
+            sender=self.supervisor,
+            content="Notatka o płynności tylko dla nadzoru.",
+            recipient=self.supervisor,
+        )
+        other = MessageThread.objects.create(subject="Inny temat", created_by=self.supervisor)
+        other.add_message(sender=self.supervisor, content="Pytanie o płynność innego podmiotu.")
+
+    def _search(self, user, query):
+        self.client.force_authenticate(user=user)
+        return self.client.get("/api/communication/messages/search/", {"q": query})
+
+    def test_internal_user_finds_matches_with_highlights(self):
+        response = self._search(self.supervisor, "płynności")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        for result in response.data["results"]:
+            self.assertIn("<mark>", result["body_highlight"])
+        self.assertNotIn("<b>", "".join(result["body_highlight"] for result in response.data["results"]))
+
+    def test_subject_match_returns_thread_messages(self):
+        response = self._search(self.supervisor, "kwartalnego")
+
+        self.assertEqual(response.data["count"], 3)
+        self.assertIn("<mark>", response.data["results"][0]["subject_highlight"])
+
+    def test_results_respect_thread_and_recipient_visibility(self):
+        member_results = self._search(self.member, "płynności")
+        self.assertEqual(member_results.data["count"], 1)
+
+        outsider_results = self._search(self.outsider, "płynności")
+        self.assertEqual(outsider_results.data["count"], 0)
+
+    def test_missing_query_is_rejected(self):
+        self.assertEqual(self._search(self.supervisor, " ").status_code, 400)
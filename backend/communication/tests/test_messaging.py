@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from administration.audit import audit_writer
+from administration.models import AuditLogEntry
+from communication.messaging import OutgoingMessage, post_message, post_messages
+from communication.models import Message, MessageThread
+
+
+class MessagePostingTests(TestCase):
+    def setUp(self):
+        self.supervisor = User.objects.create_user(
+            email="uknf@test.com", password="testpass123", role=User.UserRole.SUPERVISOR
+        )
+        self.submitter = User.objects.create_user(
+            email="podmiot@test.com", password="testpass123", role=User.UserRole.SUBMITTER
+        )
+        self.thread = MessageThread.objects.create(subject="Wyjaśnienia", created_by=self.submitter)
+
+    def test_post_message_uses_constant_number_of_statements(self):
+        # savepoint, message, participants, thread update, audit entry, notification event, release
+        with self.assertNumQueries(7):
+            message = post_message(self.thread, sender=self.supervisor, content="Prosimy o korektę", recipient=self.submitter)
+
+        self.assertEqual(set(self.thread.participants.all()), {self.supervisor, self.submitter})
+        self.assertTrue(
+            AuditLogEntry.objects.filter(action="thread.message", metadata__message_id=message.pk).exists()
+        )
+
+        # Existing participant links are skipped rather than duplicated.
+        with self.assertNumQueries(7):
+            post_message(self.thread, sender=self.submitter, content="Korekta w załączeniu", recipient=self.supervisor)
+        self.assertEqual(self.thread.participants.count(), 2)
+
+    def test_post_messages_statement_count_does_not_grow_with_batch(self):
+        threads = [
+            MessageThread.objects.create(subject=f"Powiadomienie {index}", created_by=self.supervisor)
+            for index in range(5)
+        ]
+        outgoing = [OutgoingMessage(thread=thread, body="Nowy komunikat", recipient=self.submitter) for thread in threads]
+
+        with self.assertNumQueries(7):
+            messages = post_messages(outgoing)
+
+        self.assertEqual(len(messages), 5)
+        self.assertTrue(all(message.pk for message in messages))
+        self.assertEqual(Message.objects.filter(thread__in=threads).count(), 5)
+        self.assertEqual(self.submitter.message_threads.filter(pk__in=[t.pk for t in threads]).count(), 5)
+        self.assertEqual(AuditLogEntry.objects.filter(action="thread.notification").count(), 5)
+
+    @override_settings(AUDIT_LOG_DURABILITY="on_commit", AUDIT_LOG_BUFFER_SIZE=100, AUDIT_LOG_FLUSH_INTERVAL=3600)
+    def test_post_messages_audit_entries_go_through_the_audit_writer(self):
+        self.addCleanup(audit_writer.flush)
+        outgoing = [OutgoingMessage(thread=self.thread, body=f"Komunikat {index}", recipient=self.submitter) for index in range(3)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post_messages(outgoing)
+        self.assertFalse(AuditLogEntry.objects.filter(action="thread.notification").exists())
+
+        audit_writer.flush()
+        self.assertEqual(AuditLogEntry.objects.filter(action="thread.notification").count(), 3)
+
+    def test_external_reply_goes_to_internal_participant_when_author_is_gone(self):
+        thread = MessageThread.objects.create(subject="Bez autora")
+        thread.participants.add(self.submitter, self.supervisor)
+
+        self.client.force_login(self.submitter)
+        response = self.client.post(
+            f"/api/communication/messages/{thread.pk}/messages/",
+            {"body": "Odpowiedź podmiotu"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Message.objects.get(pk=response.json()["id"]).recipient, self.supervisor)
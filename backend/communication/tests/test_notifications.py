@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import smtplib
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import EntityMembership, NotificationPreference, RegulatedEntity, User
+from communication.digests import send_digests
+from communication.messaging import post_message
+from communication.models import Announcement, DigestCursor, MessageThread, NotificationEvent, Report
+from communication.notifications import notify_announcement
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class NotificationDigestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.entity = RegulatedEntity.objects.create(
+            name="Bank Testowy",
+            registration_number="RIP0000001",
+            sector="Bank",
+            address="ul. Prosta 1",
+            postal_code="00-001",
+            city="Warszawa",
+            contact_email="bank@test.com",
+            contact_phone="48111222333",
+        )
+        self.supervisor = User.objects.create_user(
+            email="uknf@test.com", password="testpass123", role=User.UserRole.SUPERVISOR
+        )
+        self.submitter = User.objects.create_user(
+            email="podmiot@test.com", password="testpass123", role=User.UserRole.SUBMITTER
+        )
+        EntityMembership.objects.create(
+            user=self.submitter, entity=self.entity, role=EntityMembership.MembershipRole.SUBMITTER
+        )
+        # Keep accounts seeded by data migrations out of announcement fan-out.
+        User.objects.exclude(pk__in=[self.supervisor.pk, self.submitter.pk]).update(is_active=False)
+        self.thread = MessageThread.objects.create(subject="Wyjaśnienia", entity=self.entity, created_by=self.submitter)
+
+    def _collect_events(self):
+        post_message(self.thread, sender=self.supervisor, content="Prosimy o korektę", recipient=self.submitter)
+        report = Report.objects.create(
+            entity=self.entity,
+            title="Sprawozdanie kwartalne",
+            report_type="F01",
+            period_start="2025-01-01",
+            period_end="2025-03-31",
+            submitted_by=self.submitter,
+        )
+        self.client.force_authenticate(user=self.supervisor)
+        self.client.post(f"/api/communication/reports/{report.pk}/status/", {"status": "disputed"}, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/api/communication/announcements/",
+                {
+                    "title": "Nowe wymogi",
+                    "summary": "Zmiany",
+                    "content": "Treść",
+                    "requires_acknowledgement": True,
+                    "target_roles": [User.UserRole.SUBMITTER],
+                },
+                format="json",
+            )
+
+    def test_events_feed_unread_counters(self):
+        self._collect_events()
+
+        self.client.force_authenticate(user=self.submitter)
+        counts = self.client.get("/api/communication/notifications/unread/").json()
+        self.assertEqual(counts, {"message": 1, "report_status": 1, "announcement": 1, "total": 3})
+        self.assertEqual(NotificationEvent.objects.filter(user=self.supervisor).count(), 0)
+        page = self.client.get("/api/communication/notifications/", {"page_size": 2}).json()
+        self.assertEqual(len(page["results"]), 2)
+        self.assertEqual(len(self.client.get(page["next"]).json()["results"]), 1)
+
+        response = self.client.post("/api/communication/notifications/mark-read/", {"kind": "message"}, format="json")
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(response.json()["unread"]["total"], 2)
+
+    def test_digest_is_sent_once_per_event_batch(self):
+        self._collect_events()
+        NotificationPreference.objects.create(user=self.supervisor, daily_digest=False)
+
+        result = send_digests(DigestCursor.Frequency.DAILY)
+
+        self.assertEqual((result.users, result.events, result.emails_sent), (1, 3, 1))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["podmiot@test.com"])
+        self.assertIn("Sprawozdanie kwartalne", mail.outbox[0].body)
+
+        # The cursor moved past the digested events; only new ones are sent.
+        self.assertEqual(send_digests(DigestCursor.Frequency.DAILY).emails_sent, 0)
+        post_message(self.thread, sender=self.supervisor, content="Przypomnienie", recipient=self.submitter)
+        self.assertEqual(send_digests(DigestCursor.Frequency.DAILY).events, 1)
+
+    def test_failed_send_keeps_cursors_of_delivered_digests(self):
+        colleague = User.objects.create_user(email="kolega@test.com", password="testpass123", role=User.UserRole.SUBMITTER)
+        for user in (self.submitter, colleague):
+            NotificationEvent.objects.create(
+                user=user, kind=NotificationEvent.EventKind.MESSAGE, object_id=self.thread.pk, title="Wyjaśnienia"
+            )
+
+        class RejectingBackend(EmailBackend):
+            def send_messages(self, messages):
+                if messages[0].to == [colleague.email]:
+                    raise smtplib.SMTPRecipientsRefused({})
+                return super().send_messages(messages)
+
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            send_digests(DigestCursor.Frequency.DAILY, connection=RejectingBackend())
+
+        self.assertEqual(list(DigestCursor.objects.values_list("user_id", flat=True)), [self.submitter.pk])
+        result = send_digests(DigestCursor.Frequency.DAILY)
+        self.assertEqual(result.emails_sent, 1)
+        self.assertEqual([message.to for message in mail.outbox], [[self.submitter.email], [colleague.email]])
+
+    def test_weekly_digest_requires_opt_in(self):
+        self._collect_events()
+        self.assertEqual(send_digests(DigestCursor.Frequency.WEEKLY).users, 0)
+
+        NotificationPreference.objects.create(user=self.submitter, weekly_digest=True)
+        self.assertEqual(send_digests(DigestCursor.Frequency.WEEKLY).users, 1)
+
+    def test_announcement_fan_out_waits_for_the_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            announcement = Announcement.objects.create(
+                title="Pilne", summary="", content="", requires_acknowledgement=True, created_by=self.supervisor
+            )
+            notify_announcement(announcement)
+        self.assertFalse(NotificationEvent.objects.exists())
+
+        callbacks[0]()
+        self.assertEqual(list(NotificationEvent.objects.values_list("user_id", flat=True)), [self.submitter.pk])
+
+    def test_entity_thread_messages_reach_entity_members(self):
+        colleague = User.objects.create_user(email="kolega@test.com", password="testpass123", role=User.UserRole.SUBMITTER)
+        EntityMembership.objects.create(user=colleague, entity=self.entity, role=EntityMembership.MembershipRole.SUBMITTER)
+        EntityMembership.objects.create(
+            user=colleague, entity=self.entity, role=EntityMembership.MembershipRole.REPRESENTATIVE
+        )
+
+        post_message(self.thread, sender=self.supervisor, content="Pytanie do podmiotu")
+
+        self.assertEqual(
+            sorted(NotificationEvent.objects.values_list("user_id", flat=True)), sorted([self.submitter.pk, colleague.pk])
+        )
+        post_message(self.thread, sender=self.supervisor, content="Notatka", is_internal_note=True)
+        self.assertEqual(NotificationEvent.objects.count(), 2)
+
+    def test_announcement_without_acknowledgement_creates_no_events(self):
+        Announcement.objects.create(title="Informacja", summary="", content="", created_by=self.supervisor)
+        self.assertFalse(NotificationEvent.objects.exists())
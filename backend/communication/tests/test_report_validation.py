@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import io
+import math
+import tempfile
+import tracemalloc
 import unittest
+import zipfile
+from decimal import Decimal
 from pathlib import Path
 import sys
+from unittest import mock
 
 BACKEND_DIR = Path(__file__).resolve().parents[2]
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from communication.services import validate_report_workbook
+from communication import services
+from communication.services import VALIDATED_SHEETS, ColumnarSheet, SharedStrings, WorkbookReader, validate_report_workbook
 
 
 DATA_DIR = Path(__file__).resolve().parents[3] / "data"
@@ -38,6 +46,256 @@ class ValidateReportWorkbookTests(unittest.TestCase):
         self.assertIn("TOTAL_VALUE_MISMATCH", error_codes)
         self.assertGreaterEqual(len(result.errors), 3)
 
+    def test_only_requested_sheets_are_parsed(self):
+        reader = WorkbookReader(DATA_DIR / "G. RIP100000_Q1_2025.xlsx", sheets=VALIDATED_SHEETS)
+
+        self.assertEqual(set(reader.sheets), VALIDATED_SHEETS)
+        self.assertIn("listy", reader.sheet_targets)
+        self.assertIsNone(reader.get("listy", "A1"))
+
+    def test_range_accessors(self):
+        reader = WorkbookReader(DATA_DIR / "G. RIP100000_Q1_2025.xlsx", sheets=VALIDATED_SHEETS)
+
+        rows = reader.get_range("F01.02.01", "D7:D8")
+        self.assertEqual([row[0] for row in rows], [reader.get_decimal("F01.02.01", "D7"), reader.get_decimal("F01.02.01", "D8")])
+        self.assertEqual(reader.sum_range("F01.02.01", "D7:D8"), sum(row[0] for row in rows))
+        self.assertEqual(reader.get_range("listy", "A1:B2"), [])
+
+
+class ColumnarSheetTests(unittest.TestCase):
+    def test_cells_by_reference_and_range(self):
+        sheet = ColumnarSheet(shared_strings=["wspólny"])
+        sheet.set_string(0, 0, "Suma")
+        sheet.set_number(0, 3, 0.1)
+        sheet.set_number(1, 3, 0.2)
+        sheet.set_boolean(2, 3, True)
+        sheet.set_shared_string(3, 3, 0)
+        sheet.set_number(4, 3, 0.3)
+
+        self.assertEqual(len(sheet), 6)
+        self.assertEqual(sheet["D1"], Decimal("0.1"))
+        self.assertIs(sheet.get("D3"), True)
+        self.assertEqual(sheet.get("D4"), "wspólny")
+        self.assertIsNone(sheet.get("B1"))
+        self.assertIsNone(sheet.get("not-a-cell"))
+        self.assertEqual(dict(sheet.items())["A1"], "Suma")
+        self.assertEqual(sheet.get_range("C1:D2"), [[None, Decimal("0.1")], [None, Decimal("0.2")]])
+        self.assertEqual(sheet.sum_range("D1:D5"), Decimal("0.6"))
+        self.assertIsNone(sheet.sum_range("A1:A5"))
+
+        column = sheet.numeric_column(3)
+        self.assertEqual(len(column), 5)
+        self.assertTrue(math.isnan(column[2]))
+        with self.assertRaises(ValueError):
+            sheet.get_range("D1:ZZ")
+
+    def test_far_away_cells_cost_memory_per_cell(self):
+        cells = "".join(f'<c r="{column}1000000"><v>{index}</v></c>' for index, column in enumerate(("A", "AB", "ZZ")))
+        cells += '<c r="XFD1048576" t="inlineStr"><is><t>koniec</t></is></c>'
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr(
+                "xl/workbook.xml",
+                f'<workbook xmlns="{services.EXCEL_NS[1:-1]}" xmlns:r="{services.RID_NS[1:-1]}">'
+                '<sheets><sheet name="INFO" sheetId="1" r:id="rId1"/></sheets></workbook>',
+            )
+            archive.writestr(
+                "xl/_rels/workbook.xml.rels",
+                f'<Relationships xmlns="{services.REL_NS[1:-1]}">'
+                '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>',
+            )
+            archive.writestr(
+                "xl/worksheets/sheet1.xml",
+                f'<worksheet xmlns="{services.EXCEL_NS[1:-1]}"><sheetData><row r="1000000">{cells}</row></sheetData></worksheet>',
+            )
+
+        with tempfile.NamedTemporaryFile(suffix=".xlsx") as workbook:
+            workbook.write(buffer.getvalue())
+            workbook.flush()
+            tracemalloc.start()
+            try:
+                reader = WorkbookReader(workbook.name, sheets=VALIDATED_SHEETS)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        sheet = reader.sheets["INFO"]
+        self.assertLess(peak, 2 * 1024 * 1024)
+        self.assertEqual(len(sheet), 4)
+        self.assertEqual(sheet["AB1000000"], Decimal("1"))
+        self.assertEqual(sheet["XFD1048576"], "koniec")
+        self.assertEqual(sheet.sum_range("A999999:ZZ1000000"), Decimal("3"))
+
+    def test_cells_written_out_of_order_stay_sorted(self):
+        sheet = ColumnarSheet()
+        for row in (5, 1, 3, 1):
+            sheet.set_number(row, 0, row)
+
+        self.assertEqual(len(sheet), 3)
+        self.assertEqual([reference for reference, _ in sheet.items()], ["A2", "A4", "A6"])
+
+
+class XlsSheetParsingTests(unittest.TestCase):
+    class Sheet:
+        """Ragged rows as exposed by ``xlrd.sheet.Sheet``."""
+
+        def __init__(self, rows):
+            self.rows = rows
+            self.nrows = len(rows)
+
+        def row_len(self, row_index):
+            return len(self.rows[row_index])
+
+        def row_types(self, row_index, start, end):
+            return [cell_type for cell_type, _ in self.rows[row_index][start:end]]
+
+        def row_values(self, row_index, start, end):
+            return [value for _, value in self.rows[row_index][start:end]]
+
+    def test_cells_are_read_row_by_row(self):
+        import xlrd
+
+        sheet = self.Sheet(
+            [
+                [(xlrd.XL_CELL_TEXT, "Identyfikator"), (xlrd.XL_CELL_EMPTY, ""), (xlrd.XL_CELL_TEXT, "RIP1000000")],
+                [],
+                [(xlrd.XL_CELL_BLANK, ""), (xlrd.XL_CELL_NUMBER, 45658.0), (xlrd.XL_CELL_BOOLEAN, 1), (xlrd.XL_CELL_ERROR, 42)],
+            ]
+        )
+
+        cells = WorkbookReader.__new__(WorkbookReader)._parse_xls_sheet(sheet)
+
+        self.assertEqual(cells, {"A1": "Identyfikator", "C1": "RIP1000000", "B3": 45658, "C3": True})
+
+
+class SharedStringsTests(unittest.TestCase):
+    PAYLOAD = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="4" uniqueCount="4">'
+        "<si><t>Zwykły tekst</t></si>"
+        '<si><r><rPr><b/></rPr><t>Pogrubiony </t></r><r><t xml:space="preserve">fragment</t></r></si>'
+        "<si><t>A &amp; B</t></si>"
+        "<si/>"
+        "</sst>"
+    ).encode("utf-8")
+
+    def _archive(self) -> zipfile.ZipFile:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("xl/sharedStrings.xml", self.PAYLOAD)
+        return zipfile.ZipFile(buffer)
+
+    def test_items_are_decoded_on_demand(self):
+        strings = SharedStrings.from_archive(self._archive(), "xl/sharedStrings.xml")
+
+        self.assertEqual(len(strings), 4)
+        self.assertEqual(strings._cache, {})
+        self.assertEqual(strings[2], "A & B")
+        self.assertEqual(list(strings._cache), [2])
+        self.assertEqual(list(strings), ["Zwykły tekst", "Pogrubiony fragment", "A & B", ""])
+        with self.assertRaises(IndexError):
+            strings[4]
+
+    def test_large_tables_are_memory_mapped(self):
+        with mock.patch.object(services, "SHARED_STRINGS_MMAP_THRESHOLD", 0):
+            strings = SharedStrings.from_archive(self._archive(), "xl/sharedStrings.xml")
+        self.addCleanup(strings.close)
+
+        self.assertIsNotNone(strings._spool)
+        self.assertEqual(strings[1], "Pogrubiony fragment")
+        self.assertEqual(strings[-1], "")
+
+    def test_readers_close_the_table(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr(
+                "xl/workbook.xml",
+                f'<workbook xmlns="{services.EXCEL_NS[1:-1]}" xmlns:r="{services.RID_NS[1:-1]}">'
+                '<sheets><sheet name="INFO" sheetId="1" r:id="rId1"/></sheets></workbook>',
+            )
+            archive.writestr(
+                "xl/_rels/workbook.xml.rels",
+                f'<Relationships xmlns="{services.REL_NS[1:-1]}">'
+                '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>',
+            )
+            archive.writestr(
+                "xl/worksheets/sheet1.xml",
+                f'<worksheet xmlns="{services.EXCEL_NS[1:-1]}"><sheetData>'
+                '<row r="1"><c r="A1" t="s"><v>0</v></c></row><row r="2"><c r="A2" t="s"><v>2</v></c></row>'
+                "</sheetData></worksheet>",
+            )
+            archive.writestr("xl/sharedStrings.xml", self.PAYLOAD)
+
+        close = mock.patch.object(SharedStrings, "close", autospec=True, side_effect=SharedStrings.close)
+        threshold = mock.patch.object(services, "SHARED_STRINGS_MMAP_THRESHOLD", 0)
+        with tempfile.NamedTemporaryFile(suffix=".xlsx") as workbook, close as closed, threshold:
+            workbook.write(buffer.getvalue())
+            workbook.flush()
+
+            rows = services.iter_sheet_rows(workbook.name)
+            self.assertEqual(next(rows), (1, ["Zwykły tekst"]))
+            rows.close()
+            self.assertEqual(closed.call_count, 1)
+
+            with WorkbookReader(workbook.name) as reader:
+                self.assertEqual(reader.get("INFO", "A2"), "A & B")
+                self.assertEqual(closed.call_count, 1)
+            self.assertEqual(closed.call_count, 2)
+
+
+class IterSheetRowsTests(unittest.TestCase):
+    def _workbook(self, rows: int) -> io.BytesIO:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(
+                "xl/workbook.xml",
+                f'<workbook xmlns="{services.EXCEL_NS[1:-1]}" xmlns:r="{services.RID_NS[1:-1]}">'
+                '<sheets><sheet name="Users" sheetId="1" r:id="rId1"/></sheets></workbook>',
+            )
+            archive.writestr(
+                "xl/_rels/workbook.xml.rels",
+                f'<Relationships xmlns="{services.REL_NS[1:-1]}">'
+                '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>',
+            )
+            body = "".join(
+                f'<row r="{index}"><c r="A{index}" t="inlineStr"><is><t>user{index}</t></is></c>'
+                f'<c r="C{index}"><v>{index}.5</v></c><c r="D{index}" t="b"><v>1</v></c></row>'
+                for index in range(1, rows + 1)
+            )
+            archive.writestr(
+                "xl/worksheets/sheet1.xml",
+                f'<worksheet xmlns="{services.EXCEL_NS[1:-1]}"><sheetData>{body}</sheetData></worksheet>',
+            )
+        return buffer
+
+    def test_rows_are_decoded_like_the_reader(self):
+        with tempfile.NamedTemporaryFile(suffix=".xlsx") as workbook:
+            workbook.write(self._workbook(2).getvalue())
+            workbook.flush()
+            rows = list(services.iter_sheet_rows(workbook.name))
+            with WorkbookReader(workbook.name) as reader:
+                first_row = [reader.get("Users", reference) for reference in ("A1", "B1", "C1", "D1")]
+
+        self.assertEqual(rows[0], (1, ["user1", None, Decimal("1.5"), True]))
+        self.assertEqual(rows[1][0], 2)
+        self.assertEqual(first_row, rows[0][1])
+
+    def test_memory_does_not_grow_with_rows(self):
+        def peak(rows: int) -> int:
+            with tempfile.NamedTemporaryFile(suffix=".xlsx") as workbook:
+                workbook.write(self._workbook(rows).getvalue())
+                workbook.flush()
+                tracemalloc.start()
+                try:
+                    for _ in services.iter_sheet_rows(workbook.name):
+                        pass
+                    return tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+        # Rows left behind in <sheetData> would cost about 100 bytes each.
+        self.assertLess(peak(20_000) - peak(2_000), 256 * 1024)
+
 
 if __name__ == "__main__":
     unittest.main()
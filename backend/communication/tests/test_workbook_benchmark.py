@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from communication.services import WorkbookReader
+from communication.workbook_benchmark import measure_workbook, synthesize_workbook
+
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data"
+TEMPLATE = DATA_DIR / "G. RIP100000_Q1_2025.xlsx"
+
+
+class WorkbookBenchmarkTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.work_dir = Path(directory.name)
+
+    def test_synthesized_workbook_keeps_template_content(self):
+        template = WorkbookReader(TEMPLATE)
+        self.addCleanup(template.close)
+        padded_path = synthesize_workbook(TEMPLATE, self.work_dir / "padded.xlsx", rows=40, columns=6, sheets=2)
+        padded = WorkbookReader(padded_path)
+        self.addCleanup(padded.close)
+
+        self.assertEqual(
+            sum(len(cells) for cells in padded.sheets.values()) - sum(len(cells) for cells in template.sheets.values()),
+            40 * 6 * 2,
+        )
+        self.assertEqual(len(padded.shared_strings), len(template.shared_strings) + 80)
+        self.assertTrue(padded.shared_strings[-1].endswith("wiersz 39"))
+        self.assertEqual(padded.get_string("INFO", "C6"), template.get_string("INFO", "C6"))
+
+    def test_measurement_reports_phases_memory_and_profile(self):
+        path = synthesize_workbook(TEMPLATE, self.work_dir / "workbook_10.xlsx", rows=10)
+
+        measurement = measure_workbook(path, padded_rows=10, repeat=1, profiler="cprofile").to_dict()
+
+        self.assertEqual(measurement["status"], "validated")
+        self.assertEqual(set(measurement["phases_ms"]), {"shared_strings", "sheet_targets", "sheet_parse", "archive", "rules"})
+        self.assertGreater(measurement["peak_memory_bytes"], 0)
+        self.assertTrue(Path(measurement["profile"]).exists())
+        self.assertTrue(Path(measurement["profile"]).with_suffix(".txt").exists())
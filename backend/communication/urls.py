@@ -9,6 +9,7 @@ from .views import (
     FaqViewSet,
     LibraryDocumentViewSet,
     MessageThreadViewSet,
+    NotificationViewSet,
     ReportViewSet,
 )
 
@@ -19,6 +20,7 @@ router.register(r"messages", MessageThreadViewSet, basename="thread")
 router.register(r"announcements", AnnouncementViewSet, basename="announcement")
 router.register(r"library", LibraryDocumentViewSet, basename="library-document")
 router.register(r"faq", FaqViewSet, basename="faq")
+router.register(r"notifications", NotificationViewSet, basename="notification")
 
 urlpatterns = [
     path("", include(router.urls)),
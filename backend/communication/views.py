@@ -14,13 +14,19 @@ from django.db.models import Q
 from django.utils import timezone
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from library.utils import filter_documents_for_user
+from uknf_platform.downloads import serve_protected_file
+from uknf_platform.exports import StreamingExportMixin
 
-from accounts.models import EntityMembership, RegulatedEntity
+from accounts.models import EntityMembership, RegulatedEntity, User
+from accounts.authorization import get_authorization_context
+from accounts.lookup import find_entity_by_name, find_entity_by_registration_number
 from accounts.permissions import IsEntityMember, IsInternalUser
 from administration.models import AuditLogEntry
 from .models import (
@@ -29,9 +35,12 @@ from .models import (
     Case,
     FaqEntry,
     LibraryDocument,
+    Message,
     MessageThread,
+    NotificationEvent,
     Report,
 )
+from .exports import REPORT_EXPORT
 from .filters import MessageThreadFilter
 from .serializers import (
     AnnouncementAcknowledgeSerializer,
@@ -41,11 +50,17 @@ from .serializers import (
     GlobalMessageBroadcastSerializer,
     LibraryDocumentSerializer,
     MessageCreateSerializer,
+    MessageSearchResultSerializer,
     MessageSerializer,
     MessageThreadSerializer,
+    NotificationEventSerializer,
+    NotificationMarkReadSerializer,
     ReportSerializer,
     ReportStatusSerializer,
 )
+from .messaging import post_message
+from .notifications import mark_read, notify_announcement, notify_report_status, unread_counts
+from .search import search_messages
 from .services import validate_report_workbook
 
 
@@ -56,13 +71,14 @@ class UploadPreparationError(Exception):
     """Raised when an uploaded report file cannot be prepared for validation."""
 
 
-class ReportViewSet(viewsets.ModelViewSet):
+class ReportViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Report.objects.select_related("entity", "submitted_by").prefetch_related("timeline")
     serializer_class = ReportSerializer
     permission_classes = [IsAuthenticated]
     filterset_fields = ["entity", "status", "report_type"]
     ordering_fields = ["submitted_at", "validated_at", "created_at"]
     search_fields = ["title", "entity__name", "report_type"]
+    export_spec = REPORT_EXPORT
 
     def _resolve_entity_id(self, request) -> int | None:
         entity_id = request.data.get("entity_id") or request.query_params.get("entity_id")
@@ -71,20 +87,11 @@ class ReportViewSet(viewsets.ModelViewSet):
                 entity_id = int(entity_id)
             except (TypeError, ValueError):
                 return None
-            if request.user.is_internal:
+            context = get_authorization_context(request)
+            if context.is_internal:
                 return entity_id
-            member_entities = set(
-                EntityMembership.objects.filter(user=request.user).values_list("entity_id", flat=True)
-            )
-            return entity_id if entity_id in member_entities else None
-        membership = (
-            EntityMembership.objects.filter(user=request.user)
-            .exclude(entity__isnull=True)
-            .order_by("created_at")
-            .values_list("entity_id", flat=True)
-            .first()
-        )
-        return int(membership) if membership else None
+            return entity_id if context.is_member(entity_id) else None
+        return get_authorization_context(request).default_entity_id
 
     def _prepare_upload(self, uploaded_file):
         storage_key = f"reports/{uuid4().hex}_{uploaded_file.name}"
@@ -128,12 +135,12 @@ class ReportViewSet(viewsets.ModelViewSet):
         entity_name = str(metadata.get("entity_name") or "").strip() or None
 
         if identifier:
-            existing = RegulatedEntity.objects.filter(registration_number__iexact=identifier).first()
+            existing = find_entity_by_registration_number(identifier)
             if existing:
                 return existing
 
         if entity_name:
-            existing = RegulatedEntity.objects.filter(name__iexact=entity_name).first()
+            existing = find_entity_by_name(entity_name)
             if existing:
                 if identifier and not existing.registration_number:
                     existing.registration_number = identifier
@@ -168,7 +175,7 @@ class ReportViewSet(viewsets.ModelViewSet):
             entity.name = name[:255]
             entity.save(update_fields=["name", "updated_at"])
 
-        if not request.user.is_internal:
+        if not get_authorization_context(request).is_internal:
             EntityMembership.objects.get_or_create(
                 user=request.user,
                 entity=entity,
@@ -212,6 +219,7 @@ class ReportViewSet(viewsets.ModelViewSet):
                     created_by=request.user,
                     notes=summary,
                 )
+                notify_report_status(report, actor=request.user)
 
                 metadata = validation_payload.get("metadata", {})
                 entity_name = metadata.get("entity_name") or report.entity.name
@@ -255,10 +263,10 @@ class ReportViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         qs = super().get_queryset()
-        if self.request.user.is_internal:
+        context = get_authorization_context(self.request)
+        if context.is_internal:
             return qs
-        entity_ids = EntityMembership.objects.filter(user=self.request.user).values_list("entity_id", flat=True)
-        return qs.filter(Q(entity_id__in=entity_ids) | Q(submitted_by=self.request.user))
+        return qs.filter(Q(entity_id__in=context.entity_ids) | Q(submitted_by=self.request.user))
 
     @action(detail=True, methods=["post"], permission_classes=[IsInternalUser])
     def status(self, request, *args, **kwargs):
@@ -271,6 +279,7 @@ class ReportViewSet(viewsets.ModelViewSet):
             created_by=request.user,
             notes=serializer.validated_data.get("notes", ""),
         )
+        notify_report_status(report, actor=request.user)
         AuditLogEntry.record(
             actor=request.user,
             action="report.status_change",
@@ -278,6 +287,11 @@ class ReportViewSet(viewsets.ModelViewSet):
         )
         return Response(ReportSerializer(report).data)
 
+    @action(detail=True, methods=["get"])
+    def download(self, request, *args, **kwargs):
+        report = self.get_object()
+        return serve_protected_file(request, default_storage, report.file_path)
+
     @action(detail=True, methods=["post"], permission_classes=[IsEntityMember])
     def submit(self, request, *args, **kwargs):
         report = self.get_object()
@@ -371,11 +385,9 @@ class ReportViewSet(viewsets.ModelViewSet):
 
         metadata = validation_payload.get("metadata", {}) if validation_payload else {}
         entity = self._get_or_create_entity(request, metadata)
-        if not request.user.is_internal:
-            member_entities = set(
-                EntityMembership.objects.filter(user=request.user).values_list("entity_id", flat=True)
-            )
-            if member_entities and entity.pk not in member_entities:
+        context = get_authorization_context(request)
+        if not context.is_internal:
+            if context.entity_ids and not context.is_member(entity.pk):
                 cleanup_storage()
                 return Response(
                     {"detail": "Nie masz uprawnień do przesyłania sprawozdania dla tego podmiotu."},
@@ -446,10 +458,10 @@ class CaseViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         qs = super().get_queryset()
-        if self.request.user.is_internal:
+        context = get_authorization_context(self.request)
+        if context.is_internal:
             return qs
-        entity_ids = EntityMembership.objects.filter(user=self.request.user).values_list("entity_id", flat=True)
-        return qs.filter(entity_id__in=entity_ids)
+        return qs.filter(entity_id__in=context.entity_ids)
 
     def get_permissions(self):
         if self.action in {"create", "update", "partial_update", "destroy"}:
@@ -457,9 +469,15 @@ class CaseViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
 
+class MessageSearchPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
 class MessageThreadViewSet(viewsets.ModelViewSet):
     queryset = (
-        MessageThread.objects.select_related("entity", "created_by", "target_group")
+        MessageThread.objects.select_related("entity", "created_by", "target_group", "target_user")
         .prefetch_related("participants", "messages", "messages__sender", "messages__recipient")
         .order_by("-updated_at")
     )
@@ -469,14 +487,14 @@ class MessageThreadViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         qs = super().get_queryset()
-        if self.request.user.is_internal:
+        context = get_authorization_context(self.request)
+        if context.is_internal:
             return qs
-        entity_ids = EntityMembership.objects.filter(user=self.request.user).values_list("entity_id", flat=True)
         return qs.filter(
-            Q(entity_id__in=entity_ids)
+            Q(entity_id__in=context.entity_ids)
             | Q(participants=self.request.user)
             | Q(is_global=True)
-            | Q(target_group__users=self.request.user)
+            | Q(target_group_id__in=context.group_ids)
             | Q(target_user=self.request.user)
         ).distinct()
 
@@ -493,41 +511,66 @@ class MessageThreadViewSet(viewsets.ModelViewSet):
     def messages(self, request, *args, **kwargs):
         thread = self.get_object()
         if request.method == "GET":
-            messages = thread.messages.select_related("sender", "recipient")
-            if not request.user.is_internal:
-                messages = messages.filter(
-                    Q(recipient__isnull=True)
-                    | Q(recipient=request.user)
-                    | Q(sender=request.user)
-                )
+            messages = self._visible_messages(thread).select_related("sender", "recipient")
             serialized = MessageSerializer(messages, many=True, context={"request": request})
             return Response(serialized.data)
         serializer = MessageCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         attachment = serializer.validated_data.get("attachment")
-        recipient = None
-        if request.user.is_internal:
-            if thread.target_user:
-                recipient = thread.target_user
+        if get_authorization_context(request).is_internal:
+            recipient = thread.target_user
         else:
             recipient = thread.created_by
             if recipient is None:
-                recipient = thread.participants.filter(is_internal=True).first()
-        message = thread.add_message(
+                recipient = thread.participants.filter(role__in=User.INTERNAL_ROLES).first()
+        message = post_message(
+            thread,
             sender=request.user,
             content=serializer.validated_data["body"],
             is_internal_note=serializer.validated_data.get("is_internal_note", False),
             attachment=attachment,
             recipient=recipient,
         )
-        AuditLogEntry.record(
-            actor=request.user,
-            action="thread.message",
-            metadata={"thread_id": thread.pk, "message_id": message.pk},
-        )
         serialized = MessageSerializer(message, context={"request": request})
         return Response(serialized.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["get"])
+    def search(self, request, *args, **kwargs):
+        query = (request.query_params.get("q") or "").strip()
+        if not query:
+            return Response({"detail": "Podaj frazę wyszukiwania (parametr q)."}, status=status.HTTP_400_BAD_REQUEST)
+        messages = self._restrict_to_visible(Message.objects.filter(thread_id__in=self.get_queryset().values("id")))
+        entity_id = request.query_params.get("entity") or ""
+        if entity_id.isdigit():
+            messages = messages.filter(thread__entity_id=entity_id)
+        results = search_messages(messages.select_related("thread", "sender"), query)
+        paginator = MessageSearchPagination()
+        page = paginator.paginate_queryset(results, request, view=self)
+        serialized = MessageSearchResultSerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serialized.data)
+
+    @action(detail=True, methods=["get"], url_path=r"messages/(?P<message_id>\d+)/attachment")
+    def message_attachment(self, request, message_id=None, *args, **kwargs):
+        thread = self.get_object()
+        message = self._visible_messages(thread).filter(pk=message_id).first()
+        if message is None or not message.attachment:
+            raise NotFound("Załącznik nie istnieje.")
+        return serve_protected_file(
+            request, message.attachment.storage, message.attachment.name, filename=message.original_name or None
+        )
+
+    def _visible_messages(self, thread: MessageThread):
+        return self._restrict_to_visible(thread.messages.all())
+
+    def _restrict_to_visible(self, messages):
+        if not get_authorization_context(self.request).is_internal:
+            messages = messages.filter(
+                Q(recipient__isnull=True)
+                | Q(recipient=self.request.user)
+                | Q(sender=self.request.user)
+            )
+        return messages
+
     @action(
         detail=False,
         methods=["post"],
@@ -546,19 +589,13 @@ class MessageThreadViewSet(viewsets.ModelViewSet):
             target_group=serializer.validated_data.get("group"),
             target_user=serializer.validated_data.get("user"),
         )
-        thread.participants.add(request.user)
-        if thread.target_user:
-            thread.participants.add(thread.target_user)
-        message = thread.add_message(
+        post_message(
+            thread,
             sender=request.user,
             content=serializer.validated_data["body"],
             attachment=serializer.validated_data.get("attachment"),
             recipient=thread.target_user,
-        )
-        AuditLogEntry.record(
-            actor=request.user,
-            action="thread.broadcast",
-            metadata={"thread_id": thread.pk, "message_id": message.pk},
+            audit_action="thread.broadcast",
         )
         # Re-fetch the thread with all related objects to ensure proper serialization
         thread = self.get_queryset().get(pk=thread.pk)
@@ -579,6 +616,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         announcement = serializer.save(created_by=self.request.user)
+        notify_announcement(announcement)
         AuditLogEntry.record(actor=self.request.user, action="announcement.published", metadata={"id": announcement.pk})
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
@@ -599,6 +637,36 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         return Response(AnnouncementSerializer(announcement).data)
 
 
+class NotificationPagination(CursorPagination):
+    # Keyset pagination over the primary key: the feed only grows at the top,
+    # so pages neither shift nor slow down as new events arrive.
+    ordering = ("-id",)
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class NotificationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = NotificationEventSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = NotificationPagination
+    filterset_fields = ["kind"]
+
+    def get_queryset(self):
+        return NotificationEvent.objects.filter(user=self.request.user).order_by("-id")
+
+    @action(detail=False, methods=["get"])
+    def unread(self, request, *args, **kwargs):
+        return Response(unread_counts(request.user))
+
+    @action(detail=False, methods=["post"], url_path="mark-read")
+    def mark_as_read(self, request, *args, **kwargs):
+        serializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = mark_read(request.user, **serializer.validated_data)
+        return Response({"updated": updated, "unread": unread_counts(request.user)})
+
+
 class LibraryDocumentViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     queryset = LibraryDocument.objects.all().order_by("-published_at")
     serializer_class = LibraryDocumentSerializer
@@ -609,6 +677,13 @@ class LibraryDocumentViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         queryset = super().get_queryset()
         return filter_documents_for_user(queryset, getattr(self.request, "user", None))
 
+    @action(detail=True, methods=["get"])
+    def download(self, request, *args, **kwargs):
+        document = self.get_object()
+        if not document.file:
+            raise NotFound("Dokument nie posiada pliku.")
+        return serve_protected_file(request, document.file.storage, document.file.name, filename=document.original_name or None)
+
 
 class FaqViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     queryset = FaqEntry.objects.filter(is_active=True).order_by("order")
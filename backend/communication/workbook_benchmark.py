@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import re
+import statistics
+import time
+import tracemalloc
+import zipfile
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from xml.sax.saxutils import escape
+
+from .services import VALIDATED_SHEETS, WorkbookReader, _column_label, validate_report_workbook, validate_workbook
+
+DEFAULT_TEMPLATE_NAME = "G. RIP100000_Q1_2025.xlsx"
+DEFAULT_ROW_COUNTS = (0, 1_000, 10_000, 50_000)
+PROFILERS = ("cprofile", "pyinstrument")
+
+_ROW_NUMBER = re.compile(rb'<row[^>]*\br="(\d+)"')
+_SHARED_STRING = re.compile(rb"<si[\s>]")
+_COUNT_ATTRIBUTES = re.compile(rb'\s(?:count|uniqueCount)="\d+"')
+
+
+class TimedWorkbookReader(WorkbookReader):
+    """``WorkbookReader`` accumulating the time spent in each parsing phase."""
+
+    def __init__(self, file_path: str | Path, **kwargs):
+        self.timings: defaultdict[str, float] = defaultdict(float)
+        super().__init__(file_path, **kwargs)
+
+    @contextmanager
+    def _phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - started
+
+    def _load_shared_strings(self, archive):
+        with self._phase("shared_strings"):
+            return super()._load_shared_strings(archive)
+
+    def _load_sheet_targets(self, archive):
+        with self._phase("sheet_targets"):
+            return super()._load_sheet_targets(archive)
+
+    def _parse_sheet(self, payload):
+        with self._phase("sheet_parse"):
+            return super()._parse_sheet(payload)
+
+    def _load_xls_workbook(self):
+        with self._phase("xls_load"):
+            return super()._load_xls_workbook()
+
+
+@dataclass
+class WorkbookMeasurement:
+    padded_rows: int
+    file_bytes: int
+    cells: int
+    shared_strings: int
+    seconds: list[float] = field(default_factory=list)
+    phases: dict[str, float] = field(default_factory=dict)
+    peak_memory_bytes: int = 0
+    status: str = ""
+    profile_path: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "padded_rows": self.padded_rows,
+            "file_bytes": self.file_bytes,
+            "cells": self.cells,
+            "shared_strings": self.shared_strings,
+            "median_ms": round(statistics.median(self.seconds) * 1000, 3),
+            "min_ms": round(min(self.seconds) * 1000, 3),
+            "max_ms": round(max(self.seconds) * 1000, 3),
+            "phases_ms": {name: round(value * 1000, 3) for name, value in self.phases.items()},
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "status": self.status,
+            "profile": self.profile_path,
+        }
+
+
+def synthesize_workbook(
+    template: Path,
+    destination: Path,
+    *,
+    rows: int,
+    columns: int = 12,
+    sheets: int = 3,
+) -> Path:
+    """Write a copy of ``template`` whose first ``sheets`` worksheets gain ``rows`` extra rows.
+
+    Padding rows alternate numeric cells with shared-string cells; every row
+    adds one new distinct shared string, so ``sharedStrings.xml`` grows with
+    the sheets the way real, text-heavy submissions do.
+    """
+    with zipfile.ZipFile(template) as source:
+        reader_targets = _worksheet_members(source)[:sheets]
+        shared_strings = source.read("xl/sharedStrings.xml")
+        base_count = len(_SHARED_STRING.findall(shared_strings))
+        padded_members: dict[str, bytes] = {}
+        new_strings: list[str] = []
+        if rows:
+            for member in reader_targets:
+                padded_members[member] = _pad_sheet(
+                    source.read(member),
+                    rows=rows,
+                    columns=columns,
+                    first_string=base_count + len(new_strings),
+                )
+                new_strings.extend(f"Pozycja {member.rsplit('/', 1)[-1]} wiersz {index}" for index in range(rows))
+            padded_members["xl/sharedStrings.xml"] = _append_shared_strings(shared_strings, new_strings)
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(destination, "w", compression=zipfile.ZIP_DEFLATED) as target:
+            for info in source.infolist():
+                payload = padded_members.get(info.filename)
+                target.writestr(info.filename, payload if payload is not None else source.read(info))
+    return destination
+
+
+def measure_workbook(
+    path: Path,
+    *,
+    padded_rows: int,
+    repeat: int = 3,
+    profiler: str | None = None,
+    profile_dir: Path | None = None,
+) -> WorkbookMeasurement:
+    """Time ``repeat`` end-to-end validations, then one phase-timed and one tracemalloc run."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        validate_report_workbook(path)
+        durations.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with TimedWorkbookReader(path, sheets=VALIDATED_SHEETS) as reader:
+        reader_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        result = validate_workbook(reader)
+        phases = dict(reader.timings)
+        phases["archive"] = max(reader_seconds - sum(phases.values()), 0.0)
+        phases["rules"] = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        validate_report_workbook(path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    measurement = WorkbookMeasurement(
+        padded_rows=padded_rows,
+        file_bytes=path.stat().st_size,
+        cells=sum(len(cells) for cells in reader.sheets.values()),
+        shared_strings=len(reader.shared_strings),
+        seconds=durations,
+        phases=phases,
+        peak_memory_bytes=peak,
+        status=result.status,
+    )
+    if profiler:
+        measurement.profile_path = str(_profile(path, profiler, (profile_dir or path.parent) / path.stem))
+    return measurement
+
+
+def run_workbook_benchmark(
+    template: Path,
+    work_dir: Path,
+    *,
+    row_counts: tuple[int, ...] = DEFAULT_ROW_COUNTS,
+    columns: int = 12,
+    sheets: int = 3,
+    repeat: int = 3,
+    profiler: str | None = None,
+) -> list[WorkbookMeasurement]:
+    measurements = []
+    for rows in row_counts:
+        path = synthesize_workbook(template, work_dir / f"workbook_{rows}.xlsx", rows=rows, columns=columns, sheets=sheets)
+        measurements.append(measure_workbook(path, padded_rows=rows, repeat=repeat, profiler=profiler, profile_dir=work_dir))
+    return measurements
+
+
+def _profile(path: Path, profiler: str, output_stem: Path) -> Path:
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError as exc:
+            raise RuntimeError("Pakiet 'pyinstrument' nie jest zainstalowany.") from exc
+        session = Profiler()
+        session.start()
+        validate_report_workbook(path)
+        session.stop()
+        output = output_stem.with_suffix(".html")
+        output.write_text(session.output_html(), encoding="utf-8")
+        return output
+
+    session = cProfile.Profile()
+    session.runcall(lambda: validate_report_workbook(path))
+    output = output_stem.with_suffix(".prof")
+    session.dump_stats(output)
+    summary = io.StringIO()
+    pstats.Stats(session, stream=summary).sort_stats("cumulative").print_stats(25)
+    output.with_suffix(".txt").write_text(summary.getvalue(), encoding="utf-8")
+    return output
+
+
+def _worksheet_members(archive: zipfile.ZipFile) -> list[str]:
+    members = [name for name in archive.namelist() if re.fullmatch(r"xl/worksheets/sheet\d+\.xml", name)]
+    return sorted(members, key=lambda name: int(re.search(r"(\d+)\.xml$", name).group(1)))
+
+
+def _pad_sheet(payload: bytes, *, rows: int, columns: int, first_string: int) -> bytes:
+    start = max((int(number) for number in _ROW_NUMBER.findall(payload)), default=0) + 1
+    labels = [_column_label(index) for index in range(columns)]
+    padding = []
+    for offset in range(rows):
+        row_number = start + offset
+        cells = []
+        for index, label in enumerate(labels):
+            reference = f"{label}{row_number}"
+            if index % 2:
+                cells.append(f'<c r="{reference}" t="s"><v>{first_string + offset}</v></c>')
+            else:
+                cells.append(f'<c r="{reference}"><v>{row_number * 10 + index}.25</v></c>')
+        padding.append(f'<row r="{row_number}">{"".join(cells)}</row>')
+    block = "".join(padding).encode("utf-8")
+    if b"</sheetData>" in payload:
+        return payload.replace(b"</sheetData>", block + b"</sheetData>", 1)
+    return payload.replace(b"<sheetData/>", b"<sheetData>" + block + b"</sheetData>", 1)
+
+
+def _append_shared_strings(payload: bytes, strings: list[str]) -> bytes:
+    # Counts are advisory; drop them rather than keep stale values.
+    payload = _COUNT_ATTRIBUTES.sub(b"", payload, count=2)
+    block = "".join(f"<si><t>{escape(text)}</t></si>" for text in strings).encode("utf-8")
+    return payload.replace(b"</sst>", block + b"</sst>", 1)
+
+
+__all__ = [
+    "DEFAULT_ROW_COUNTS",
+    "TimedWorkbookReader",
+    "WorkbookMeasurement",
+    "measure_workbook",
+    "run_workbook_benchmark",
+    "synthesize_workbook",
+]
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from uknf_platform.exports import ExportSpec
+
+LIBRARY_SEARCH_EXPORT = ExportSpec(
+    name="library-search",
+    audit_action="library.exported",
+    columns={
+        "id": "id",
+        "title": "title",
+        "category": "category",
+        "version": "version",
+        "published_at": "published_at",
+        "description": "description",
+        "document_url": "document_url",
+        "original_name": "original_name",
+    },
+)
+
+
+__all__ = ["LIBRARY_SEARCH_EXPORT"]
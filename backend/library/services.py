@@ -73,19 +73,27 @@ def _tokenize_query(query: str) -> Iterable[str]:
 def select_relevant_documents(
     question: str,
     user: AnonymousUser | User | None = None,
+    *,
+    embedding: Sequence[float] | None = None,
 ) -> list[LibraryDocument]:
     accessible_documents = filter_documents_for_user(
         LibraryDocument.objects.all(),
         user,
     )
-    semantic_matches = _semantic_search(question, accessible_documents)
+    semantic_matches = _semantic_search(question, accessible_documents, embedding=embedding)
     if semantic_matches:
         return semantic_matches
     return _fallback_documents(question, accessible_documents)
 
 
-def _semantic_search(question: str, queryset: QuerySet[LibraryDocument]) -> list[LibraryDocument]:
-    embedding = compute_text_embedding(question)
+def _semantic_search(
+    question: str,
+    queryset: QuerySet[LibraryDocument],
+    *,
+    embedding: Sequence[float] | None = None,
+) -> list[LibraryDocument]:
+    # A precomputed question embedding skips the embeddings API call.
+    embedding = embedding or compute_text_embedding(question)
     if not embedding:
         return []
 
@@ -126,7 +134,7 @@ def _fallback_documents(
             query |= Q(description__icontains=token)
             query |= Q(content__icontains=token)
             query |= Q(document_url__icontains=token)
-            query |= Q(file__icontains=token)
+            query |= Q(original_name__icontains=token)
         queryset = queryset.filter(query)
     documents = list(queryset.order_by("-published_at")[:MAX_DOCUMENTS])
     if not documents:
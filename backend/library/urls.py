@@ -7,12 +7,14 @@ from .views import (
     LibraryDocumentUploadView,
     LibraryOverviewView,
     LibraryQuestionAnswerView,
+    LibrarySearchExportView,
     LibrarySearchView,
 )
 
 urlpatterns = [
     path("overview", LibraryOverviewView.as_view(), name="library-overview"),
     path("search", LibrarySearchView.as_view(), name="library-search"),
+    path("search/export", LibrarySearchExportView.as_view(), name="library-search-export"),
     path("documents", LibraryDocumentUploadView.as_view(), name="library-document-upload"),
     path("documents/<int:document_id>", LibraryDocumentDetailView.as_view(), name="library-document-detail"),
     path("qa", LibraryQuestionAnswerView.as_view(), name="library-question"),
@@ -12,7 +12,10 @@ from rest_framework.views import APIView
 from communication.models import FaqEntry, LibraryDocument
 from communication.serializers import FaqEntrySerializer, LibraryDocumentSerializer
 from accounts.permissions import IsInternalUser
+from uknf_platform.exports import ExportError, record_export
+from uknf_platform.storage import release_stored_file
 
+from .exports import LIBRARY_SEARCH_EXPORT
 from .serializers import LibraryDocumentUploadSerializer, LibraryQuestionSerializer
 from .services import generate_library_answer
 from .utils import filter_documents_for_user
@@ -46,21 +49,10 @@ class LibrarySearchView(APIView):
 
     def get(self, request, *args, **kwargs):
         query = request.query_params.get("q", "").lower()
-        documents_qs = filter_documents_for_user(
-            LibraryDocument.objects.all(),
-            request.user,
-        )
-        if query:
-            documents_qs = documents_qs.filter(
-                Q(title__icontains=query)
-                | Q(description__icontains=query)
-                | Q(document_url__icontains=query)
-                | Q(file__icontains=query)
-            )
         return Response(
             {
                 "results": LibraryDocumentSerializer(
-                    documents_qs.order_by("-published_at")[:50],
+                    _search_documents(request, query)[:50],
                     many=True,
                     context={"request": request},
                 ).data,
@@ -69,6 +61,36 @@ class LibrarySearchView(APIView):
         )
 
 
+class LibrarySearchExportView(APIView):
+    """Every document matching ``?q=`` (the search view returns the first 50) as CSV or XLSX."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            output, fields = LIBRARY_SEARCH_EXPORT.parse(request.query_params)
+        except ExportError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        documents_qs = _search_documents(request, request.query_params.get("q", "").lower())
+        record_export(request, LIBRARY_SEARCH_EXPORT, output, fields)
+        return LIBRARY_SEARCH_EXPORT.stream(documents_qs, output, fields)
+
+
+def _search_documents(request, query: str):
+    documents_qs = filter_documents_for_user(
+        LibraryDocument.objects.all(),
+        request.user,
+    )
+    if query:
+        documents_qs = documents_qs.filter(
+            Q(title__icontains=query)
+            | Q(description__icontains=query)
+            | Q(document_url__icontains=query)
+            | Q(original_name__icontains=query)
+        )
+    return documents_qs.order_by("-published_at")
+
+
 class LibraryDocumentUploadView(APIView):
     permission_classes = [IsAuthenticated, IsInternalUser]
     parser_classes = [MultiPartParser, FormParser]
@@ -91,16 +113,13 @@ class LibraryDocumentDetailView(APIView):
             return Response({"detail": "Nie znaleziono dokumentu."}, status=status.HTTP_404_NOT_FOUND)
 
         stored_file = document.file
-        stored_file_name = stored_file.name if stored_file else ""
-        storage = stored_file.storage if stored_file else None
 
         document.delete()
 
-        if storage and stored_file_name:
-            try:
-                storage.delete(stored_file_name)
-            except Exception as exc:  # pragma: no cover - storage backend safety
-                logger.warning("Nie udało się usunąć pliku dokumentu %s: %s", document_id, exc)
+        try:
+            release_stored_file(stored_file)
+        except Exception as exc:  # pragma: no cover - storage backend safety
+            logger.warning("Nie udało się usunąć pliku dokumentu %s: %s", document_id, exc)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
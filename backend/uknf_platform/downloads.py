@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+import re
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date, parse_etags, quote_etag
+from rest_framework.exceptions import NotFound
+
+from .storage import blob_digest
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class StoredFileInfo:
+    size: int
+    modified: float | None
+    etag: str
+    local_path: str | None
+
+
+def serve_protected_file(request, storage, name: str | None, *, filename: str | None = None) -> HttpResponse:
+    """Return a download response for ``name`` once the caller checked visibility.
+
+    Depending on ``PROTECTED_MEDIA_BACKEND`` the transfer is handed off to the
+    front web server (``X-Accel-Redirect`` for nginx, ``X-Sendfile`` for
+    Apache/lighttpd) or streamed by Django with ``ETag``/``If-None-Match`` and
+    single ``Range`` request support.
+    """
+    if not name or not storage.exists(name):
+        raise NotFound("Plik nie istnieje.")
+
+    info = _describe(storage, name)
+    filename = filename or PurePosixPath(name).name
+    if _etag_matches(request.headers.get("If-None-Match"), info.etag):
+        response = HttpResponseNotModified()
+        _set_validators(response, info)
+        return response
+
+    backend = getattr(settings, "PROTECTED_MEDIA_BACKEND", "")
+    if backend == "nginx":
+        response = HttpResponse(content_type=_content_type(filename))
+        response["X-Accel-Redirect"] = settings.PROTECTED_MEDIA_URL.rstrip("/") + "/" + quote(name)
+    elif backend == "sendfile" and info.local_path:
+        response = HttpResponse(content_type=_content_type(filename))
+        response["X-Sendfile"] = info.local_path
+    else:
+        response = _stream(request, storage, name, info, filename)
+
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    response["Accept-Ranges"] = "bytes"
+    _set_validators(response, info)
+    return response
+
+
+def _stream(request, storage, name: str, info: StoredFileInfo, filename: str) -> HttpResponse:
+    byte_range = _requested_range(request, info)
+    if byte_range == "invalid":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{info.size}"
+        return response
+
+    handle = storage.open(name, "rb")
+    if byte_range is None:
+        return FileResponse(handle, content_type=_content_type(filename))
+
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        _iter_range(handle, start, end - start + 1),
+        status=206,
+        content_type=_content_type(filename),
+    )
+    response["Content-Length"] = str(end - start + 1)
+    response["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+    return response
+
+
+def _requested_range(request, info: StoredFileInfo) -> tuple[int, int] | str | None:
+    header = request.headers.get("Range")
+    if not header:
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range.strip() != quote_etag(info.etag):
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        # Multiple or malformed ranges – serve the whole file as RFC 9110 permits.
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return "invalid"
+        return max(info.size - length, 0), info.size - 1
+    start = int(first)
+    end = int(last) if last else info.size - 1
+    if start >= info.size or end < start:
+        return "invalid"
+    return start, min(end, info.size - 1)
+
+
+def _iter_range(handle, start: int, length: int):
+    try:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def _describe(storage, name: str) -> StoredFileInfo:
+    local_path: str | None
+    try:
+        local_path = storage.path(name)
+    except NotImplementedError:
+        local_path = None
+
+    if local_path:
+        stat = os.stat(local_path)
+        size, modified = stat.st_size, stat.st_mtime
+        version = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+    else:
+        size, modified = storage.size(name), None
+        version = f"{size:x}-{quote(name)}"
+    # Content-addressed names carry the SHA-256 of the file, which is the ideal
+    # strong validator and stays stable across copies.
+    return StoredFileInfo(size=size, modified=modified, etag=blob_digest(name) or version, local_path=local_path)
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    return "*" in candidates or quote_etag(etag) in candidates or f"W/{quote_etag(etag)}" in candidates
+
+
+def _set_validators(response: HttpResponse, info: StoredFileInfo) -> None:
+    response["ETag"] = quote_etag(info.etag)
+    if info.modified is not None:
+        response["Last-Modified"] = http_date(info.modified)
+    response["Cache-Control"] = "private, no-cache"
+
+
+def _content_type(filename: str) -> str:
+    content_type, _ = mimetypes.guess_type(filename)
+    return content_type or "application/octet-stream"
+
+
+__all__ = ["serve_protected_file"]
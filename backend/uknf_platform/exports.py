@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import csv
+import json
+import re
+import zipfile
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, Sequence
+from xml.sax.saxutils import escape
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Characters XML 1.0 cannot carry; Excel refuses files containing them.
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+# Leading characters that make spreadsheet applications evaluate a CSV cell
+# as a formula; such text is prefixed with an apostrophe.
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+_XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the formatted line back to the caller."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(columns: Sequence[str], rows: Iterable[Sequence[Any]]):
+    writer = csv.writer(_Echo())
+    # A BOM lets spreadsheet applications detect UTF-8 (Polish diacritics).
+    yield "\ufeff" + writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def iter_ndjson(columns: Sequence[str], rows: Iterable[Sequence[Any]]):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def iter_xlsx(columns: Sequence[str], rows: Iterable[Sequence[Any]], *, sheet_name: str = "Eksport"):
+    """Yield a single-sheet XLSX workbook as it is being compressed.
+
+    The zip archive is written to a buffer that is drained after every row,
+    and cells use inline strings instead of a shared-string table, so memory
+    use stays constant however many rows are exported.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr("xl/workbook.xml", _workbook_xml(sheet_name))
+        yield buffer.drain()
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(1, columns))
+            for number, row in enumerate(rows, start=2):
+                sheet.write(_xlsx_row(number, row))
+                chunk = buffer.drain()
+                if chunk:
+                    yield chunk
+            sheet.write(b"</sheetData></worksheet>")
+    yield buffer.drain()
+
+
+def streaming_export_response(content, *, content_type: str, filename: str) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+class _ChunkBuffer:
+    """Write-only, non-seekable sink for ``zipfile``; ``drain`` hands back what was written."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _workbook_xml(sheet_name: str) -> str:
+    name = escape(_XML_ILLEGAL.sub("", sheet_name)[:31], {'"': "&quot;"})
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    )
+
+
+def _xlsx_row(number: int, values: Sequence[Any]) -> bytes:
+    cells = []
+    for index, value in enumerate(values):
+        reference = f"{_column_letter(index)}{number}"
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool):
+            cells.append(f'<c r="{reference}" t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, float, Decimal)):
+            cells.append(f'<c r="{reference}"><v>{value}</v></c>')
+        else:
+            # Inline strings are never evaluated, so XLSX cells need no formula guard.
+            text = escape(_XML_ILLEGAL.sub("", str(_text_value(value))))
+            cells.append(f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'.encode("utf-8")
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", iter_csv),
+    "xlsx": (XLSX_CONTENT_TYPE, iter_xlsx),
+    "ndjson": ("application/x-ndjson; charset=utf-8", iter_ndjson),
+}
+
+
+class ExportError(ValueError):
+    """Raised for an unsupported ``output`` or unknown ``fields`` in an export request."""
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Columns and formats one resource can be exported with.
+
+    ``columns`` maps output column names to ORM lookups; rows are read with
+    ``values_list(...).iterator()``, so no model instances or serializers are
+    built and memory use does not depend on the export size.
+    """
+
+    name: str
+    columns: Mapping[str, str]
+    # Audit log action recorded for every export, e.g. ``"report.exported"``.
+    audit_action: str
+    formats: tuple[str, ...] = ("csv", "xlsx")
+
+    def parse(self, query_params) -> tuple[str, list[str]]:
+        """Return ``(output, fields)`` from ``?output=`` and the comma separated ``?fields=``."""
+        output = query_params.get("output") or self.formats[0]
+        if output not in self.formats:
+            raise ExportError(f"Nieobsługiwany format eksportu: {output}. Dostępne: {', '.join(self.formats)}.")
+        raw = query_params.get("fields")
+        if not raw:
+            return output, list(self.columns)
+        fields = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = [name for name in fields if name not in self.columns]
+        if unknown or not fields:
+            raise ExportError(f"Nieznane pola eksportu: {', '.join(unknown) or raw}. Dostępne: {', '.join(self.columns)}.")
+        return output, list(dict.fromkeys(fields))
+
+    def stream(self, queryset: QuerySet, output: str, fields: Sequence[str] | None = None) -> StreamingHttpResponse:
+        fields = list(fields or self.columns)
+        content_type, render = EXPORT_FORMATS[output]
+        # Prefetches would be evaluated per chunk and are useless for tuples.
+        rows = (
+            queryset.prefetch_related(None)
+            .values_list(*(self.columns[name] for name in fields))
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        filename = f"{self.name}-{timezone.now():%Y%m%d-%H%M%S}.{output}"
+        return streaming_export_response(render(fields, rows), content_type=content_type, filename=filename)
+
+
+class StreamingExportMixin:
+    """Adds ``GET <list>/export`` to a viewset, honouring its filters, search and ordering.
+
+    Set ``export_spec``; the action uses the viewset's own ``get_queryset`` and
+    ``filter_queryset``, so permissions and visibility match the list view.
+    """
+
+    export_spec: ExportSpec
+
+    @action(detail=False, methods=["get"], url_path="export", url_name="export")
+    def export(self, request, *args, **kwargs):
+        try:
+            output, fields = self.export_spec.parse(request.query_params)
+        except ExportError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = self.filter_queryset(self.get_queryset())
+        record_export(request, self.export_spec, output, fields)
+        return self.export_spec.stream(queryset, output, fields)
+
+
+def record_export(request, spec: ExportSpec, output: str, fields: Sequence[str]) -> None:
+    from administration.models import AuditLogEntry
+
+    AuditLogEntry.record(
+        actor=request.user,
+        action=spec.audit_action,
+        metadata={"format": output, "fields": list(fields), "filters": dict(request.query_params.items())},
+        request=request,
+    )
+
+
+def _csv_value(value: Any) -> Any:
+    value = _text_value(value)
+    if isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _text_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+__all__ = [
+    "EXPORT_CHUNK_SIZE",
+    "EXPORT_FORMATS",
+    "ExportError",
+    "ExportSpec",
+    "StreamingExportMixin",
+    "XLSX_CONTENT_TYPE",
+    "iter_csv",
+    "iter_ndjson",
+    "iter_xlsx",
+    "record_export",
+    "streaming_export_response",
+]
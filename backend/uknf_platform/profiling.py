@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.permissions import BasePermission
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_TRACKED_FINGERPRINTS = 500
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_current_profile: contextvars.ContextVar["RequestProfile | None"] = contextvars.ContextVar("request_profile", default=None)
+
+
+def fingerprint_sql(sql: str) -> str:
+    """Collapse literals and ``IN (...)`` lists so repeated statements group together."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class RequestProfile:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    query_seconds: float = 0.0
+    serializer_seconds: float = 0.0
+    serializer_depth: int = 0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record_query(self, sql: str, seconds: float) -> None:
+        self.queries += 1
+        self.query_seconds += seconds
+        self.fingerprints[fingerprint_sql(sql)] += 1
+
+    def __call__(self, execute, sql, params, many, context):
+        # ``connection.execute_wrapper`` hook.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_query(sql, time.perf_counter() - started)
+
+
+class MetricsRegistry:
+    """In-process request metrics rendered in the Prometheus text format.
+
+    Every worker process keeps its own registry, so scrape each worker (or
+    aggregate in Prometheus) when running several of them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests: Counter = Counter()
+            self._duration_count: Counter = Counter()
+            self._duration_sum: defaultdict = defaultdict(float)
+            self._duration_buckets: defaultdict = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+            self._db_queries: Counter = Counter()
+            self._db_seconds: defaultdict = defaultdict(float)
+            self._serializer_seconds: defaultdict = defaultdict(float)
+            self._fingerprints: Counter = Counter()
+
+    def observe(self, method: str, route: str, status: int, seconds: float, profile: RequestProfile) -> None:
+        key = (method, route)
+        with self._lock:
+            self._requests[(method, route, str(status))] += 1
+            self._duration_count[key] += 1
+            self._duration_sum[key] += seconds
+            buckets = self._duration_buckets[key]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    buckets[index] += 1
+            self._db_queries[key] += profile.queries
+            self._db_seconds[key] += profile.query_seconds
+            self._serializer_seconds[key] += profile.serializer_seconds
+            self._fingerprints.update(profile.fingerprints)
+            if len(self._fingerprints) > MAX_TRACKED_FINGERPRINTS * 2:
+                self._fingerprints = Counter(dict(self._fingerprints.most_common(MAX_TRACKED_FINGERPRINTS)))
+
+    def render(self) -> str:
+        top = getattr(settings, "REQUEST_PROFILING_TOP_QUERIES", 10)
+        lines: list[str] = []
+        with self._lock:
+            _metric(lines, "uknf_http_requests_total", "counter", "Profiled HTTP requests.")
+            for (method, route, status), count in sorted(self._requests.items()):
+                lines.append(f"uknf_http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+            _metric(lines, "uknf_http_request_duration_seconds", "histogram", "Wall time of profiled requests.")
+            for (method, route), buckets in sorted(self._duration_buckets.items()):
+                total = self._duration_count[(method, route)]
+                for bound, count in zip(DURATION_BUCKETS, buckets):
+                    labels = _labels(method=method, route=route, le=str(bound))
+                    lines.append(f"uknf_http_request_duration_seconds_bucket{labels} {count}")
+                lines.append(f"uknf_http_request_duration_seconds_bucket{_labels(method=method, route=route, le='+Inf')} {total}")
+                lines.append(f"uknf_http_request_duration_seconds_sum{_labels(method=method, route=route)} {self._duration_sum[(method, route)]:.6f}")
+                lines.append(f"uknf_http_request_duration_seconds_count{_labels(method=method, route=route)} {total}")
+
+            for name, kind, help_text, values, fmt in (
+                ("uknf_db_queries_total", "counter", "Database queries issued by profiled requests.", self._db_queries, "{}"),
+                ("uknf_db_query_seconds_total", "counter", "Database time of profiled requests.", self._db_seconds, "{:.6f}"),
+                ("uknf_serializer_seconds_total", "counter", "Serializer time of profiled requests.", self._serializer_seconds, "{:.6f}"),
+            ):
+                _metric(lines, name, kind, help_text)
+                for (method, route), value in sorted(values.items()):
+                    lines.append(f"{name}{_labels(method=method, route=route)} {fmt.format(value)}")
+
+            _metric(lines, "uknf_sql_fingerprint_executions_total", "counter", "Most frequent SQL statements by fingerprint.")
+            for fingerprint, count in self._fingerprints.most_common(top):
+                lines.append(f"uknf_sql_fingerprint_executions_total{_labels(fingerprint=fingerprint[:300])} {count}")
+
+        for name, help_text, value in _extra_gauges():
+            _metric(lines, name, "gauge", help_text)
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+class RequestProfilingMiddleware:
+    """Opt-in per-request profiling (``REQUEST_PROFILING_ENABLED``).
+
+    A ``REQUEST_PROFILING_SAMPLE_RATE`` share of requests is measured: wall
+    time, query count and time (through ``connection.execute_wrapper``), the
+    most repeated SQL fingerprints and time spent in serializers that use
+    :class:`ProfiledSerializerMixin`. Results feed :data:`metrics_registry`
+    and the ``Server-Timing`` header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "REQUEST_PROFILING_ENABLED", False) or not _sampled():
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+
+        elapsed = time.perf_counter() - profile.started
+        match = getattr(request, "resolver_match", None)
+        # Router-generated patterns are regexes; drop their anchors.
+        route = match.route.lstrip("^").rstrip("$") if match and match.route else "unresolved"
+        metrics_registry.observe(request.method, route, response.status_code, elapsed, profile)
+
+        if getattr(settings, "REQUEST_PROFILING_SERVER_TIMING", True):
+            response["Server-Timing"] = (
+                f"total;dur={elapsed * 1000:.1f}, "
+                f'db;dur={profile.query_seconds * 1000:.1f};desc="{profile.queries} queries", '
+                f"serializer;dur={profile.serializer_seconds * 1000:.1f}"
+            )
+        repeated = [(sql, count) for sql, count in profile.fingerprints.most_common(3) if count > 1]
+        logger.info(
+            "%s %s %s %.1fms queries=%s db=%.1fms serializer=%.1fms",
+            request.method,
+            route,
+            response.status_code,
+            elapsed * 1000,
+            profile.queries,
+            profile.query_seconds * 1000,
+            profile.serializer_seconds * 1000,
+            extra={"repeated_queries": repeated},
+        )
+        return response
+
+
+class MetricsAccess(BasePermission):
+    """Bearer ``METRICS_TOKEN`` for scrapers, otherwise internal users only."""
+
+    def has_permission(self, request, view) -> bool:
+        token = getattr(settings, "METRICS_TOKEN", "")
+        header = request.headers.get("Authorization", "")
+        if token and header.startswith("Bearer "):
+            return constant_time_compare(header.removeprefix("Bearer ").strip(), token)
+        user = request.user
+        return bool(user and user.is_authenticated and user.is_internal)
+
+
+class MetricsView(APIView):
+    permission_classes = [MetricsAccess]
+
+    def get(self, request):
+        return HttpResponse(metrics_registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _sampled() -> bool:
+    rate = float(getattr(settings, "REQUEST_PROFILING_SAMPLE_RATE", 1.0))
+    return rate >= 1.0 or random.random() < rate
+
+
+class ProfiledSerializerMixin:
+    """Count ``to_representation`` time towards the profiled request's serializer time.
+
+    Opt-in per serializer class. List views call the child's
+    ``to_representation`` once per item, so both single objects and pages
+    are covered; nested profiled serializers are not counted twice.
+    """
+
+    def to_representation(self, instance):
+        profile = _current_profile.get()
+        if profile is None or profile.serializer_depth:
+            return super().to_representation(instance)
+        profile.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            profile.serializer_depth -= 1
+            profile.serializer_seconds += time.perf_counter() - started
+
+
+def _extra_gauges():
+    try:
+        from administration.audit import audit_writer
+    except ImportError:  # pragma: no cover - administration app not installed
+        return []
+    return [("uknf_audit_log_queue_depth", "Audit log entries waiting to be flushed.", audit_writer.stats()["queued"])]
+
+
+def _metric(lines: list[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(**labels: str) -> str:
+    rendered = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+    return "{" + rendered + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+__all__ = ["MetricsView", "ProfiledSerializerMixin", "RequestProfilingMiddleware", "fingerprint_sql", "metrics_registry"]
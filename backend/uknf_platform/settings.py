@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "uknf_platform.profiling.RequestProfilingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -41,6 +42,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "administration.audit.AuditLogFlushMiddleware",
 ]
 
 ROOT_URLCONF = "uknf_platform.urls"
@@ -97,13 +99,64 @@ STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "attachments": {
+        "BACKEND": "uknf_platform.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Optional hand-off of authorized downloads to the front web server:
+# "nginx" (X-Accel-Redirect to PROTECTED_MEDIA_URL) or "sendfile" (X-Sendfile).
+PROTECTED_MEDIA_BACKEND = os.getenv("DJANGO_PROTECTED_MEDIA_BACKEND", "").strip().lower()
+PROTECTED_MEDIA_URL = os.getenv("DJANGO_PROTECTED_MEDIA_URL", "/protected-media/")
+
+# Audit log writes: "sync" (INSERT per entry), "on_commit" (buffered after the
+# transaction commits, flushed at the end of the request) or "fire_and_forget"
+# (buffered and flushed by a background thread).
+AUDIT_LOG_DURABILITY = os.getenv("DJANGO_AUDIT_LOG_DURABILITY", "sync").strip().lower()
+AUDIT_LOG_BUFFER_SIZE = int(os.getenv("DJANGO_AUDIT_LOG_BUFFER_SIZE", "100"))
+AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv("DJANGO_AUDIT_LOG_FLUSH_INTERVAL", "2.0"))
+AUDIT_LOG_MAX_QUEUE = int(os.getenv("DJANGO_AUDIT_LOG_MAX_QUEUE", "10000"))
+
+# Opt-in request profiling feeding /api/metrics and Server-Timing headers.
+REQUEST_PROFILING_ENABLED = os.getenv("DJANGO_REQUEST_PROFILING", "false").lower() == "true"
+REQUEST_PROFILING_SAMPLE_RATE = float(os.getenv("DJANGO_REQUEST_PROFILING_SAMPLE_RATE", "1.0"))
+REQUEST_PROFILING_SERVER_TIMING = os.getenv("DJANGO_REQUEST_PROFILING_SERVER_TIMING", "true").lower() == "true"
+REQUEST_PROFILING_TOP_QUERIES = int(os.getenv("DJANGO_REQUEST_PROFILING_TOP_QUERIES", "10"))
+METRICS_TOKEN = os.getenv("DJANGO_METRICS_TOKEN", "")
+
+# Seconds an authorization context (memberships, managed entities, groups)
+# may be shared between requests through the default cache; 0 disables it.
+AUTHORIZATION_CONTEXT_CACHE_TTL = int(os.getenv("DJANGO_AUTHORIZATION_CONTEXT_CACHE_TTL", "0"))
+
+# API token lookups are cached per process (bounded LRU, entries live
+# TOKEN_AUTH_CACHE_TTL seconds; 0 disables) and, when a cache alias is
+# named, shared between workers.
+TOKEN_AUTH_CACHE_SIZE = int(os.getenv("DJANGO_TOKEN_AUTH_CACHE_SIZE", "2048"))
+TOKEN_AUTH_CACHE_TTL = float(os.getenv("DJANGO_TOKEN_AUTH_CACHE_TTL", "30"))
+TOKEN_AUTH_SHARED_CACHE = os.getenv("DJANGO_TOKEN_AUTH_SHARED_CACHE", "")
+TOKEN_AUTH_SHARED_CACHE_TTL = int(os.getenv("DJANGO_TOKEN_AUTH_SHARED_CACHE_TTL", "300"))
+
+# Worker processes hashing passwords in ``manage.py import_users``; 0 uses
+# every CPU, 1 hashes in the command's own process.
+USER_IMPORT_HASH_WORKERS = int(os.getenv("DJANGO_USER_IMPORT_HASH_WORKERS", "0"))
+# POST /auth/users/import hashes in the request process, so it only accepts
+# files with this many passwords (~0.35 s each, within gunicorn's 30 s timeout).
+USER_IMPORT_MAX_PASSWORD_ROWS = int(os.getenv("DJANGO_USER_IMPORT_MAX_PASSWORD_ROWS", "50"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "accounts.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -162,6 +215,18 @@ if EMAIL_BACKEND == "django.core.mail.backends.smtp.EmailBackend":
     EMAIL_USE_SSL = os.getenv("DJANGO_EMAIL_USE_SSL", "false").lower() == "true"
     EMAIL_TIMEOUT = int(os.getenv("DJANGO_EMAIL_TIMEOUT", "10"))
 
+# Outbound e-mail is queued in the database (communication.OutboundEmail) and
+# delivered by `manage.py send_queued_emails`. EMAIL_QUEUE_BACKEND (default:
+# EMAIL_BACKEND) lets the worker use e.g. the console or file backend
+# (EMAIL_FILE_PATH) offline.
+EMAIL_QUEUE_BACKEND = os.getenv("DJANGO_EMAIL_QUEUE_BACKEND", "")
+EMAIL_FILE_PATH = os.getenv("DJANGO_EMAIL_FILE_PATH", str(BASE_DIR / "sent_emails"))
+EMAIL_QUEUE_BATCH_SIZE = int(os.getenv("DJANGO_EMAIL_QUEUE_BATCH_SIZE", "50"))
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("DJANGO_EMAIL_QUEUE_MAX_ATTEMPTS", "8"))
+EMAIL_QUEUE_RETRY_BASE_SECONDS = int(os.getenv("DJANGO_EMAIL_QUEUE_RETRY_BASE_SECONDS", "60"))
+EMAIL_QUEUE_RETRY_MAX_SECONDS = int(os.getenv("DJANGO_EMAIL_QUEUE_RETRY_MAX_SECONDS", "21600"))
+EMAIL_QUEUE_LEASE_SECONDS = int(os.getenv("DJANGO_EMAIL_QUEUE_LEASE_SECONDS", "300"))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
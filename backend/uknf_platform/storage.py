@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import PurePosixPath
+
+from django.core.files.storage import FileSystemStorage, storages
+
+logger = logging.getLogger(__name__)
+
+BLOB_PREFIX = "cas"
+BLOB_FILENAME = "blob"
+HASH_ALGORITHM = "sha256"
+MAX_ORIGINAL_NAME_LENGTH = 255
+DEFAULT_GRACE_PERIOD = timedelta(hours=1)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage that keeps a single copy of every distinct upload.
+
+    Each file is stored under ``cas/<aa>/<digest>/blob`` where ``digest`` is
+    the SHA-256 of its content. Uploading content that is already present
+    returns the existing name without writing anything, so the same attachment
+    sent to many threads (or re-used as a library document) occupies disk space
+    only once. Blob names carry no part of the uploaded filename – a shared
+    blob must not reveal what another uploader called it – so referencing rows
+    keep their own name (see :func:`remember_original_name`). Names outside
+    the ``cas/`` prefix are served like in a regular ``FileSystemStorage``
+    which keeps previously stored files reachable.
+
+    Blobs are never deleted when a referencing row goes away – they are
+    reclaimed by :func:`collect_unreferenced_blobs`.
+    """
+
+    def _save(self, name, content):
+        digest = compute_content_digest(content)
+        directory = blob_directory(digest)
+        existing = self._existing_blob(directory)
+        if existing:
+            # Refresh the modification time so a concurrent garbage collection
+            # run treats the blob as freshly uploaded.
+            try:
+                os.utime(self.path(existing))
+            except FileNotFoundError:
+                logger.debug("Obiekt %s usunięto w trakcie zapisu duplikatu, zapisuję go ponownie", existing)
+            else:
+                logger.debug("Plik %s jest duplikatem istniejącego obiektu %s", name, existing)
+                return existing
+        return super()._save(f"{directory}/{BLOB_FILENAME}", content)
+
+    def delete(self, name):
+        super().delete(name)
+        if is_blob_name(name):
+            self._prune_directory(PurePosixPath(name).parent.as_posix())
+
+    def _existing_blob(self, directory: str) -> str | None:
+        try:
+            _, files = self.listdir(directory)
+        except FileNotFoundError:
+            return None
+        if not files:
+            return None
+        return f"{directory}/{sorted(files)[0]}"
+
+    def _prune_directory(self, directory: str) -> None:
+        try:
+            os.rmdir(self.path(directory))
+        except OSError:
+            pass
+
+
+def attachment_storage() -> ContentAddressedStorage:
+    """Storage callable used by attachment ``FileField`` definitions."""
+    return storages["attachments"]
+
+
+def compute_content_digest(content) -> str:
+    hasher = hashlib.new(HASH_ALGORITHM)
+    for chunk in content.chunks():
+        hasher.update(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    return hasher.hexdigest()
+
+
+def blob_directory(digest: str) -> str:
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest}"
+
+
+def is_blob_name(name: str | None) -> bool:
+    return bool(name) and name.startswith(f"{BLOB_PREFIX}/")
+
+
+def blob_digest(name: str) -> str | None:
+    if not is_blob_name(name):
+        return None
+    parts = PurePosixPath(name).parts
+    return parts[2] if len(parts) >= 4 else None
+
+
+def release_stored_file(field_file) -> None:
+    """Delete the file behind ``field_file`` unless it may be shared.
+
+    Content-addressed blobs can be referenced by several rows, so they are left
+    for the garbage collector instead of being removed eagerly.
+    """
+    if not field_file or not field_file.name:
+        return
+    if is_blob_name(field_file.name) and isinstance(field_file.storage, ContentAddressedStorage):
+        return
+    field_file.storage.delete(field_file.name)
+
+
+def remember_original_name(instance, field_name: str = "file") -> None:
+    """Copy the name of a file that is about to be stored to ``original_name``.
+
+    Call before saving ``instance``; files that are already stored keep the
+    recorded name.
+    """
+    field_file = getattr(instance, field_name)
+    if field_file and not field_file._committed:
+        instance.original_name = original_filename(field_file.name)
+
+
+def original_filename(name: str) -> str:
+    filename = PurePosixPath(name.replace("\\", "/")).name or "plik"
+    if len(filename) <= MAX_ORIGINAL_NAME_LENGTH:
+        return filename
+    stem, suffix = os.path.splitext(filename)
+    suffix = suffix[:16]
+    return f"{stem[: MAX_ORIGINAL_NAME_LENGTH - len(suffix)]}{suffix}"
+
+
+def _content_addressed_fields():
+    from django.apps import apps
+    from django.db.models import FileField
+
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage):
+                yield model, field
+
+
+def _iter_referenced_names():
+    for model, field in _content_addressed_fields():
+        queryset = (
+            model._default_manager.filter(**{f"{field.attname}__startswith": f"{BLOB_PREFIX}/"})
+            .values_list(field.attname, flat=True)
+        )
+        yield from queryset.iterator(chunk_size=2000)
+
+
+def referenced_blob_names() -> set[str]:
+    return set(_iter_referenced_names())
+
+
+def blob_reference_counts() -> Counter[str]:
+    """Return the number of rows referencing each stored digest."""
+    return Counter(digest for digest in map(blob_digest, _iter_referenced_names()) if digest)
+
+
+@dataclass
+class BlobCollectionResult:
+    scanned: int = 0
+    removed: int = 0
+    bytes_reclaimed: int = 0
+
+
+def collect_unreferenced_blobs(
+    *,
+    storage: ContentAddressedStorage | None = None,
+    grace_period: timedelta = DEFAULT_GRACE_PERIOD,
+    dry_run: bool = False,
+) -> BlobCollectionResult:
+    """Remove stored blobs which are no longer referenced by any ``FileField``.
+
+    Files younger than ``grace_period`` are kept so that uploads whose database
+    row has not been committed yet are not collected.
+    """
+    storage = storage or attachment_storage()
+    referenced = referenced_blob_names()
+    result = BlobCollectionResult()
+    root = storage.path(BLOB_PREFIX)
+    if not os.path.isdir(root):
+        return result
+
+    cutoff = time.time() - grace_period.total_seconds()
+    for directory, _, files in os.walk(root, topdown=False):
+        for filename in files:
+            full_path = os.path.join(directory, filename)
+            name = os.path.relpath(full_path, storage.location).replace(os.sep, "/")
+            result.scanned += 1
+            if name in referenced:
+                continue
+            try:
+                stat = os.stat(full_path)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime > cutoff:
+                continue
+            result.removed += 1
+            result.bytes_reclaimed += stat.st_size
+            if not dry_run:
+                storage.delete(name)
+        if not dry_run and directory != root:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+    return result
+
+
+__all__ = [
+    "BlobCollectionResult",
+    "ContentAddressedStorage",
+    "attachment_storage",
+    "blob_reference_counts",
+    "collect_unreferenced_blobs",
+    "original_filename",
+    "release_stored_file",
+    "remember_original_name",
+]
@@ -2,7 +2,7 @@
 
 import { useEffect, useMemo, useState } from 'react';
 import { Controller, useFieldArray, useForm } from 'react-hook-form';
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import { z } from 'zod';
 import { zodResolver } from '@hookform/resolvers/zod';
 import axios from 'axios';
@@ -16,6 +16,7 @@ import { apiClient } from '@/lib/api';
 import { useAuth } from '@/hooks/useAuth';
 import type {
   AccessRequest,
+  AccessRequestSummary,
   AccessRequestLine,
   AccessRequestStatus,
   RegulatedEntity
@@ -33,6 +34,14 @@ type PermissionCode = (typeof permissionValues)[number];
 
 type ReviewFilter = 'requires-action' | 'my-entities' | 'handled' | 'all';
 
+type AccessRequestPage = {
+  next: string | null;
+  results: AccessRequestSummary[];
+};
+
+// The list is cursor-paginated; only the opaque `cursor` of the next link is reused.
+const nextCursor = (next: string | null) => (next ? new URL(next, window.location.origin).searchParams.get('cursor') : null);
+
 const emailSchema = z
   .string()
   .trim()
@@ -288,13 +297,13 @@ export default function AccessRequestsPage() {
     }
   }, [user]);
 
-  const accessRequestsListQuery = useQuery({
+  const accessRequestsListQuery = useInfiniteQuery({
     queryKey: ['access-requests', user?.is_internal ? listFilter : 'all'],
     enabled: shouldLoadReview,
-    queryFn: async () => {
-      let url = '/auth/access-requests/';
+    initialPageParam: null as string | null,
+    queryFn: async ({ pageParam }): Promise<AccessRequestPage> => {
+      const params = new URLSearchParams();
       if (user?.is_internal) {
-        const params = new URLSearchParams();
         if (listFilter === 'requires-action') {
           params.set('filter', 'wymaga-dzialania-uknf');
         } else if (listFilter === 'my-entities') {
@@ -302,16 +311,23 @@ export default function AccessRequestsPage() {
         } else if (listFilter === 'handled') {
           params.set('filter', 'obslugiwany-przez-uknf');
         }
-        if (params.toString()) {
-          url = `${url}?${params.toString()}`;
-        }
       }
-      const response = await apiClient.get<AccessRequest[]>(url);
-      return response.data;
-    }
+      if (pageParam) {
+        params.set('cursor', pageParam);
+      }
+      const query = params.toString();
+      const response = await apiClient.get<AccessRequestPage | AccessRequestSummary[]>(
+        query ? `/auth/access-requests/?${query}` : '/auth/access-requests/'
+      );
+      return Array.isArray(response.data) ? { next: null, results: response.data } : response.data;
+    },
+    getNextPageParam: (lastPage) => nextCursor(lastPage.next)
   });
 
-  const requestsList = accessRequestsListQuery.data ?? [];
+  const requestsList = useMemo(
+    () => accessRequestsListQuery.data?.pages.flatMap((page) => page.results) ?? [],
+    [accessRequestsListQuery.data]
+  );
 
   const filteredRequests = useMemo(() => {
     if (user?.is_internal) {
@@ -776,6 +792,19 @@ export default function AccessRequestsPage() {
                   ])}
                 />
               )}
+              {accessRequestsListQuery.hasNextPage && (
+                <div className="flex items-center justify-between gap-2">
+                  <span className="text-xs text-slate-500">Wyświetlono {requestsList.length} najnowszych wniosków.</span>
+                  <Button
+                    size="sm"
+                    variant="outline"
+                    disabled={accessRequestsListQuery.isFetchingNextPage}
+                    onClick={() => accessRequestsListQuery.fetchNextPage()}
+                  >
+                    {accessRequestsListQuery.isFetchingNextPage ? 'Ładowanie...' : 'Wczytaj kolejne'}
+                  </Button>
+                </div>
+              )}
             </Card>
 
             <Card className="space-y-4">
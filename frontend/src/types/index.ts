@@ -230,6 +230,7 @@ export interface AccessRequestActor {
 export interface AccessRequestAttachment {
   id: number;
   file: string;
+  original_name: string;
   description: string;
   uploaded_by: AccessRequestActor | null;
   created_at: string;
@@ -271,6 +272,7 @@ export interface AccessRequestHistoryEntry {
 export interface AccessRequestMessageAttachment {
   id: number;
   file: string;
+  original_name: string;
   uploaded_by: AccessRequestActor | null;
   created_at: string;
 }
@@ -308,3 +310,22 @@ export interface AccessRequest {
   history: AccessRequestHistoryEntry[];
   messages: AccessRequestMessage[];
 }
+
+export interface AccessRequestSummary {
+  id: number;
+  reference_code: string;
+  status: AccessRequestStatus;
+  next_actor: AccessRequestNextActor;
+  handled_by_uknf: boolean;
+  requester_first_name: string;
+  requester_last_name: string;
+  requester_email: string;
+  submitted_at: string | null;
+  decided_at: string | null;
+  created_at: string;
+  updated_at: string;
+  lines_count: number;
+  lines_pending: number;
+  unread_messages: number;
+  last_activity_at: string;
+}